@@ -1,7 +1,17 @@
 """
 AGI — general-purpose agent loop: perceive → recall → reason → plan → act → store.
+Exports load lazily (PEP 562) so `import agi` and CLI argument parsing stay cheap.
 """
 
-from agi.core import Agent, TickInput, TickOutput, tick
+from typing import TYPE_CHECKING
+
+from agi._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from agi.core import Agent, TickInput, TickOutput, tick
 
 __all__ = ["Agent", "TickInput", "TickOutput", "tick"]
+
+_LAZY = {name: "agi.core" for name in __all__}
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
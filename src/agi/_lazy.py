@@ -0,0 +1,28 @@
+"""
+PEP 562 lazy exports shared by the package __init__ modules:
+    __getattr__, __dir__ = lazy_module(__name__, _LAZY)
+where _LAZY maps each exported name to the module that defines it. The first access imports that
+module and caches the value in the package's globals, so later lookups skip __getattr__.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_module(name: str, lazy: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Module-level __getattr__ and __dir__ for package name, resolving the names in lazy on first use."""
+    namespace = sys.modules[name].__dict__
+
+    def __getattr__(attr: str) -> Any:
+        module = lazy.get(attr)
+        if module is None:
+            raise AttributeError("module %r has no attribute %r" % (name, attr))
+        value = getattr(importlib.import_module(module), attr)
+        namespace[attr] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(lazy))
+
+    return __getattr__, __dir__
@@ -1,11 +1,17 @@
 """
 Action: tool registry, execution, response, built-in tools.
+Submodules load on first attribute access (PEP 562).
 """
 
-from agi.action.registry import ToolRegistry, ToolDef
-from agi.action.execute import execute_tool
-from agi.action.response import respond
-from agi.action.builtin_tools import read_file, list_dir, register_builtins
+from typing import TYPE_CHECKING
+
+from agi._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from agi.action.registry import ToolRegistry, ToolDef
+    from agi.action.execute import execute_tool
+    from agi.action.response import respond
+    from agi.action.builtin_tools import read_file, list_dir, register_builtins
 
 __all__ = [
     "ToolRegistry",
@@ -16,3 +22,15 @@ __all__ = [
     "list_dir",
     "register_builtins",
 ]
+
+_LAZY = {
+    "ToolRegistry": "agi.action.registry",
+    "ToolDef": "agi.action.registry",
+    "execute_tool": "agi.action.execute",
+    "respond": "agi.action.response",
+    "read_file": "agi.action.builtin_tools",
+    "list_dir": "agi.action.builtin_tools",
+    "register_builtins": "agi.action.builtin_tools",
+}
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
@@ -1,9 +1,22 @@
 """
-Built-in tools: read_file, list_dir (read-only). Safe path handling.
+Built-in tools: read_file, list_dir, find_files, search_text, search_files (read-only). Safe path handling.
+find_files/search_text use a WorkspaceIndex over the workspace, built on first use;
+search_files is a brute-force parallel scan that needs no index.
 """
 
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAX_FIND_RESULTS = 100
+MAX_SEARCH_MATCHES = 50
+# search_files: total bytes read before stopping, chunk size, worker threads
+MAX_SCAN_BYTES = 64 * 1024 * 1024
+SCAN_CHUNK_BYTES = 64 * 1024
+SCAN_WORKERS = 8
+# Bytes sniffed for NUL to classify a file as binary.
+SNIFF_BYTES = 8192
+SKIP_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", ".mypy_cache", ".pytest_cache", ".tox"}
 
 # Max size to read (bytes)
 MAX_READ_BYTES = 1024 * 1024
@@ -13,7 +26,7 @@ def _safe_path(base: Optional[str], path: str) -> Optional[str]:
     """Resolve path under base; return None if path escapes base."""
     base = os.path.abspath(base or os.getcwd())
     full = os.path.abspath(os.path.join(base, path))
-    if not full.startswith(base):
+    if full != base and not full.startswith(base.rstrip(os.sep) + os.sep):
         return None
     return full
 
@@ -47,25 +60,264 @@ def list_dir(path: str = ".", base: Optional[str] = None) -> Dict[str, Any]:
         return {"success": False, "payload": {}, "error": str(e)}
 
 
-def register_builtins(registry: Any, base_dir: Optional[str] = None) -> None:
-    """Register read_file and list_dir on the given registry."""
+def find_files(pattern: str, index: Any, limit: int = MAX_FIND_RESULTS) -> Dict[str, Any]:
+    """Workspace paths matching a glob or substring (from the index). Returns observation dict."""
+    if not pattern:
+        return {"success": False, "payload": {}, "error": "empty pattern"}
+    try:
+        paths = index.find(pattern, limit=limit)
+    except OSError as e:
+        return {"success": False, "payload": {}, "error": str(e)}
+    return {"success": True, "payload": {"pattern": pattern, "entries": paths}, "error": None}
+
+
+def search_text(query: str, index: Any, limit: int = MAX_SEARCH_MATCHES) -> Dict[str, Any]:
+    """Lines containing query (case-insensitive) across indexed text files. Returns observation dict."""
+    if not query:
+        return {"success": False, "payload": {}, "error": "empty query"}
+    try:
+        matches = index.search(query, limit=limit)
+    except OSError as e:
+        return {"success": False, "payload": {}, "error": str(e)}
+    content = "\n".join("%s:%d: %s" % (m["path"], m["line"], m["text"]) for m in matches) or "(no matches)"
+    return {"success": True, "payload": {"query": query, "matches": matches, "content": content}, "error": None}
+
+
+def _iter_files(root: str) -> Iterator[str]:
+    """Regular files under root (os.scandir, no symlinks followed, SKIP_DIRS pruned)."""
+    if os.path.isfile(root):
+        yield root
+        return
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+class _ScanBudget:
+    """Shared byte/result accounting across scan workers; stop is set once a limit is hit."""
+
+    def __init__(self, max_results: int, max_bytes: int) -> None:
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.results = 0
+        self.stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_bytes(self, n: int) -> bool:
+        with self._lock:
+            self.bytes_read += n
+            if self.bytes_read >= self.max_bytes:
+                self.stop.set()
+            return not self.stop.is_set()
+
+
+def _scan_file(full: str, needle: bytes, budget: _ScanBudget) -> List[Tuple[int, str]]:
+    """(line number, line) for lines containing needle (ASCII case-insensitive). Binary files yield nothing."""
+    found: List[Tuple[int, str]] = []
+    try:
+        with open(full, "rb") as f:
+            lineno = 0
+            tail = b""
+            first = True
+            while not budget.stop.is_set():
+                chunk = f.read(SCAN_CHUNK_BYTES)
+                if first:
+                    if b"\0" in chunk[:SNIFF_BYTES]:
+                        return []
+                    first = False
+                if not chunk:
+                    break
+                keep_going = budget.add_bytes(len(chunk))
+                data = tail + chunk
+                cut = data.rfind(b"\n") + 1
+                tail, data = data[cut:], data[:cut]
+                if needle in data.lower():
+                    for line in data.split(b"\n")[:-1]:
+                        lineno += 1
+                        if needle in line.lower():
+                            found.append((lineno, line.decode("utf-8", errors="replace").rstrip("\r")))
+                else:
+                    lineno += data.count(b"\n")
+                if not keep_going:
+                    return found
+            if tail and needle in tail.lower() and not budget.stop.is_set():
+                found.append((lineno + 1, tail.decode("utf-8", errors="replace").rstrip("\r")))
+    except OSError:
+        return found
+    return found
+
+
+def iter_search_files(
+    query: str,
+    path: str = ".",
+    base: Optional[str] = None,
+    max_results: int = MAX_SEARCH_MATCHES,
+    max_bytes: int = MAX_SCAN_BYTES,
+    workers: int = SCAN_WORKERS,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {path, line, text} matches as worker threads find them (file order not guaranteed).
+    Stops at max_results matches or max_bytes read; stats (if given) receives files/bytes/truncated.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    base_abs = os.path.abspath(base or os.getcwd())
+    root = _safe_path(base_abs, path)
+    if root is None:
+        raise ValueError("path not allowed")
+    needle = query.lower().encode("utf-8")
+    budget = _ScanBudget(max_results, max_bytes)
+    files = _iter_files(root)
+    files_scanned = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending: Dict[Any, str] = {}
+        try:
+            while True:
+                # Keep a bounded window in flight so enumeration never runs far ahead of scanning.
+                while len(pending) < workers * 4 and not budget.stop.is_set():
+                    full = next(files, None)
+                    if full is None:
+                        break
+                    pending[pool.submit(_scan_file, full, needle, budget)] = full
+                if not pending:
+                    break
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    full = pending.pop(fut)
+                    files_scanned += 1
+                    rel = os.path.relpath(full, base_abs).replace(os.sep, "/")
+                    for lineno, text in fut.result():
+                        if budget.results >= max_results:
+                            budget.stop.set()
+                            break
+                        budget.results += 1
+                        yield {"path": rel, "line": lineno, "text": text[:200]}
+                if budget.results >= max_results:
+                    budget.stop.set()
+        finally:
+            budget.stop.set()
+            for fut in pending:
+                fut.cancel()
+            if stats is not None:
+                stats.update({
+                    "files_scanned": files_scanned,
+                    "bytes_scanned": budget.bytes_read,
+                    "truncated": budget.results >= max_results or budget.bytes_read >= max_bytes,
+                })
+
+
+def search_files(
+    query: str,
+    path: str = ".",
+    base: Optional[str] = None,
+    max_results: int = MAX_SEARCH_MATCHES,
+    max_bytes: int = MAX_SCAN_BYTES,
+) -> Dict[str, Any]:
+    """Grep-like scan (no index) for lines containing query under path. Returns observation dict."""
+    if not query:
+        return {"success": False, "payload": {}, "error": "empty query"}
+    if _safe_path(base, path) is None:
+        return {"success": False, "payload": {}, "error": "path not allowed"}
+    stats: Dict[str, Any] = {}
+    try:
+        matches = list(iter_search_files(query, path, base=base, max_results=max_results, max_bytes=max_bytes, stats=stats))
+    except (OSError, ValueError) as e:
+        return {"success": False, "payload": {}, "error": str(e)}
+    content = "\n".join("%s:%d: %s" % (m["path"], m["line"], m["text"]) for m in matches) or "(no matches)"
+    payload = {"query": query, "path": path, "matches": matches, "content": content}
+    payload.update(stats)
+    return {"success": True, "payload": payload, "error": None}
+
+
+def register_builtins(registry: Any, base_dir: Optional[str] = None, index_path: Optional[str] = None) -> None:
+    """Register read_file, list_dir, find_files, search_text and search_files on the given registry.
+    Names the registry already has are left alone (tools registered before a deferred provider runs win)."""
+    index_holder: Dict[str, Any] = {}
+    index_lock = threading.Lock()
+    # Results depend only on the workspace: agents sharing it may coalesce identical calls.
+    scope = "workspace:" + os.path.abspath(base_dir) if base_dir else None
+
+    def _index() -> Any:
+        with index_lock:
+            if "index" not in index_holder:
+                from agi.action.workspace_index import WorkspaceIndex
+                index_holder["index"] = WorkspaceIndex(os.path.abspath(base_dir or os.getcwd()), index_path=index_path)
+            return index_holder["index"]
+
+    def _register(name: str, *spec: Any, **kwargs: Any) -> None:
+        if registry.get(name) is None:
+            registry.register(name, *spec, **kwargs)
+
     def _read_file(path: str) -> Dict[str, Any]:
         return read_file(path, base=base_dir)
 
     def _list_dir(path: str = ".") -> Dict[str, Any]:
         return list_dir(path, base=base_dir)
 
-    registry.register(
+    def _find_files(pattern: str) -> Dict[str, Any]:
+        return find_files(pattern, _index())
+
+    def _search_text(query: str) -> Dict[str, Any]:
+        return search_text(query, _index())
+
+    def _search_files(query: str, path: str = ".") -> Dict[str, Any]:
+        return search_files(query, path, base=base_dir)
+
+    _register(
         "read_file",
         "Read file contents. path is relative to workspace.",
         {"path": "string"},
         "read",
         _read_file,
+        scope=scope,
     )
-    registry.register(
+    _register(
         "list_dir",
         "List directory entries. path is relative to workspace (default '.').",
         {"path": "string"},
         "read",
         _list_dir,
+        scope=scope,
+    )
+    _register(
+        "find_files",
+        "Find workspace files by glob (e.g. '*.py', 'src/*.md') or path substring, via the workspace index.",
+        {"pattern": "string"},
+        "read",
+        _find_files,
+        scope=scope,
+    )
+    _register(
+        "search_text",
+        "Search workspace text files for lines containing query (case-insensitive), via the trigram index.",
+        {"query": "string"},
+        "read",
+        _search_text,
+        scope=scope,
+    )
+    _register(
+        "search_files",
+        "Grep workspace files under path (default '.') for lines containing query; parallel scan, no index.",
+        {"query": "string", "path": "string"},
+        "read",
+        _search_files,
+        scope=scope,
     )
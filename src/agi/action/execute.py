@@ -1,17 +1,123 @@
 """
 Execute a registered tool by name and args. Returns observation (success, payload, error).
+Arguments are checked by the tool's compiled validator before dispatch.
+Each call's latency and output size are recorded on the registry (see ToolRegistry.stats).
+Read tools are single-flight: concurrent identical calls (same scope, tool and normalized args)
+wait for one in-flight execution and each get a copy of its observation.
 """
 
-from typing import Any, Dict
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from agi.action.registry import ToolRegistry
+from agi.action.registry import ToolDef, ToolRegistry
 
 
-def execute_tool(registry: ToolRegistry, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
-    """Run tool; return observation: success, payload, error."""
+def observation_bytes(observation: Dict[str, Any]) -> int:
+    """Approximate size of a tool's output: content, response text or listed entries (UTF-8 bytes)."""
+    payload = observation.get("payload") or {}
+    if not isinstance(payload, dict):
+        return len(str(payload).encode("utf-8"))
+    if "content" in payload:
+        return len((payload.get("content") or "").encode("utf-8"))
+    if "entries" in payload:
+        return sum(len(str(e).encode("utf-8")) + 1 for e in payload.get("entries") or [])
+    if "text" in payload:
+        return len((payload.get("text") or "").encode("utf-8"))
+    return 0
+
+
+def copy_observation(observation: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy deep enough that one holder can't mutate another's payload dict or lists."""
+    payload = observation.get("payload")
+    if isinstance(payload, dict):
+        payload = {k: list(v) if isinstance(v, list) else v for k, v in payload.items()}
+    return dict(observation, payload=payload)
+
+
+class _Call:
+    __slots__ = ("done", "result", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Dict[str, Any] = {}
+        self.waiters = 0
+
+
+class SingleFlight:
+    """At most one in-flight execution per key; callers arriving meanwhile wait and share its result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Any, fn: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """(result, shared): shared is True if another caller's execution answered this call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            return copy_observation(call.result), True
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.result = {"success": False, "payload": {}, "error": str(e)}
+        finally:
+            # Leave the table before waking waiters: later arrivals start a fresh execution.
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # Waiters copy call.result; the leader gets its own copy too so no caller can change theirs.
+        return (copy_observation(call.result) if shared else call.result), False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"inflight": len(self._calls), "executions": self.executions, "coalesced": self.coalesced}
+
+
+_FLIGHTS = SingleFlight()
+
+
+def coalesce_stats() -> Dict[str, int]:
+    """Process-wide single-flight counts: read executions started, calls coalesced onto one, in flight now."""
+    return _FLIGHTS.stats()
+
+
+def _flight_key(tool: ToolDef, name: str, args: Dict[str, Any]) -> Optional[Tuple[Any, str, str]]:
+    """(scope, name, canonical args) for a read tool; None if not coalescable. Unscoped tools coalesce
+    only with calls to the same function; "path" args are normalized ("./a" == "a")."""
+    if tool.effect != "read":
+        return None
+    norm = dict(args)
+    if isinstance(norm.get("path"), str):
+        norm["path"] = os.path.normpath(norm["path"])
+    try:
+        canon = json.dumps(norm, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return (tool.scope if tool.scope is not None else id(tool.fn), name, canon)
+
+
+def _run(registry: ToolRegistry, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
     tool = registry.get(name)
     if not tool:
         return {"success": False, "payload": {}, "error": f"Unknown tool: {name}"}
+    if tool.validate is not None:
+        problem = tool.validate(args)
+        if problem:
+            return {"success": False, "payload": {}, "error": "Invalid arguments for %s: %s" % (name, problem)}
     try:
         result = tool.fn(**args)
         if isinstance(result, dict) and "success" in result:
@@ -19,3 +125,23 @@ def execute_tool(registry: ToolRegistry, name: str, args: Dict[str, Any]) -> Dic
         return {"success": True, "payload": result if isinstance(result, dict) else {"result": result}, "error": None}
     except Exception as e:
         return {"success": False, "payload": {}, "error": str(e)}
+
+
+def execute_tool(registry: ToolRegistry, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Run tool; return observation: success, payload, error. Identical concurrent read calls share one run."""
+    tool = registry.get(name)
+    key = _flight_key(tool, name, args) if tool is not None else None
+    if key is None:
+        return _timed(registry, name, args)
+    observation, shared = _FLIGHTS.do(key, lambda: _timed(registry, name, args))
+    if shared:
+        registry.record_coalesced(name)
+    return observation
+
+
+def _timed(registry: ToolRegistry, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    observation = _run(registry, name, args)
+    if registry.get(name) is not None:
+        registry.record(name, time.perf_counter() - start, observation_bytes(observation))
+    return observation
@@ -1,12 +1,24 @@
 """
 Tool registry: named tools with description, parameters, effect (read|write|external).
+manifest() is a cached, immutable, versioned ToolManifest rebuilt only after register();
+list_tools() is the same listing as plain JSON-serializable dicts (cached alongside it);
+argument validators are compiled from the parameters schema at registration.
+Also keeps per-tool moving averages of latency and output size (fed by execute_tool).
+A tool's scope names what its result depends on beyond its arguments (e.g. the workspace):
+read tools with equal (scope, name, args) may share one in-flight execution across registries.
 """
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Literal, Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Literal, Mapping, Optional, Tuple
+
+from agi.action.validate import Validator, compile_validator
 
 Effect = Literal["read", "write", "external"]
 
+# Weight of the newest sample in the exponential moving averages.
+EWMA_ALPHA = 0.2
+
 
 @dataclass
 class ToolDef:
@@ -15,6 +27,50 @@ class ToolDef:
     parameters: Dict[str, str]
     effect: Effect
     fn: Callable[..., Dict[str, Any]]
+    validate: Optional[Validator] = field(default=None, repr=False, compare=False)
+    scope: Optional[str] = None
+
+
+class ToolManifest(tuple):
+    """Immutable tool listing (read-only dicts: name, description, parameters, effect) with name/effect indexes."""
+
+    def __new__(cls, entries: Iterable[Mapping[str, Any]] = (), version: int = 0) -> "ToolManifest":
+        obj = super().__new__(cls, entries)
+        obj.version = version
+        by_effect: Dict[str, List[Mapping[str, Any]]] = {}
+        for e in obj:
+            by_effect.setdefault(e["effect"], []).append(e)
+        obj._by_effect = {k: tuple(v) for k, v in by_effect.items()}
+        obj._by_name = {e["name"]: e for e in obj}
+        return obj
+
+    def by_effect(self, effect: str) -> Tuple[Mapping[str, Any], ...]:
+        return self._by_effect.get(effect, ())
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        return self._by_name.get(name)
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._by_name)
+
+
+@dataclass
+class ToolStats:
+    """Observed cost of a tool: call count and moving averages of latency (s) and output bytes.
+    coalesced counts calls that shared another caller's in-flight execution (not in calls)."""
+
+    calls: int = 0
+    avg_latency: float = 0.0
+    avg_bytes: float = 0.0
+    coalesced: int = 0
+
+    def observe(self, latency: float, nbytes: int) -> None:
+        if self.calls == 0:
+            self.avg_latency, self.avg_bytes = latency, float(nbytes)
+        else:
+            self.avg_latency += EWMA_ALPHA * (latency - self.avg_latency)
+            self.avg_bytes += EWMA_ALPHA * (nbytes - self.avg_bytes)
+        self.calls += 1
 
 
 class ToolRegistry:
@@ -22,6 +78,19 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: Dict[str, ToolDef] = {}
+        self._stats: Dict[str, ToolStats] = {}
+        self._providers: List[Callable[["ToolRegistry"], None]] = []
+        self.version = 0
+        self._manifest: Optional[ToolManifest] = None
+        self._listing: Optional[Tuple[Dict[str, Any], ...]] = None
+
+    def add_provider(self, provider: Callable[["ToolRegistry"], None]) -> None:
+        """Defer registration: provider(registry) runs once, on the first lookup or listing."""
+        self._providers.append(provider)
+
+    def _load_providers(self) -> None:
+        while self._providers:
+            self._providers.pop(0)(self)
 
     def register(
         self,
@@ -30,19 +99,72 @@ class ToolRegistry:
         parameters: Dict[str, str],
         effect: Effect,
         fn: Callable[..., Dict[str, Any]],
+        scope: Optional[str] = None,
     ) -> None:
-        self._tools[name] = ToolDef(name=name, description=description, parameters=parameters, effect=effect, fn=fn)
+        self._tools[name] = ToolDef(
+            name=name,
+            description=description,
+            parameters=parameters,
+            effect=effect,
+            fn=fn,
+            validate=compile_validator(parameters, fn),
+            scope=scope,
+        )
+        self.version += 1
+        self._manifest = None
+        self._listing = None
 
     def get(self, name: str) -> Optional[ToolDef]:
+        if name not in self._tools and self._providers:
+            self._load_providers()
         return self._tools.get(name)
 
-    def list_tools(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                "name": t.name,
-                "description": t.description,
-                "parameters": t.parameters,
-                "effect": t.effect,
-            }
-            for t in self._tools.values()
-        ]
+    def record(self, name: str, latency: float, nbytes: int = 0) -> None:
+        """Fold one call's latency and output size into the tool's moving averages."""
+        self._stats.setdefault(name, ToolStats()).observe(latency, nbytes)
+
+    def record_coalesced(self, name: str) -> None:
+        """Count one call answered by another caller's in-flight execution."""
+        self._stats.setdefault(name, ToolStats()).coalesced += 1
+
+    def stats(self, name: str) -> Optional[ToolStats]:
+        """Observed cost for the tool, or None if it has not run yet."""
+        return self._stats.get(name)
+
+    def all_stats(self) -> Dict[str, ToolStats]:
+        """Copy of every tool's observed cost (for checkpoints)."""
+        return {name: ToolStats(s.calls, s.avg_latency, s.avg_bytes, s.coalesced) for name, s in self._stats.items()}
+
+    def restore_stats(self, stats: Mapping[str, ToolStats]) -> None:
+        """Replace observed costs for the given tools (e.g. from a checkpoint)."""
+        for name, s in stats.items():
+            self._stats[name] = ToolStats(s.calls, s.avg_latency, s.avg_bytes, s.coalesced)
+
+    def manifest(self) -> ToolManifest:
+        """Cached manifest; rebuilt only when a tool was registered since the last call."""
+        self._load_providers()
+        if self._manifest is None:
+            self._manifest = ToolManifest(
+                (
+                    MappingProxyType({
+                        "name": t.name,
+                        "description": t.description,
+                        "parameters": MappingProxyType(dict(t.parameters)),
+                        "effect": t.effect,
+                    })
+                    for t in self._tools.values()
+                ),
+                version=self.version,
+            )
+        return self._manifest
+
+    def list_tools(self) -> Tuple[Dict[str, Any], ...]:
+        """Tool descriptions as plain dicts (name, description, parameters, effect), e.g. for json.dumps
+        into an LLM prompt. Cached until the next register(): treat as read-only."""
+        self._load_providers()
+        if self._listing is None:
+            self._listing = tuple(
+                {"name": t.name, "description": t.description, "parameters": dict(t.parameters), "effect": t.effect}
+                for t in self._tools.values()
+            )
+        return self._listing
@@ -0,0 +1,67 @@
+"""
+Argument validators compiled from a tool's parameters schema ({name: type}) and its signature.
+Compiled once at registration; a call is checked with a few dict lookups before dispatch.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Schema type name -> accepted Python types (bool is never accepted as a number).
+TYPE_MAP: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "str": (str,),
+    "integer": (int,),
+    "int": (int,),
+    "number": (int, float),
+    "float": (int, float),
+    "boolean": (bool,),
+    "bool": (bool,),
+    "object": (dict,),
+    "dict": (dict,),
+    "array": (list, tuple),
+    "list": (list, tuple),
+}
+
+Validator = Callable[[Dict[str, Any]], Optional[str]]
+
+
+def _signature_info(fn: Callable[..., Any]) -> Tuple[Optional[set], bool]:
+    """(names without defaults, accepts **kwargs); (None, True) if the signature is unavailable."""
+    import inspect
+    try:
+        sig = inspect.signature(fn)
+    except (TypeError, ValueError):
+        return None, True
+    required = set()
+    var_kw = False
+    for p in sig.parameters.values():
+        if p.kind is p.VAR_KEYWORD:
+            var_kw = True
+        elif p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) and p.default is p.empty:
+            required.add(p.name)
+    return required, var_kw
+
+
+def compile_validator(parameters: Dict[str, str], fn: Callable[..., Any]) -> Validator:
+    """Return validate(args) -> error message or None."""
+    types = {name: TYPE_MAP.get(str(t).lower()) for name, t in (parameters or {}).items()}
+    required, var_kw = _signature_info(fn)
+    required_names = tuple(sorted(required or ()))
+    allow_unknown = var_kw
+
+    def validate(args: Dict[str, Any]) -> Optional[str]:
+        if not isinstance(args, dict):
+            return "arguments must be an object"
+        for name in required_names:
+            if name not in args:
+                return "missing required argument: %s" % name
+        for name, value in args.items():
+            expected = types.get(name, False)
+            if expected is False:
+                if not allow_unknown:
+                    return "unexpected argument: %s" % name
+                continue
+            if expected is not None and (not isinstance(value, expected) or (isinstance(value, bool) and bool not in expected)):
+                return "argument %s must be %s" % (name, parameters[name])
+        return None
+
+    return validate
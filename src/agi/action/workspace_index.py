@@ -0,0 +1,302 @@
+"""
+Workspace index: paths, sizes, mtimes and a trigram index of text contents under base_dir.
+Refreshed incrementally (stat walk; only new/changed files are re-read) and optionally
+persisted to a gzip JSON file. Backs the find_files and search_text tools.
+Query-triggered refreshes are quick: only directories whose mtime changed (files added, removed
+or renamed) are listed and their files stat'ed; the rest reuse the last listing. An in-place
+edit in an unchanged directory is picked up by the next full walk (every full_refresh_interval,
+or refresh()); search re-checks candidate files' current contents, so it never returns a stale line.
+Thread-safe: refresh, persistence and queries hold one lock (speculation runs tools concurrently);
+search re-reads candidate files outside it.
+"""
+
+import fnmatch
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from agi.action.builtin_tools import SKIP_DIRS, SNIFF_BYTES
+
+INDEX_VERSION = 1
+# Files larger than this are listed but their contents are not indexed.
+MAX_INDEX_FILE_BYTES = 1024 * 1024
+# Minimum seconds between automatic refreshes triggered by queries.
+REFRESH_INTERVAL_S = 2.0
+# Query-triggered refreshes do a full stat walk at most this often; the others skip unchanged directories.
+FULL_REFRESH_INTERVAL_S = 60.0
+# A directory modified this close to its listing may change again within the same mtime tick: relist it.
+RACY_NS = 2 * 10**9
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct lowercase 3-character substrings of text."""
+    t = text.lower()
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def is_binary(head: bytes) -> bool:
+    return b"\0" in head
+
+
+class WorkspaceIndex:
+    """File metadata + trigram postings for one workspace root."""
+
+    def __init__(
+        self,
+        base_dir: str,
+        index_path: Optional[str] = None,
+        max_file_bytes: int = MAX_INDEX_FILE_BYTES,
+        refresh_interval: float = REFRESH_INTERVAL_S,
+        full_refresh_interval: float = FULL_REFRESH_INTERVAL_S,
+    ) -> None:
+        self.base_dir = os.path.abspath(base_dir)
+        self.index_path = index_path
+        self.max_file_bytes = max_file_bytes
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        # path -> (file id, size, mtime_ns, indexed); ids are stable for the index lifetime.
+        self._files: Dict[str, Tuple[int, int, int, bool]] = {}
+        self._paths: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._file_grams: Dict[int, Set[str]] = {}
+        self._next_id = 0
+        self._refreshed_at: Optional[float] = None
+        self._full_at: Optional[float] = None
+        # dir path -> (mtime_ns, racy, subdir paths, file rels) from its last listing
+        self._dirs: Dict[str, Tuple[int, bool, List[str], List[str]]] = {}
+        self.dirs_listed = 0
+        self._lock = threading.RLock()
+        if index_path and os.path.isfile(index_path):
+            self.load()
+
+    # --- maintenance ---
+
+    def _walk(self, full: bool) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """(rel, stat) per file; stat is None for files of a directory skipped as unchanged."""
+        dirs: Dict[str, Tuple[int, bool, List[str], List[str]]] = {}
+        stack = [self.base_dir]
+        while stack:
+            d = stack.pop()
+            try:
+                mtime = os.stat(d).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._dirs.get(d)
+            if not full and cached is not None and cached[0] == mtime and not cached[1]:
+                dirs[d] = cached
+                stack.extend(cached[2])
+                for rel in cached[3]:
+                    yield rel, None
+                continue
+            subdirs: List[str] = []
+            files: List[Tuple[str, os.stat_result]] = []
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in SKIP_DIRS:
+                                    subdirs.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                # A file removed between listing and stat is skipped (then dropped as removed).
+                                files.append((os.path.relpath(entry.path, self.base_dir).replace(os.sep, "/"), entry.stat()))
+                        except OSError:
+                            continue
+            except OSError:
+                # Listing failed: keep what the last listing knew (if any) and relist next time.
+                if cached is not None:
+                    stack.extend(cached[2])
+                    for rel in cached[3]:
+                        yield rel, None
+                continue
+            for rel, st in files:
+                yield rel, st
+            self.dirs_listed += 1
+            dirs[d] = (mtime, time.time_ns() - mtime < RACY_NS, subdirs, [rel for rel, _ in files])
+            stack.extend(subdirs)
+        self._dirs = dirs
+
+    def _read_text(self, rel: str, size: int) -> Optional[str]:
+        if size > self.max_file_bytes:
+            return None
+        try:
+            with open(os.path.join(self.base_dir, rel), "rb") as f:
+                data = f.read(self.max_file_bytes)
+        except OSError:
+            return None
+        if is_binary(data[:SNIFF_BYTES]):
+            return None
+        return data.decode("utf-8", errors="replace")
+
+    def _drop(self, rel: str) -> None:
+        fid = self._files.pop(rel)[0]
+        self._paths.pop(fid, None)
+        for g in self._file_grams.pop(fid, ()):
+            ids = self._postings.get(g)
+            if ids is not None:
+                ids.discard(fid)
+                if not ids:
+                    del self._postings[g]
+
+    def _add(self, rel: str, st: os.stat_result) -> None:
+        fid = self._next_id
+        self._next_id += 1
+        text = self._read_text(rel, st.st_size)
+        self._files[rel] = (fid, st.st_size, st.st_mtime_ns, text is not None)
+        self._paths[fid] = rel
+        if text is not None:
+            grams = trigrams(text)
+            self._file_grams[fid] = grams
+            for g in grams:
+                self._postings.setdefault(g, set()).add(fid)
+
+    def refresh(self, save: bool = True, full: bool = True) -> Dict[str, int]:
+        """Stat-walk base_dir; re-index new or changed (size/mtime) files, drop removed ones.
+        full=False lists only directories whose mtime changed since their last listing."""
+        with self._lock:
+            return self._refresh(save, full)
+
+    def _refresh(self, save: bool, full: bool) -> Dict[str, int]:
+        seen: Set[str] = set()
+        added = changed = 0
+        for rel, st in self._walk(full):
+            seen.add(rel)
+            cur = self._files.get(rel)
+            if st is None:
+                continue
+            if cur is None:
+                self._add(rel, st)
+                added += 1
+            elif cur[1] != st.st_size or cur[2] != st.st_mtime_ns:
+                self._drop(rel)
+                self._add(rel, st)
+                changed += 1
+        removed = [rel for rel in self._files if rel not in seen]
+        for rel in removed:
+            self._drop(rel)
+        self._refreshed_at = time.monotonic()
+        if full:
+            self._full_at = self._refreshed_at
+        if save and self.index_path and (added or changed or removed):
+            self.save()
+        return {"added": added, "changed": changed, "removed": len(removed), "files": len(self._files)}
+
+    def ensure_fresh(self) -> None:
+        """Refresh if never refreshed or the last refresh is older than refresh_interval (full walk if
+        the last full one is older than full_refresh_interval)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+                self._refresh(True, self._full_at is None or now - self._full_at >= self.full_refresh_interval)
+
+    # --- persistence ---
+
+    def save(self) -> None:
+        import gzip
+        import json
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "base_dir": self.base_dir,
+                "files": {rel: list(v) for rel, v in self._files.items()},
+                "postings": {g: sorted(ids) for g, ids in self._postings.items()},
+            }
+            tmp = self.index_path + ".tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+
+    def load(self) -> bool:
+        """Load a saved index; ignored (False) if the version or base_dir does not match."""
+        import gzip
+        import json
+        try:
+            with gzip.open(self.index_path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("base_dir") != self.base_dir:
+            return False
+        with self._lock:
+            self._set_loaded(data)
+        return True
+
+    def _set_loaded(self, data: Dict[str, Any]) -> None:
+        self._files = {rel: (v[0], v[1], v[2], bool(v[3])) for rel, v in data.get("files", {}).items()}
+        self._paths = {v[0]: rel for rel, v in self._files.items()}
+        self._postings = {g: set(ids) for g, ids in data.get("postings", {}).items()}
+        self._file_grams = {}
+        for g, ids in self._postings.items():
+            for fid in ids:
+                self._file_grams.setdefault(fid, set()).add(g)
+        self._next_id = max(self._paths, default=-1) + 1
+
+    # --- queries ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    def stat(self, rel: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            v = self._files.get(rel)
+        return {"path": rel, "size": v[1], "mtime_ns": v[2]} if v else None
+
+    def find(self, pattern: str, limit: int = 100) -> List[str]:
+        """Paths matching a glob (against the path, or the basename if pattern has no '/'); plain text = substring."""
+        self.ensure_fresh()
+        out: List[str] = []
+        globbing = any(c in pattern for c in "*?[")
+        p = pattern.lower()
+        with self._lock:
+            paths = sorted(self._files)
+        for rel in paths:
+            r = rel.lower()
+            if globbing:
+                target = r if "/" in p else r.rsplit("/", 1)[-1]
+                ok = fnmatch.fnmatchcase(target, p)
+            else:
+                ok = p in r
+            if ok:
+                out.append(rel)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def candidates(self, query: str) -> List[str]:
+        """Indexed text files that may contain query (trigram intersection; all text files if query < 3 chars)."""
+        with self._lock:
+            return self._candidates(query)
+
+    def _candidates(self, query: str) -> List[str]:
+        grams = trigrams(query)
+        if not grams:
+            return sorted(rel for rel, v in self._files.items() if v[3])
+        ids: Optional[Set[int]] = None
+        for g in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(g)
+            if not posting:
+                return []
+            ids = set(posting) if ids is None else ids & posting
+            if not ids:
+                return []
+        return sorted(self._paths[i] for i in ids or ())
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Case-insensitive line matches: [{path, line, text}], verified against current file contents."""
+        self.ensure_fresh()
+        q = query.lower()
+        matches: List[Dict[str, Any]] = []
+        with self._lock:
+            sizes = [(rel, self._files[rel][1]) for rel in self._candidates(query)]
+        for rel, size in sizes:
+            text = self._read_text(rel, size)
+            if text is None or q not in text.lower():
+                continue
+            for lineno, line in enumerate(text.splitlines(), 1):
+                if q in line.lower():
+                    matches.append({"path": rel, "line": lineno, "text": line[:200]})
+                    if len(matches) >= limit:
+                        return matches
+        return matches
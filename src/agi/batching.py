@@ -0,0 +1,158 @@
+"""
+Micro-batching for reasoners: concurrent agents submit states; a dispatcher thread collects
+them for up to max_wait_ms or max_batch items and makes one reason_many(states) call.
+Use MicroBatcher.reason as an Agent's reason_fn. StubBackend simulates per-call latency.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ReasonMany = Callable[[Sequence[Dict[str, Any]]], List[Dict[str, Any]]]
+
+DEFAULT_MAX_BATCH = 16
+DEFAULT_MAX_WAIT_MS = 5.0
+
+_CLOSE = object()
+
+
+class MicroBatcher:
+    """Collects reasoning requests from many threads and dispatches them as batches."""
+
+    def __init__(
+        self,
+        reason_many: ReasonMany,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.reason_many = reason_many
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        # Makes the closed check + put atomic, so _CLOSE is always the last item queued.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="agi-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, state: Dict[str, Any]) -> "Future[Dict[str, Any]]":
+        """Queue one state; the future resolves with its reasoner output."""
+        fut: "Future[Dict[str, Any]]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            self._queue.put((state, fut))
+        return fut
+
+    def reason(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking single-state call (drop-in reason_fn)."""
+        return self.submit(state).result()
+
+    def _collect(self, first: Tuple[Dict[str, Any], Future]) -> Tuple[List[Tuple[Dict[str, Any], Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _CLOSE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _dispatch(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            outputs = self.reason_many([state for state, _ in batch])
+            if len(outputs) != len(batch):
+                raise ValueError("reason_many returned %d outputs for %d states" % (len(outputs), len(batch)))
+        except BaseException as exc:
+            for _, fut in batch:
+                fut.set_exception(exc)
+            return
+        for (_, fut), out in zip(batch, outputs):
+            fut.set_result(out)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE:
+                    return
+                batch, closing = self._collect(item)
+                self._dispatch(batch)
+                if closing:
+                    return
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """On shutdown, fail anything still queued so no caller blocks forever."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _CLOSE and not item[1].done():
+                item[1].set_exception(RuntimeError("batcher is closed"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": self.items / self.batches if self.batches else 0.0,
+        }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Dispatch what is already queued, then stop the dispatcher thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class StubBackend:
+    """Local stand-in for a remote reasoner: sleeps per call (and per item), then runs fn on each state."""
+
+    def __init__(
+        self,
+        latency_per_call_s: float = 0.01,
+        latency_per_item_s: float = 0.0,
+        fn: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> None:
+        if fn is None:
+            from agi.reasoner import reason as fn
+        self.latency_per_call_s = latency_per_call_s
+        self.latency_per_item_s = latency_per_item_s
+        self.fn = fn
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _sleep(self, n: int) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency_per_call_s + self.latency_per_item_s * n)
+
+    def reason(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        self._sleep(1)
+        return self.fn(state)
+
+    def reason_many(self, states: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._sleep(len(states))
+        return [self.fn(s) for s in states]
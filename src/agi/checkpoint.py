@@ -0,0 +1,86 @@
+"""
+Binary agent checkpoints: the whole store (semantic, episodic, working memory incl. recent_turns,
+last_thought, active_goal), the tool manifest and per-tool cost stats, in one file.
+Layout: MAGIC, struct "<HQ" (format version, payload length), then a pickle (protocol 5) payload.
+The payload is plain data (each memory's state(): settings and entry lists); the store objects are
+rebuilt on load, so locks, pipes and indexes are never pickled. Only ConcreteStore-style stores
+(SemanticMemory, EpisodicMemory, WorkingMemory) can be checkpointed; restore gives a ConcreteStore.
+Written to a temp file and renamed, so a crash mid-write keeps the previous checkpoint.
+Pickle runs code on load: restore only checkpoints written by a trusted process.
+"""
+
+import os
+import pickle
+import struct
+from typing import Any, Dict, List
+
+from agi.memory.concrete_store import ConcreteStore
+from agi.memory.episodic import EpisodicMemory
+from agi.memory.semantic import SemanticMemory
+from agi.memory.working import WorkingMemory
+
+MAGIC = b"AGICKPT\0"
+CHECKPOINT_VERSION = 2
+PICKLE_PROTOCOL = 5
+_HEADER = struct.Struct("<HQ")
+
+
+def _plain_manifest(registry: Any) -> List[Dict[str, Any]]:
+    return [dict(t, parameters=dict(t["parameters"])) for t in registry.list_tools()]
+
+
+def store_state(store: Any) -> Dict[str, Any]:
+    """Plain-data snapshot of a store; TypeError for stores that cannot be checkpointed."""
+    memories = (getattr(store, "semantic", None), getattr(store, "episodic", None), getattr(store, "working", None))
+    kinds = (SemanticMemory, EpisodicMemory, WorkingMemory)
+    if not isinstance(store, ConcreteStore) or not all(isinstance(m, k) for m, k in zip(memories, kinds)):
+        raise TypeError("cannot checkpoint %s: only in-process stores (ConcreteStore with Semantic/Episodic/"
+                        "WorkingMemory) are supported" % type(store).__name__)
+    return {"semantic": store.semantic.state(), "episodic": store.episodic.state(), "working": store.working.state()}
+
+
+def restore_store(state: Dict[str, Any]) -> ConcreteStore:
+    return ConcreteStore(
+        semantic=SemanticMemory.from_state(state["semantic"]),
+        episodic=EpisodicMemory.from_state(state["episodic"]),
+        working=WorkingMemory.from_state(state["working"]),
+    )
+
+
+def dump_checkpoint(path: str, store: Any, registry: Any, tick_no: int = 0) -> int:
+    """Write store, manifest and tool stats to path; returns bytes written. Caller holds any store lock."""
+    payload = pickle.dumps(
+        {
+            "store": store_state(store),
+            "manifest": _plain_manifest(registry),
+            "tool_stats": registry.all_stats(),
+            "tick_no": tick_no,
+        },
+        protocol=PICKLE_PROTOCOL,
+    )
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(CHECKPOINT_VERSION, len(payload)))
+        f.write(payload)
+    os.replace(tmp, path)
+    return len(MAGIC) + _HEADER.size + len(payload)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Read a checkpoint written by dump_checkpoint: {store, manifest, tool_stats, tick_no}."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not an agent checkpoint: %s" % path)
+    if len(data) < len(MAGIC) + _HEADER.size:
+        raise ValueError("truncated checkpoint: %s" % path)
+    version, length = _HEADER.unpack_from(data, len(MAGIC))
+    if version != CHECKPOINT_VERSION:
+        raise ValueError("unsupported checkpoint version: %s" % version)
+    start = len(MAGIC) + _HEADER.size
+    if len(data) - start != length:
+        raise ValueError("truncated checkpoint: %s" % path)
+    state = pickle.loads(memoryview(data)[start:])
+    state["store"] = restore_store(state["store"])
+    return state
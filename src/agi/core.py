@@ -1,9 +1,12 @@
 """
 Core loop: perceive → recall → reason → plan → act → store.
 One tick = one full cycle. Agent holds memory, reasoner, planner, tools.
+Default reasoner/planner/reflect and built-in tools are imported and registered on first use.
 """
 
+import contextlib
 import os
+import time
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 
@@ -13,16 +16,27 @@ from agi.memory.concrete_store import ConcreteStore
 from agi.action.registry import ToolRegistry
 from agi.action.execute import execute_tool
 from agi.action.response import respond
-from agi.action.builtin_tools import register_builtins
-from agi import reasoner
-from agi import planner
-from agi import reflect as reflect_module
+from agi.scheduler import TickBudget, TickScheduler
+from agi.metrics import MetricsRegistry
+
+TICK_STAGES = ("perceive", "recall", "reason", "plan", "act", "store", "reflect")
+# Per-stage timings are taken on 1 tick in N; tick/tool latency and counters on every tick.
+STAGE_SAMPLE_EVERY = 8
+
+
+_NO_LOCK = contextlib.nullcontext()
+
+
+def _no_lap(stage: str, start: float) -> float:
+    return start
 
 
 @dataclass
 class TickInput:
     raw: str
     source: str = "user"
+    # Number of raw events merged into this input (agi.ingest coalescing); 1 for direct input.
+    coalesced: int = 1
 
 
 @dataclass
@@ -46,12 +60,78 @@ class Agent:
         plan_fn: Optional[Callable[[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]], Dict[str, Any]]] = None,
         registry: Optional[ToolRegistry] = None,
         reflect_fn: Optional[Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = None,
+        budget: Optional[TickBudget] = None,
+        base_dir: Optional[str] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        index_path: Optional[str] = None,
+        reflect_async: bool = False,
+        reflection_queue_size: Optional[int] = None,
+        recorder: Optional[Any] = None,
+        speculate_k: int = 0,
+        scorer: Optional[Callable[[Dict[str, Any], Dict[str, Any]], float]] = None,
+        prefetch: bool = False,
     ) -> None:
         self.store = store or ConcreteStore()
-        self.reason_fn = reason_fn or reasoner.reason
-        self.plan_fn = plan_fn or planner.plan
+        self.budget = budget or TickBudget()
+        if reason_fn is None:
+            from agi import reasoner
+            reason_fn = reasoner.reason
+        if plan_fn is None:
+            from agi import planner
+            plan_fn = planner.plan
+        if reflect_fn is None:
+            from agi import reflect as reflect_module
+            reflect_fn = reflect_module.reflect
+        self.reason_fn = reason_fn
+        self.plan_fn = plan_fn
         self.registry = registry or ToolRegistry()
-        self.reflect_fn = reflect_fn if reflect_fn is not None else reflect_module.reflect
+        self.reflect_fn = reflect_fn
+        self.base_dir = base_dir
+        self.index_path = index_path
+        # Optional trace sink (agi.trace.TraceRecorder): record(input, calls, output, latency) per tick.
+        self.recorder = recorder
+        # Pass one MetricsRegistry to several agents to aggregate them.
+        self.metrics_registry = metrics or MetricsRegistry()
+        self.metrics_registry.describe("agi_tick_stage_seconds", "Time spent per tick stage.")
+        self.metrics_registry.describe("agi_tool_latency_seconds", "execute_tool latency per tool.")
+        self._stage_hist = {st: self.metrics_registry.histogram("agi_tick_stage_seconds", stage=st) for st in TICK_STAGES}
+        self._tick_hist = self.metrics_registry.histogram("agi_tick_seconds")
+        self._tick_no = 0
+        self._ticks = self.metrics_registry.counter("agi_ticks_total")
+        self._acts = self.metrics_registry.counter("agi_acts_total")
+        self._reflections = self.metrics_registry.counter("agi_reflection_entries_total")
+        self._tick_acts: Dict[int, Any] = {}
+        # tool name -> (latency histogram, success counter, failure counter)
+        self._tool_series: Dict[str, Any] = {}
+        # Deferred reflection: tick enqueues, a worker thread reflects and stores in batches.
+        self.reflection = None
+        # Held around semantic reads (recall) while a reflection worker may be writing.
+        self.semantic_lock: Any = _NO_LOCK
+        if reflect_async:
+            from agi.reflection import DEFAULT_MAX_PENDING, ReflectionQueue
+            self.reflection = ReflectionQueue(
+                reflect_fn,
+                self.store,
+                max_pending=reflection_queue_size or DEFAULT_MAX_PENDING,
+                on_stored=self._reflections.inc,
+            )
+            self.semantic_lock = self.reflection.lock
+        # Speculation (k > 1): the first act runs the top-k read-only candidate_actions in parallel
+        # on store snapshots; the best-scoring one (scorer, default agi.speculate.default_score) wins.
+        self.speculate_k = speculate_k
+        self.scorer = scorer
+        self._spec_pool: Any = None
+        if speculate_k > 1:
+            self._speculations = self.metrics_registry.counter("agi_speculations_total")
+            self._spec_overrides = self.metrics_registry.counter("agi_speculation_overrides_total")
+        # Prefetch: after each act, warm the predicted next read_file/list_dir in the background
+        # (agi.prefetch; transition stats learned from the store's episodic memory).
+        self.prefetcher: Any = None
+        if prefetch:
+            from agi.prefetch import Prefetcher
+            episodic = getattr(self.store, "episodic", None)
+            self.prefetcher = Prefetcher(self.registry, base_dir, episodes=episodic.all() if episodic is not None else None)
+            self._prefetch_hits = self.metrics_registry.counter("agi_prefetch_hits_total")
         # Built-in respond tool so loop can terminate
         self.registry.register(
             "respond",
@@ -60,19 +140,126 @@ class Agent:
             "read",
             _default_respond,
         )
-        # Built-in read-only tools (read_file, list_dir)
-        register_builtins(self.registry, base_dir=os.getcwd())
+        # Built-in read-only tools (read_file, list_dir): registered on first lookup; workspace
+        # defaults to the cwd at that point.
+        self.registry.add_provider(self._register_builtins)
+
+    def _register_builtins(self, registry: ToolRegistry) -> None:
+        from agi.action.builtin_tools import register_builtins
+        if self.base_dir is None:
+            self.base_dir = os.getcwd()
+        if self.prefetcher is not None:
+            self.prefetcher.base_dir = self.base_dir
+        register_builtins(registry, base_dir=self.base_dir, index_path=self.index_path)
+
+    def flush(self) -> None:
+        """Wait for deferred reflections to be stored (no-op without reflect_async)."""
+        if self.reflection is not None:
+            self.reflection.flush()
+
+    def close(self) -> None:
+        """Flush and stop background workers. The agent must not tick afterwards."""
+        if self.reflection is not None:
+            self.reflection.close()
+        if self._spec_pool is not None:
+            self._spec_pool.shutdown(wait=True)
+            self._spec_pool = None
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+
+    def checkpoint(self, path: str) -> int:
+        """Binary snapshot of the store (incl. working memory), tool manifest and tool stats (agi.checkpoint).
+        Reflections still queued (reflect_async) are not included. Returns bytes written.
+        TypeError for stores that cannot be checkpointed (SharedStore, ShardedStore)."""
+        from agi.checkpoint import dump_checkpoint
+        with self.semantic_lock:
+            return dump_checkpoint(path, self.store, self.registry, self._tick_no)
+
+    def restore(self, path: str) -> Dict[str, Any]:
+        """Replace store and tool stats from a checkpoint. Returns {"missing_tools": [...]}: checkpointed
+        tools this agent's registry does not provide (functions are not serialized)."""
+        from agi.checkpoint import load_checkpoint
+        state = load_checkpoint(path)
+        self.flush()
+        with self.semantic_lock:
+            self.store = state["store"]
+            if self.reflection is not None:
+                self.reflection.store = self.store
+        self.registry.restore_stats(state.get("tool_stats") or {})
+        self._tick_no = state.get("tick_no", self._tick_no)
+        current = set(self.registry.manifest().names())
+        return {"missing_tools": [t["name"] for t in state.get("manifest") or [] if t["name"] not in current]}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of this agent's metrics registry: counters and histogram summaries (p50/p90/p99)."""
+        return self.metrics_registry.snapshot()
+
+    def _lap(self, stage: str, start: float) -> float:
+        """Record time since start under stage; return now (start of the next stage)."""
+        now = time.perf_counter()
+        self._stage_hist[stage].observe(now - start)
+        return now
+
+    def _record_tool(self, name: str, latency: float, observation: Dict[str, Any]) -> None:
+        series = self._tool_series.get(name)
+        if series is None:
+            m = self.metrics_registry
+            series = self._tool_series[name] = (
+                m.histogram("agi_tool_latency_seconds", tool=name),
+                m.counter("agi_tool_calls_total", tool=name, outcome="success"),
+                m.counter("agi_tool_calls_total", tool=name, outcome="failure"),
+            )
+        series[0].observe(latency)
+        series[1 if observation.get("success") else 2].inc()
+
+    def _store_act(self, store: Store, state_input: Dict[str, Any], action_name: str, observation: Dict[str, Any]) -> None:
+        """Memory writes for one act: episode record and working-memory turn."""
+        store.store_episodic([
+            {"event": "tick", "context": {"input_preview": state_input.get("normalized", "")[:100], "action": action_name, "success": observation.get("success")}}
+        ])
+        store.push_turn({"input": state_input, "action": action_name, "observation": observation})
+
+    def _speculate(self, state: Dict[str, Any], reason_out: Dict[str, Any], next_step: Dict[str, Any], tools: Any) -> Optional[Dict[str, Any]]:
+        """Run top-k read-only candidates on snapshots; commit and return the winning step + observation."""
+        from agi.speculate import read_only_candidates, speculate
+        steps = read_only_candidates([next_step] + list(reason_out.get("candidate_actions") or []), tools, self.speculate_k)
+        if len(steps) < 2 or steps[0] is not next_step:
+            return None
+        if self._spec_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._spec_pool = ThreadPoolExecutor(max_workers=self.speculate_k, thread_name_prefix="agi-spec")
+        state_input = state["input"]
+
+        def run(step: Dict[str, Any], snapshot: Store) -> Dict[str, Any]:
+            name = step.get("action", "respond")
+            start = time.perf_counter()
+            observation = execute_tool(self.registry, name, step.get("args", {}))
+            self._record_tool(name, time.perf_counter() - start, observation)
+            self._store_act(snapshot, state_input, name, observation)
+            return observation
+
+        winner, results = speculate(steps, self.store, run, self._spec_pool, self.scorer)
+        self._speculations.inc()
+        if winner:
+            self._spec_overrides.inc()
+        return {"step": results[winner][0], "observation": results[winner][1]}
 
     def tick(self, input: TickInput) -> TickOutput:
         """One full cycle: perceive → recall → reason → plan → act → store."""
+        self._tick_no += 1
+        lap = self._lap if self._tick_no % STAGE_SAMPLE_EVERY == 1 else _no_lap
+        tick_start = t = time.perf_counter()
         # Perceive
         perceived = perceive_fn(input.raw, input.source if input.source in ("user", "env", "event") else "user")
         state: Dict[str, Any] = {
             "input": {"raw": perceived.raw, "normalized": perceived.normalized, "source": perceived.source},
         }
+        t = lap("perceive", t)
         # Recall
-        state["recalled"] = self.store.recall(query=perceived.normalized[:200] if perceived.normalized else None)
+        with self.semantic_lock:
+            state["recalled"] = self.store.recall(query=perceived.normalized[:200] if perceived.normalized else None)
         state["goal"] = self.store.get_working("active_goal") or {"id": "tick", "description": perceived.normalized or "Continue.", "status": "active"}
+        t = lap("recall", t)
         # Reason
         reason_out = self.reason_fn(state)
         state["beliefs"] = reason_out.get("beliefs", {})
@@ -80,30 +267,57 @@ class Agent:
         thought = reason_out.get("thought", "")
         if thought and hasattr(self.store, "set_working"):
             self.store.set_working("last_thought", thought)
+        t = lap("reason", t)
         # Plan
         tools_list = self.registry.list_tools()
         state["plan"] = self.plan_fn(state["goal"], reason_out, tools_list)
         next_step = state["plan"].get("next_step") or {"action": "respond", "args": {"text": perceived.normalized or "OK."}}
-        # Act (up to 2 acts per tick: optional chain list_dir -> read first file)
-        max_acts = 2
+        t = lap("plan", t)
+        # Act (chain list_dir -> read first file while the tick budget allows; else partial response)
+        scheduler = TickScheduler(self.budget, self.registry, started=tick_start)
         response_text = None
         halt = False
         observation = None
-        for _ in range(max_acts):
-            action_name = next_step.get("action", "respond")
-            action_args = next_step.get("args", {})
-            observation = execute_tool(self.registry, action_name, action_args)
+        calls: Optional[List[Dict[str, Any]]] = [] if self.recorder is not None else None
+        while scheduler.can_run(next_step.get("action", "respond")):
+            act_start = time.perf_counter()
+            spec = self._speculate(state, reason_out, next_step, self.registry.manifest()) if self.speculate_k > 1 and scheduler.acts == 0 else None
+            if spec is not None:
+                # Candidates' tool metrics are recorded per branch; the winner's memory writes are committed.
+                next_step, observation = spec["step"], spec["observation"]
+                action_name = next_step.get("action", "respond")
+                action_args = next_step.get("args", {})
+                act_latency = time.perf_counter() - act_start
+            else:
+                action_name = next_step.get("action", "respond")
+                action_args = next_step.get("args", {})
+                observation = self.prefetcher.lookup(action_name, action_args) if self.prefetcher is not None else None
+                if observation is None:
+                    observation = execute_tool(self.registry, action_name, action_args)
+                else:
+                    self._prefetch_hits.inc()
+                act_latency = time.perf_counter() - act_start
+                self._record_tool(action_name, act_latency, observation)
+            if self.prefetcher is not None:
+                self.prefetcher.after(action_name, observation, chained=scheduler.acts > 0)
+            if calls is not None:
+                calls.append({"tool": action_name, "args": action_args, "observation": observation, "latency": act_latency})
+            t = lap("act", t)
+            scheduler.record(observation)
             state["observation"] = observation
             # Store
-            self.store.store_episodic([
-                {"event": "tick", "context": {"input_preview": state["input"].get("normalized", "")[:100], "action": action_name, "success": observation.get("success")}}
-            ])
-            if hasattr(self.store, "push_turn"):
-                self.store.push_turn({"input": state["input"], "action": action_name, "observation": observation})
+            if spec is None:
+                self._store_act(self.store, state["input"], action_name, observation)
+            t = lap("store", t)
             state["action"] = action_name
-            entries = self.reflect_fn(state)
-            if entries:
-                self.store.store_semantic(entries)
+            if self.reflection is not None:
+                self.reflection.submit(state)
+            else:
+                entries = self.reflect_fn(state)
+                if entries:
+                    self.store.store_semantic(entries)
+                    self._reflections.inc(len(entries))
+            t = lap("reflect", t)
             # Halt if response or content (read_file result)
             if observation.get("success") and isinstance(observation.get("payload"), dict):
                 payload = observation["payload"]
@@ -125,14 +339,27 @@ class Agent:
             state["beliefs"] = reason_out.get("beliefs", {})
             if reason_out.get("thought") and hasattr(self.store, "set_working"):
                 self.store.set_working("last_thought", reason_out.get("thought", ""))
+            t = lap("reason", t)
             state["plan"] = self.plan_fn(state["goal"], reason_out, tools_list)
             next_step = state["plan"].get("next_step") or {"action": "respond", "args": {"text": response_text or str(observation)}}
+            t = lap("plan", t)
             if next_step.get("action") == "respond":
                 response_text = next_step.get("args", {}).get("text", response_text or "")
                 halt = True
                 break
         observation = observation or {}
-        return TickOutput(observation=observation, response=response_text, halt=halt)
+        self._ticks.inc()
+        self._acts.inc(scheduler.acts)
+        acts_counter = self._tick_acts.get(scheduler.acts)
+        if acts_counter is None:
+            acts_counter = self._tick_acts[scheduler.acts] = self.metrics_registry.counter("agi_tick_acts_total", acts=scheduler.acts)
+        acts_counter.inc()
+        tick_latency = time.perf_counter() - tick_start
+        self._tick_hist.observe(tick_latency)
+        out = TickOutput(observation=observation, response=response_text, halt=halt)
+        if self.recorder is not None:
+            self.recorder.record(input, calls or [], out, tick_latency)
+        return out
 
 
 def tick(agent: Agent, input: TickInput) -> TickOutput:
@@ -0,0 +1,174 @@
+"""
+Input ingestion in front of Agent.tick: user input is served first (FIFO); env/event input is
+debounced and coalesced by key, so a burst of repeated events becomes one TickInput
+(coalesced = burst size, raw = latest event). The default key is the source plus the exact
+normalized text, so distinct events (e.g. two different changed files) are never merged away;
+similar_key folds case, whitespace and numbers for sources where only the latest event matters. A group is released once it has been quiet for
+debounce_s, or max_delay_s after its first event even if the burst continues.
+Event groups are bounded (max_pending); a new key beyond that is dropped and counted.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from agi.core import Agent, TickInput, TickOutput
+from agi.perceive import perceive
+
+DEFAULT_DEBOUNCE_S = 0.05
+DEFAULT_MAX_DELAY_S = 1.0
+DEFAULT_MAX_PENDING = 1024
+
+
+def default_key(input: TickInput) -> str:
+    """Coalesce only repeats of the same event (same source and normalized text)."""
+    return "%s:%s" % (input.source, perceive(input.raw).normalized)
+
+
+def similar_key(input: TickInput) -> str:
+    """Coalesce events that differ only in case, whitespace or numbers (only the latest raw survives)."""
+    from agi.memory.semantic import normalize_fact
+    return "%s:%s" % (input.source, normalize_fact(input.raw, fold_numbers=True))
+
+
+class _Group:
+    __slots__ = ("input", "count", "first_at", "last_at")
+
+    def __init__(self, input: TickInput, now: float) -> None:
+        self.input = input
+        self.count = 1
+        self.first_at = now
+        self.last_at = now
+
+
+class InputQueue:
+    """Priority + coalescing queue of TickInputs. Thread-safe; producers call put(), one consumer get()."""
+
+    def __init__(
+        self,
+        debounce_s: float = DEFAULT_DEBOUNCE_S,
+        max_delay_s: float = DEFAULT_MAX_DELAY_S,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        key_fn: Callable[[TickInput], str] = default_key,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self.max_pending = max_pending
+        self.key_fn = key_fn
+        self.clock = clock
+        self._user: Deque[TickInput] = deque()
+        self._groups: "OrderedDict[str, _Group]" = OrderedDict()
+        self._cond = threading.Condition()
+        self.received = 0
+        self.merged = 0
+        self.dropped = 0
+        self.delivered = 0
+
+    def put(self, input: TickInput, key: Optional[str] = None) -> str:
+        """Enqueue; returns "queued", "merged" (into a pending burst) or "dropped"."""
+        with self._cond:
+            self.received += 1
+            if input.source not in ("env", "event"):
+                self._user.append(input)
+                self._cond.notify()
+                return "queued"
+            now = self.clock()
+            k = key if key is not None else self.key_fn(input)
+            group = self._groups.get(k)
+            if group is not None:
+                group.input = input
+                group.count += 1
+                group.last_at = now
+                self.merged += 1
+                return "merged"
+            if len(self._groups) >= self.max_pending:
+                self.dropped += 1
+                return "dropped"
+            self._groups[k] = _Group(input, now)
+            self._cond.notify()
+            return "queued"
+
+    def _ready_at(self, group: _Group) -> float:
+        return min(group.last_at + self.debounce_s, group.first_at + self.max_delay_s)
+
+    def _pop_ready(self) -> Optional[TickInput]:
+        if self._user:
+            return self._user.popleft()
+        now = self.clock()
+        for k, group in self._groups.items():
+            if self._ready_at(group) <= now:
+                del self._groups[k]
+                inp = group.input
+                return TickInput(raw=inp.raw, source=inp.source, coalesced=group.count)
+        return None
+
+    def _next_deadline(self) -> Optional[float]:
+        return min((self._ready_at(g) for g in self._groups.values()), default=None)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[TickInput]:
+        """Next input: pending user input first, else the oldest released event group. None on timeout."""
+        end = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while True:
+                item = self._pop_ready()
+                if item is not None:
+                    self.delivered += 1
+                    return item
+                now = self.clock()
+                wait = None
+                deadline = self._next_deadline()
+                if deadline is not None:
+                    wait = max(0.0, deadline - now)
+                if end is not None:
+                    if now >= end:
+                        return None
+                    wait = end - now if wait is None else min(wait, end - now)
+                self._cond.wait(wait)
+
+    def poll(self) -> Optional[TickInput]:
+        """Non-blocking get()."""
+        with self._cond:
+            item = self._pop_ready()
+            if item is not None:
+                self.delivered += 1
+            return item
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._user) + len(self._groups)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "depth": len(self._user) + len(self._groups),
+                "user_depth": len(self._user),
+                "event_depth": len(self._groups),
+                "received": self.received,
+                "merged": self.merged,
+                "dropped": self.dropped,
+                "delivered": self.delivered,
+            }
+
+
+def pump(
+    agent: Agent,
+    queue: InputQueue,
+    on_output: Optional[Callable[[TickInput, TickOutput], None]] = None,
+    stop: Optional[threading.Event] = None,
+    idle_timeout: float = 0.1,
+) -> int:
+    """Tick agent for each input from queue until stop is set (or the queue stays empty for idle_timeout if stop is None)."""
+    ticks = 0
+    while stop is None or not stop.is_set():
+        inp = queue.get(timeout=idle_timeout)
+        if inp is None:
+            if stop is None:
+                break
+            continue
+        out = agent.tick(inp)
+        ticks += 1
+        if on_output is not None:
+            on_output(inp, out)
+    return ticks
@@ -2,13 +2,16 @@
 Entry: CLI — read from stdin or args; run loop until halt or max ticks; print response.
 --loop: multi-turn REPL (read line, tick, print; exit on empty line or EOF).
 --memory PATH: load/save semantic and episodic memory to JSON (working memory not persisted).
+--retain-days N: keep raw episodes since today minus N days; older days become summaries, raw archived next to PATH.
+--stats: print memory footprint (counts, approximate bytes, index sizes) without running a tick.
+--record PATH: write a tick trace (JSONL) for agi-replay.
+--async-reflect: reflection runs on a background worker; it is flushed before each save and on exit.
+The agent stack is imported after argument parsing, so --help and usage errors stay fast.
 """
 
 import argparse
 import sys
-
-from agi.core import Agent, TickInput, tick
-from agi.memory import ConcreteStore, load_store, save_store
+from typing import Any, Callable, Optional
 
 
 def _print_output(out) -> None:
@@ -26,17 +29,91 @@ def _print_output(out) -> None:
             print(payload.get("text", str(out.observation)))
 
 
+def _print_stats(store: Any, top: Optional[int]) -> None:
+    import json
+    report = store.stats()
+    if top is not None:
+        from agi.memory.footprint import tracemalloc_top
+        report["tracemalloc_top"] = tracemalloc_top(top)
+    print(json.dumps(report, indent=2))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="AGI — perceive → recall → reason → plan → act → store")
     parser.add_argument("input", nargs="*", help="Input text (or read from stdin)")
     parser.add_argument("--max-ticks", type=int, default=10, help="Max ticks before stopping (default 10)")
     parser.add_argument("--loop", action="store_true", help="Multi-turn REPL: read line, tick, print; exit on empty line")
-    parser.add_argument("--memory", metavar="PATH", default=None, help="Load/save semantic+episodic memory to JSON file")
+    parser.add_argument("--memory", metavar="PATH", default=None, help="Load/save semantic+episodic memory (.json, or streamed .jsonl / .jsonl.gz / .jsonl.xz)")
     parser.add_argument("--show-thought", action="store_true", help="Print agent's last thought (working memory) to stderr")
+    parser.add_argument("--retain-days", type=int, default=None, metavar="N", help="Compact episodes older than N days into summaries (raw archived to PATH.archive/)")
+    parser.add_argument("--max-acts", type=int, default=None, help="Max tool acts chained per tick (default 2)")
+    parser.add_argument("--tick-budget-ms", type=float, default=None, metavar="MS", help="Wall-clock budget per tick; skip chained acts that would overrun")
+    parser.add_argument("--max-output-bytes", type=int, default=None, metavar="N", help="Tool output byte budget per tick")
+    parser.add_argument("--index", metavar="PATH", default=None, help="Persist the workspace file index (find/search tools) to PATH (gzip JSON)")
+    parser.add_argument("--metrics-file", metavar="PATH", default=None, help="Write Prometheus text-format metrics to PATH after each tick")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT", help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--async-reflect", action="store_true", help="Reflect in a background worker; responses print before reflection finishes")
+    parser.add_argument("--record", metavar="PATH", default=None, help="Record every tick (input, tool calls, observations, timings) to a JSONL trace for agi-replay")
+    parser.add_argument("--speculate", type=int, default=0, metavar="K", help="Run the top K read-only candidate actions in parallel and keep the best result")
+    parser.add_argument("--prefetch", action="store_true", help="Warm the predicted next read_file/list_dir in the background while the tick continues")
+    parser.add_argument("--stats", action="store_true", help="Print memory footprint stats (with --memory: of the loaded file) as JSON and exit; no tick runs")
+    parser.add_argument("--tracemalloc", type=int, default=None, metavar="N", help="With --stats: also report the top N allocation sites (tracemalloc)")
     args = parser.parse_args()
+    if args.tracemalloc is not None:
+        import tracemalloc
+        tracemalloc.start()
+
+    from agi.core import Agent
+    from agi.memory import ConcreteStore, EpisodicMemory
+    from agi.scheduler import DEFAULT_MAX_ACTS, TickBudget
+    if args.memory:
+        from agi.memory.persistence import load_store, save_store
+
+    def _new_store() -> ConcreteStore:
+        if args.retain_days is None:
+            return ConcreteStore()
+        archive_dir = (args.memory + ".archive") if args.memory else None
+        from datetime import timedelta
+        return ConcreteStore(episodic=EpisodicMemory(segment="day", max_age=timedelta(days=args.retain_days), archive_dir=archive_dir))
 
-    store = load_store(args.memory) if args.memory else None
-    agent = Agent(store=store or ConcreteStore())
+    store = load_store(args.memory, store=_new_store()) if args.memory else None
+    if args.stats:
+        _print_stats(store or _new_store(), args.tracemalloc)
+        return
+    budget = TickBudget(
+        max_acts=args.max_acts if args.max_acts is not None else DEFAULT_MAX_ACTS,
+        wall_clock_s=args.tick_budget_ms / 1000.0 if args.tick_budget_ms is not None else None,
+        max_output_bytes=args.max_output_bytes,
+    )
+    recorder = None
+    if args.record:
+        from agi.trace import TraceRecorder
+        recorder = TraceRecorder(args.record)
+    agent = Agent(store=store or _new_store(), budget=budget, index_path=args.index, reflect_async=args.async_reflect, recorder=recorder, speculate_k=args.speculate, prefetch=args.prefetch)
+    try:
+        _run(args, agent, save_store if args.memory else None)
+    finally:
+        # Flush-on-exit: queued reflections are stored before the process ends.
+        agent.close()
+        if recorder is not None:
+            recorder.close()
+
+
+def _run(args: argparse.Namespace, agent: Any, save_store: Optional[Callable[..., None]]) -> None:
+    from agi.core import TickInput, tick
+
+    if args.metrics_port is not None:
+        from agi.metrics import serve_metrics
+        serve_metrics(agent.metrics_registry, args.metrics_port)
+
+    def _after_tick() -> None:
+        if save_store is not None:
+            # Output is already printed; wait for this tick's reflections so the file is complete.
+            agent.flush()
+            with agent.semantic_lock:
+                save_store(agent.store, args.memory)
+        if args.metrics_file:
+            agent.metrics_registry.write_prometheus(args.metrics_file)
 
     if args.loop:
         try:
@@ -54,11 +131,11 @@ def main() -> None:
                     if thought:
                         print("[thought] %s" % thought, file=sys.stderr)
                 _print_output(out)
-                if args.memory:
-                    save_store(agent.store, args.memory)
+                _after_tick()
         except KeyboardInterrupt:
             pass
-        if args.memory:
+        if save_store is not None:
+            agent.flush()
             save_store(agent.store, args.memory)
         return
 
@@ -76,8 +153,7 @@ def main() -> None:
         if thought:
             print("[thought] %s" % thought, file=sys.stderr)
     _print_output(out)
-    if args.memory:
-        save_store(agent.store, args.memory)
+    _after_tick()
 
 
 if __name__ == "__main__":
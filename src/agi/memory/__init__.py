@@ -1,14 +1,20 @@
 """
 Memory: semantic (facts), episodic (events), working (bounded context).
 Interface: recall(query, kind?) and store(entries). Optional persistence to JSON.
+Submodules load on first attribute access (PEP 562).
 """
 
-from agi.memory.store import Store
-from agi.memory.concrete_store import ConcreteStore
-from agi.memory.working import WorkingMemory
-from agi.memory.semantic import SemanticMemory
-from agi.memory.episodic import EpisodicMemory
-from agi.memory.persistence import save_store, load_store
+from typing import TYPE_CHECKING
+
+from agi._lazy import lazy_module
+
+if TYPE_CHECKING:
+    from agi.memory.store import Store
+    from agi.memory.concrete_store import ConcreteStore
+    from agi.memory.working import WorkingMemory
+    from agi.memory.semantic import SemanticMemory
+    from agi.memory.episodic import EpisodicMemory
+    from agi.memory.persistence import save_store, load_store
 
 __all__ = [
     "Store",
@@ -19,3 +25,15 @@ __all__ = [
     "save_store",
     "load_store",
 ]
+
+_LAZY = {
+    "Store": "agi.memory.store",
+    "ConcreteStore": "agi.memory.concrete_store",
+    "WorkingMemory": "agi.memory.working",
+    "SemanticMemory": "agi.memory.semantic",
+    "EpisodicMemory": "agi.memory.episodic",
+    "save_store": "agi.memory.persistence",
+    "load_store": "agi.memory.persistence",
+}
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
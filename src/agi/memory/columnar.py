@@ -0,0 +1,221 @@
+"""
+Columnar episodic analytics (optional NumPy: pip install agi-core[analytics]).
+to_columns(episodic) turns raw episodes into a structured array with one row per episode:
+ts (int64 µs since epoch, UTC), action (int32 code into `actions`), success (bool),
+preview_off / preview_len (UTF-8 slice of the shared `previews` blob holding input previews).
+Filters and group-bys are vectorized; save()/load() use a directory of .npy + blob files,
+memory-mapped on load so large logs are not read into RAM.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - exercised only without numpy
+    raise ImportError("agi.memory.columnar requires numpy (pip install agi-core[analytics])") from e
+
+EPISODE_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("action", "<i4"),
+    ("success", "?"),
+    ("preview_off", "<i8"),
+    ("preview_len", "<i4"),
+])
+# Action code for episodes without context["action"].
+NO_ACTION = -1
+US_PER_S = 1_000_000
+
+_RECORDS_FILE = "episodes.npy"
+_PREVIEWS_FILE = "previews.bin"
+_META_FILE = "meta.json"
+COLUMNAR_VERSION = 1
+
+
+def _parse_ts(stamps: List[str]) -> "np.ndarray":
+    """ISO-8601 UTC strings -> int64 µs since epoch (vectorized; per-row fallback for offsets)."""
+    trimmed = [s[:-1] if s.endswith("Z") else s for s in stamps]
+    try:
+        return np.array(trimmed, dtype="datetime64[us]").astype("<i8")
+    except ValueError:
+        from datetime import datetime, timezone
+        out = np.empty(len(stamps), dtype="<i8")
+        for i, s in enumerate(trimmed):
+            dt = datetime.fromisoformat(s)
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+            out[i] = (dt - datetime(1970, 1, 1)) // np.timedelta64(1, "us").item()
+        return out
+
+
+def _to_us(t: Any) -> Optional[int]:
+    if t is None:
+        return None
+    if isinstance(t, (int, np.integer)):
+        return int(t)
+    from agi.memory.episodic import _iso
+    return int(_parse_ts([_iso(t)])[0])
+
+
+class EpisodeColumns:
+    """Structured episode array plus the action table and preview blob it references."""
+
+    def __init__(self, records: "np.ndarray", actions: Sequence[str], previews: Any) -> None:
+        self.records = records
+        self.actions = list(actions)
+        self.previews = previews
+        self._codes = {a: i for i, a in enumerate(self.actions)}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def ts(self) -> "np.ndarray":
+        return self.records["ts"]
+
+    @property
+    def action(self) -> "np.ndarray":
+        return self.records["action"]
+
+    @property
+    def success(self) -> "np.ndarray":
+        return self.records["success"]
+
+    def action_code(self, name: str) -> int:
+        """Code for an action name; NO_ACTION - 1 (matches nothing) if the action never occurs."""
+        return self._codes.get(name, NO_ACTION - 1)
+
+    def preview(self, i: int) -> str:
+        r = self.records[i]
+        off, n = int(r["preview_off"]), int(r["preview_len"])
+        return bytes(self.previews[off:off + n]).decode("utf-8", errors="replace")
+
+    # --- vectorized filters ---
+
+    def mask(
+        self,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> "np.ndarray":
+        """Boolean row mask for all given filters (time bounds inclusive; datetimes, ISO strings or µs)."""
+        m = np.ones(len(self.records), dtype=bool)
+        if action is not None:
+            m &= self.records["action"] == self.action_code(action)
+        if success is not None:
+            m &= self.records["success"] == bool(success)
+        lo, hi = _to_us(since), _to_us(until)
+        if lo is not None:
+            m &= self.records["ts"] >= lo
+        if hi is not None:
+            m &= self.records["ts"] <= hi
+        return m
+
+    def filter(self, **filters: Any) -> "EpisodeColumns":
+        """Rows matching mask(**filters); shares the action table and preview blob."""
+        return EpisodeColumns(self.records[self.mask(**filters)], self.actions, self.previews)
+
+    # --- group-bys ---
+
+    def _by_action(self, weights: Optional["np.ndarray"] = None) -> "np.ndarray":
+        # Shift by one so NO_ACTION lands in bin 0.
+        return np.bincount(self.records["action"] + 1, weights=weights, minlength=len(self.actions) + 1)
+
+    def _name(self, code: int) -> Optional[str]:
+        return None if code == NO_ACTION else self.actions[code]
+
+    def action_counts(self) -> Dict[Optional[str], int]:
+        counts = self._by_action()
+        return {self._name(c - 1): int(n) for c, n in enumerate(counts) if n}
+
+    def success_rate_by_action(self) -> Dict[Optional[str], float]:
+        counts = self._by_action()
+        wins = self._by_action(self.records["success"].astype(np.float64))
+        return {self._name(c - 1): float(wins[c] / n) for c, n in enumerate(counts) if n}
+
+    def counts_by_time(self, bucket_s: int = 3600) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(bucket start µs, episode count) for non-empty buckets of bucket_s seconds (tick density)."""
+        buckets = self.records["ts"] // (bucket_s * US_PER_S)
+        starts, counts = np.unique(buckets, return_counts=True)
+        return starts * (bucket_s * US_PER_S), counts
+
+    def success_rate_by_time(self, bucket_s: int = 3600) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(bucket start µs, success rate) for non-empty buckets of bucket_s seconds."""
+        buckets = self.records["ts"] // (bucket_s * US_PER_S)
+        starts, inverse, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+        wins = np.bincount(inverse.ravel(), weights=self.records["success"].astype(np.float64), minlength=len(starts))
+        return starts * (bucket_s * US_PER_S), wins / counts
+
+    # --- on-disk form ---
+
+    def save(self, path: str) -> None:
+        """Write path/ (episodes.npy, previews.bin, meta.json); load(path) memory-maps it."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, _RECORDS_FILE), np.ascontiguousarray(self.records), allow_pickle=False)
+        with open(os.path.join(path, _PREVIEWS_FILE), "wb") as f:
+            f.write(bytes(self.previews))
+        with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": COLUMNAR_VERSION, "actions": self.actions}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "EpisodeColumns":
+        with open(os.path.join(path, _META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version", COLUMNAR_VERSION) > COLUMNAR_VERSION:
+            raise ValueError("unsupported columnar version: %s" % meta.get("version"))
+        records = np.load(os.path.join(path, _RECORDS_FILE), mmap_mode="r" if mmap else None, allow_pickle=False)
+        previews_path = os.path.join(path, _PREVIEWS_FILE)
+        if mmap and os.path.getsize(previews_path):
+            previews: Any = np.memmap(previews_path, dtype=np.uint8, mode="r")
+        else:
+            with open(previews_path, "rb") as f:
+                previews = f.read()
+        return cls(records, meta.get("actions", []), previews)
+
+
+def from_episodes(episodes: Iterable[Dict[str, Any]]) -> EpisodeColumns:
+    """Build columns from raw episode dicts (summary episodes are skipped)."""
+    from agi.memory.episodic import is_summary
+    codes: Dict[str, int] = {}
+    stamps: List[str] = []
+    actions: List[int] = []
+    successes: List[bool] = []
+    lengths: List[int] = []
+    blob = bytearray()
+    for e in episodes:
+        if is_summary(e):
+            continue
+        ctx = e.get("context") or {}
+        name = ctx.get("action")
+        if name is None:
+            actions.append(NO_ACTION)
+        else:
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(codes)
+            actions.append(code)
+        stamps.append(e.get("timestamp", ""))
+        successes.append(bool(ctx.get("success")))
+        preview = (ctx.get("input_preview") or "").encode("utf-8")
+        lengths.append(len(preview))
+        blob += preview
+    records = np.empty(len(stamps), dtype=EPISODE_DTYPE)
+    records["ts"] = _parse_ts(stamps) if stamps else 0
+    records["action"] = actions
+    records["success"] = successes
+    lens = np.array(lengths, dtype="<i8")
+    records["preview_len"] = lens
+    records["preview_off"] = np.cumsum(lens) - lens
+    return EpisodeColumns(records, list(codes), bytes(blob))
+
+
+def to_columns(episodic: Any, include_archived: bool = False) -> EpisodeColumns:
+    """Columnar view of an EpisodicMemory's raw episodes (optionally archived segments first)."""
+    def episodes() -> Iterable[Dict[str, Any]]:
+        if include_archived:
+            for seg in episodic.archived_segments():
+                yield from episodic.load_segment(seg)
+        yield from episodic.all()
+    return from_episodes(episodes())
@@ -15,18 +15,24 @@ Kind = Literal["semantic", "episodic", "working"]
 class ConcreteStore(StoreBase):
     """Unified store: recall returns semantic/episodic/working; store_* and get/set_working."""
 
-    def __init__(self) -> None:
-        self.semantic = SemanticMemory()
-        self.episodic = EpisodicMemory()
-        self.working = WorkingMemory()
+    def __init__(
+        self,
+        semantic: Optional[SemanticMemory] = None,
+        episodic: Optional[EpisodicMemory] = None,
+        working: Optional[WorkingMemory] = None,
+    ) -> None:
+        self.semantic = semantic if semantic is not None else SemanticMemory()
+        self.episodic = episodic if episodic is not None else EpisodicMemory()
+        self.working = working if working is not None else WorkingMemory()
 
     def recall(
         self,
         query: Optional[str] = None,
         kind: Optional[Kind] = None,
         limit: int = 50,
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        result: Dict[str, List[Dict[str, Any]]] = {
+    ) -> Dict[str, Any]:
+        """Recall semantic/episodic/working; episodic recall also carries episodic_stats (per-action counters)."""
+        result: Dict[str, Any] = {
             "semantic": [],
             "episodic": [],
             "working": [],
@@ -35,6 +41,7 @@ class ConcreteStore(StoreBase):
             result["semantic"] = self.semantic.query(query, limit=limit)
         if kind is None or kind == "episodic":
             result["episodic"] = self.episodic.recent(limit=limit)
+            result["episodic_stats"] = self.episodic.action_stats()
         if kind is None or kind == "working":
             w = self.working.as_dict()
             result["working"] = [{"key": k, "value": v} for k, v in w.items() if k != "recent_turns"] + [
@@ -43,6 +50,7 @@ class ConcreteStore(StoreBase):
         return result
 
     def store_semantic(self, entries: List[Dict[str, Any]]) -> None:
+        """Add facts; near-duplicates merge into the existing entry (count, updated_at)."""
         for e in entries:
             self.semantic.add(
                 e.get("fact", ""),
@@ -58,6 +66,18 @@ class ConcreteStore(StoreBase):
                 id=e.get("id"),
             )
 
+    def stats(self) -> Dict[str, Any]:
+        """Footprint per memory (counts, approximate bytes, index sizes) plus total_bytes."""
+        semantic = self.semantic.stats()
+        episodic = self.episodic.stats()
+        working = self.working.stats()
+        return {
+            "semantic": semantic,
+            "episodic": episodic,
+            "working": working,
+            "total_bytes": semantic["bytes"] + semantic["index_bytes"] + episodic["bytes"] + episodic["index_bytes"] + working["bytes"],
+        }
+
     def get_working(self, key: str) -> Any:
         return self.working.get(key)
 
@@ -1,30 +1,423 @@
 """
 Episodic memory: past interactions and events with timestamps and context.
+Secondary indexes on context.action, context.success and time; per-action counters
+are maintained on append so stats are O(1) and filtered queries avoid full scans.
+Time-segmented (per day or hour): with a retention window (a number of segments, or a max age
+measured from now), older segments are compacted into one summary episode each and their raw episodes archived to gzip JSONL files that
+are only read back when a query asks for them.
 """
 
-from typing import Any, Dict, List, Optional
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+
+TimeBound = Union[str, datetime, None]
+Segment = Literal["day", "hour"]
+
+# ISO8601 prefix length per segment: 2026-01-31 / 2026-01-31T14
+_SEGMENT_LEN = {"day": 10, "hour": 13}
+MAX_SUMMARY_FAILURES = 5
+
+# Posting list: positions into _entries plus their timestamps (parallel, for bisect).
+_Posting = Tuple[List[int], List[str]]
+
+
+def _iso(t: TimeBound) -> Optional[str]:
+    """Normalize a time bound to the stored ISO8601 'Z' form (string compare == time compare).
+    Always microsecond precision: '...:00Z' would sort after '...:00.500000Z'."""
+    if t is None or isinstance(t, str):
+        return t
+    if t.tzinfo is not None:
+        t = t.astimezone(timezone.utc).replace(tzinfo=None)
+    return t.isoformat(timespec="microseconds") + "Z"
+
+
+def _bucket(timestamp: str) -> str:
+    """Hour bucket key, e.g. 2026-01-31T14."""
+    return timestamp[:13]
+
+
+def is_summary(entry: Dict[str, Any]) -> bool:
+    return bool((entry.get("context") or {}).get("summary"))
+
+
+def summarize_segment(
+    segment: str, entries: List[Dict[str, Any]], previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    One summary episode for a segment: episode count, counts/successes per action, notable failures.
+    previous (the segment's existing summary, for late episodes) is folded in, keeping its id.
+    """
+    prev = (previous or {}).get("context") or {}
+    counts: Dict[str, int] = dict(prev.get("counts") or {})
+    successes: Dict[str, int] = dict(prev.get("successes") or {})
+    failures: List[Dict[str, Any]] = list(prev.get("failures") or [])
+    for e in entries:
+        ctx = e.get("context") or {}
+        action = ctx.get("action")
+        if action is None:
+            continue
+        counts[action] = counts.get(action, 0) + 1
+        if ctx.get("success") is True:
+            successes[action] = successes.get(action, 0) + 1
+        elif len(failures) < MAX_SUMMARY_FAILURES:
+            failures.append({"action": action, "input_preview": ctx.get("input_preview", ""), "timestamp": e.get("timestamp")})
+    stamps = [e["timestamp"] for e in entries[:1]] + ([previous["timestamp"]] if previous else [])
+    return {
+        "id": (previous or {}).get("id") or "sum-%s" % segment,
+        "event": "summary",
+        "context": {
+            "summary": True,
+            "segment": segment,
+            "episodes": prev.get("episodes", 0) + len(entries),
+            "counts": counts,
+            "successes": successes,
+            "failures": failures,
+        },
+        "timestamp": min(stamps) if stamps else segment,
+    }
 
 
 class EpisodicMemory:
     """Append-only episodic log. Schema: id, event, context, timestamp."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        segment: Segment = "day",
+        retention_segments: Optional[int] = None,
+        archive_dir: Optional[str] = None,
+        max_age: Optional[timedelta] = None,
+    ) -> None:
+        if segment not in _SEGMENT_LEN:
+            raise ValueError("segment must be 'day' or 'hour'")
+        self.segment = segment
+        # Keep at most retention_segments raw segments (the newest ones holding data) ...
+        self.retention_segments = retention_segments
+        # ... and/or only segments at or after the one containing now - max_age.
+        self.max_age = max_age
+        self.archive_dir = archive_dir
         self._entries: List[Dict[str, Any]] = []
+        # Raw (non-summary) episode counts per segment still held in memory.
+        self._segments: Dict[str, int] = {}
+        self._timestamps: List[str] = []
+        self._index: Dict[Tuple[str, Any], _Posting] = {}
+        self._action_counts: Dict[str, int] = {}
+        self._action_success: Dict[str, int] = {}
+        self._hourly: Dict[str, int] = {}
+        # False once an entry arrives out of time order; time ranges then fall back to scans.
+        self._ordered = True
 
-    def append(self, event: str, context: Optional[Dict[str, Any]] = None, id: Optional[str] = None) -> str:
+    def append(
+        self,
+        event: str,
+        context: Optional[Dict[str, Any]] = None,
+        id: Optional[str] = None,
+        timestamp: Optional[str] = None,
+    ) -> str:
         import uuid
-        from datetime import datetime
         uid = id or str(uuid.uuid4())[:8]
-        self._entries.append({
+        ts = timestamp or _iso(datetime.utcnow())
+        entry = {
             "id": uid,
             "event": event,
             "context": context or {},
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        })
+            "timestamp": ts,
+        }
+        self._index_entry(len(self._entries), entry)
+        self._entries.append(entry)
+        if not is_summary(entry):
+            seg = self.segment_of(ts)
+            is_new = seg not in self._segments
+            self._segments[seg] = self._segments.get(seg, 0) + 1
+            if is_new and self._over_retention():
+                self.compact()
         return uid
 
+    def segment_of(self, timestamp: str) -> str:
+        return timestamp[:_SEGMENT_LEN[self.segment]]
+
+    def cutoff_segment(self) -> Optional[str]:
+        """Oldest segment max_age keeps (the one containing now - max_age), or None without max_age."""
+        if self.max_age is None:
+            return None
+        return self.segment_of(_iso(datetime.utcnow() - self.max_age) or "")
+
+    def _over_retention(self) -> bool:
+        """Checked when a new segment starts: too many segments, or one older than the cutoff."""
+        if self.retention_segments is not None and len(self._segments) > self.retention_segments:
+            return True
+        cutoff = self.cutoff_segment()
+        return cutoff is not None and min(self._segments) < cutoff
+
+    def _index_entry(self, pos: int, entry: Dict[str, Any]) -> None:
+        ts = entry["timestamp"]
+        if self._timestamps and ts < self._timestamps[-1]:
+            self._ordered = False
+        self._timestamps.append(ts)
+        ctx = entry.get("context") or {}
+        if ctx.get("summary"):
+            # Summaries carry their segment's totals so lifetime stats survive compaction.
+            self._hourly[_bucket(ts)] = self._hourly.get(_bucket(ts), 0) + ctx.get("episodes", 0)
+            for action, n in (ctx.get("counts") or {}).items():
+                self._action_counts[action] = self._action_counts.get(action, 0) + n
+            for action, n in (ctx.get("successes") or {}).items():
+                self._action_success[action] = self._action_success.get(action, 0) + n
+            return
+        self._hourly[_bucket(ts)] = self._hourly.get(_bucket(ts), 0) + 1
+        keys = []
+        action = ctx.get("action")
+        if action is not None:
+            keys.append(("action", action))
+            self._action_counts[action] = self._action_counts.get(action, 0) + 1
+            if ctx.get("success") is True:
+                self._action_success[action] = self._action_success.get(action, 0) + 1
+        if "success" in ctx:
+            keys.append(("success", ctx.get("success")))
+        for key in keys:
+            try:
+                positions, stamps = self._index.setdefault(key, ([], []))
+            except TypeError:
+                continue  # unhashable context value: not indexed
+            positions.append(pos)
+            stamps.append(ts)
+
+    def _reindex(self) -> None:
+        self._timestamps = []
+        self._index = {}
+        self._action_counts = {}
+        self._action_success = {}
+        self._hourly = {}
+        self._ordered = True
+        for pos, entry in enumerate(self._entries):
+            self._index_entry(pos, entry)
+
+    def compact(self, keep_segments: Optional[int] = None, before: TimeBound = None) -> List[str]:
+        """
+        Replace raw segments with summary episodes: all but the newest keep_segments (default:
+        retention_segments) and those older than before's segment (default: now - max_age).
+        Archives their raw episodes when archive_dir is set. Returns compacted segments.
+        """
+        keep = self.retention_segments if keep_segments is None else keep_segments
+        cutoff = self.cutoff_segment() if before is None else self.segment_of(_iso(before) or "")
+        segments = sorted(self._segments)
+        old = set(segments[:max(0, len(segments) - keep)]) if keep is not None else set()
+        if cutoff is not None:
+            old.update(seg for seg in segments if seg < cutoff)
+        if not old:
+            return []
+        # Summaries by segment, so late episodes of an already compacted segment fold into its summary.
+        summaries: Dict[str, Dict[str, Any]] = {}
+        kept: List[Dict[str, Any]] = []
+        raw: Dict[str, List[Dict[str, Any]]] = {}
+        for e in self._entries:
+            seg = None if is_summary(e) else self.segment_of(e["timestamp"])
+            if seg in old:
+                raw.setdefault(seg, []).append(e)
+            elif seg is None:
+                summaries[e["context"].get("segment") or e["id"]] = e
+            else:
+                kept.append(e)
+        for seg in sorted(raw):
+            if self.archive_dir:
+                self._archive(seg, raw[seg])
+            summaries[seg] = summarize_segment(seg, raw[seg], summaries.get(seg))
+            del self._segments[seg]
+        self._entries = [summaries[seg] for seg in sorted(summaries)] + kept
+        self._reindex()
+        return sorted(raw)
+
+    def _archive_path(self, segment: str) -> str:
+        return os.path.join(self.archive_dir or ".", "episodic-%s.jsonl.gz" % segment)
+
+    def _archive(self, segment: str, entries: List[Dict[str, Any]]) -> None:
+        import gzip
+        import json
+        os.makedirs(self.archive_dir or ".", exist_ok=True)
+        # Append mode: a late compaction of the same segment adds a gzip member.
+        with gzip.open(self._archive_path(segment), "at", encoding="utf-8") as f:
+            for e in entries:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+
+    def archived_segments(self) -> List[str]:
+        """Segments with raw episodes on disk (from archive_dir file names; nothing is loaded)."""
+        if not self.archive_dir or not os.path.isdir(self.archive_dir):
+            return []
+        names = [n for n in os.listdir(self.archive_dir) if n.startswith("episodic-") and n.endswith(".jsonl.gz")]
+        return sorted(n[len("episodic-"):-len(".jsonl.gz")] for n in names)
+
+    def load_segment(self, segment: str) -> List[Dict[str, Any]]:
+        """Read one archived segment's raw episodes (not added to memory)."""
+        import gzip
+        import json
+        path = self._archive_path(segment)
+        if not self.archive_dir or not os.path.isfile(path):
+            return []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
     def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
         return self._entries[-limit:]
 
     def all(self) -> List[Dict[str, Any]]:
         return list(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry/summary counts, approximate bytes of entries and indexes, segment and archive counts."""
+        from agi.memory.footprint import deep_sizeof, total_sizeof
+        seen: set = set()
+        entry_bytes = total_sizeof(self._entries, seen)
+        index_bytes = sum(
+            deep_sizeof(d, seen)
+            for d in (self._entries, self._timestamps, self._index, self._action_counts, self._action_success, self._hourly, self._segments)
+        )
+        return {
+            "entries": len(self._entries),
+            "summaries": sum(1 for e in self._entries if is_summary(e)),
+            "bytes": entry_bytes,
+            "index_bytes": index_bytes,
+            "index_keys": len(self._index),
+            "index_postings": sum(len(p[0]) for p in self._index.values()),
+            "segments": len(self._segments),
+            "archived_segments": len(self.archived_segments()),
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """Plain-data snapshot (settings and entries; indexes are rebuilt) for from_state()."""
+        return {
+            "segment": self.segment,
+            "retention_segments": self.retention_segments,
+            "archive_dir": self.archive_dir,
+            "max_age_s": self.max_age.total_seconds() if self.max_age is not None else None,
+            "entries": list(self._entries),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "EpisodicMemory":
+        """Rebuild from state(): entries are restored as-is (no compaction) and reindexed."""
+        max_age = state.get("max_age_s")
+        m = cls(state.get("segment", "day"), state.get("retention_segments"), state.get("archive_dir"),
+                timedelta(seconds=max_age) if max_age is not None else None)
+        m._entries = list(state.get("entries") or [])
+        for e in m._entries:
+            if not is_summary(e):
+                seg = m.segment_of(e["timestamp"])
+                m._segments[seg] = m._segments.get(seg, 0) + 1
+        m._reindex()
+        return m
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _range(self, stamps: List[str], since: Optional[str], until: Optional[str]) -> Tuple[int, int]:
+        lo = bisect_left(stamps, since) if since is not None else 0
+        hi = bisect_right(stamps, until) if until is not None else len(stamps)
+        return lo, hi
+
+    def _candidates(self, action: Any, success: Any, since: Optional[str], until: Optional[str]) -> List[int]:
+        """Positions matching the most selective index, clipped to the time range when ordered."""
+        postings = []
+        if action is not None:
+            postings.append(self._index.get(("action", action), ([], [])))
+        if success is not None:
+            postings.append(self._index.get(("success", success), ([], [])))
+        if postings:
+            positions, stamps = min(postings, key=lambda p: len(p[0]))
+        else:
+            positions, stamps = range(len(self._entries)), self._timestamps
+        if not self._ordered:
+            return list(positions)
+        lo, hi = self._range(stamps, since, until)
+        return list(positions[lo:hi])
+
+    def query(
+        self,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        limit: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Episodes matching all given filters (time bounds inclusive), oldest first; limit keeps the most recent.
+        include_archived also reads archived raw segments overlapping [since, until].
+        """
+        since_s, until_s = _iso(since), _iso(until)
+        out: List[Dict[str, Any]] = []
+        for pos in reversed(self._candidates(action, success, since_s, until_s)):
+            e = self._entries[pos]
+            ctx = e.get("context") or {}
+            if action is not None and ctx.get("action") != action:
+                continue
+            if success is not None and ctx.get("success") != success:
+                continue
+            if not self._ordered:
+                ts = e["timestamp"]
+                if (since_s is not None and ts < since_s) or (until_s is not None and ts > until_s):
+                    continue
+            out.append(e)
+            if limit is not None and len(out) >= limit:
+                break
+        out.reverse()
+        if include_archived and (limit is None or len(out) < limit):
+            out = self._query_archived(action, success, since_s, until_s, None if limit is None else limit - len(out)) + out
+        return out
+
+    def _query_archived(
+        self, action: Any, success: Any, since: Optional[str], until: Optional[str], limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for seg in reversed(self.archived_segments()):
+            if until is not None and seg > until[:len(seg)]:
+                continue
+            if since is not None and seg < since[:len(seg)]:
+                break
+            matched = []
+            for e in self.load_segment(seg):
+                ctx = e.get("context") or {}
+                ts = e.get("timestamp", "")
+                if action is not None and ctx.get("action") != action:
+                    continue
+                if success is not None and ctx.get("success") != success:
+                    continue
+                if (since is not None and ts < since) or (until is not None and ts > until):
+                    continue
+                matched.append(e)
+            out = matched + out
+            if limit is not None and len(out) >= limit:
+                return out[-limit:]
+        return out
+
+    def count(
+        self,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+    ) -> int:
+        """Number of matching episodes. O(log n) for a single filter plus time range."""
+        if (action is not None and success is not None) or not self._ordered:
+            return len(self.query(action=action, success=success, since=since, until=until))
+        if action is not None:
+            stamps = self._index.get(("action", action), ([], []))[1]
+        elif success is not None:
+            stamps = self._index.get(("success", success), ([], []))[1]
+        else:
+            stamps = self._timestamps
+        lo, hi = self._range(stamps, _iso(since), _iso(until))
+        return max(0, hi - lo)
+
+    def action_stats(self, action: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-action totals: count, successes, success_rate (maintained incrementally)."""
+        names = [action] if action is not None else list(self._action_counts)
+        stats: Dict[str, Dict[str, Any]] = {}
+        for name in names:
+            n = self._action_counts.get(name, 0)
+            ok = self._action_success.get(name, 0)
+            stats[name] = {"count": n, "successes": ok, "success_rate": (ok / n) if n else 0.0}
+        return stats
+
+    def hourly_counts(self) -> Dict[str, int]:
+        """Episode counts per hour bucket (YYYY-MM-DDTHH)."""
+        return dict(self._hourly)
@@ -0,0 +1,49 @@
+"""
+Memory footprint helpers: approximate deep object sizes (sys.getsizeof over containers, shared
+objects counted once) and a tracemalloc top-N allocation report. Used by the memories' stats().
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_getsizeof = sys.getsizeof
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate bytes held by obj and everything reachable through dicts, lists, tuples and sets."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += _getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+def total_sizeof(objs: Iterable[Any], seen: Optional[Set[int]] = None) -> int:
+    seen = set() if seen is None else seen
+    return sum(deep_sizeof(o, seen) for o in objs)
+
+
+def tracemalloc_top(limit: int = 10, key_type: str = "lineno") -> List[Dict[str, Any]]:
+    """Top allocation sites from the running tracemalloc trace (empty if tracing is off)."""
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib.*"),
+    ])
+    out = []
+    for stat in snapshot.statistics(key_type)[:limit]:
+        frame = stat.traceback[0]
+        out.append({"site": "%s:%d" % (frame.filename, frame.lineno), "bytes": stat.size, "blocks": stat.count})
+    return out
@@ -1,17 +1,99 @@
 """
 Memory persistence: save/load semantic and episodic memory to JSON.
-Working memory is not persisted (session-only).
+Working memory is not persisted (session-only). Episode timestamps are preserved on load;
+an EpisodicMemory with a retention window compacts old segments as they are replayed.
+
+Format is chosen by file extension:
+- .json: one JSON document {"semantic": [...], "episodic": [...]} (default).
+- .jsonl / .ndjson: newline-delimited records, streamed on save and load.
+- .jsonl.gz / .gz, .jsonl.xz / .xz / .lzma: the same records, gzip- or lzma-compressed.
+Record lines: a header {"format": "agi-memory", "version": 1}, then {"kind": "semantic"|"episodic", "entry": {...}}.
 """
 
+import io
 import json
 import os
-from typing import Any, Dict, Optional
+from typing import IO, Any, Dict, Iterator, Optional
 
 from agi.memory.concrete_store import ConcreteStore
 
+FORMAT_NAME = "agi-memory"
+FORMAT_VERSION = 1
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Extension -> stdlib compression module (imported only when such a file is opened).
+_COMPRESSED = {".gz": "gzip", ".xz": "lzma", ".lzma": "lzma"}
+_STREAMED = (".jsonl", ".ndjson")
+
+
+def is_streamed(path: str) -> bool:
+    """True if path uses the record-per-line format (plain or compressed)."""
+    ext = os.path.splitext(path)[1].lower()
+    return ext in _COMPRESSED or ext in _STREAMED
+
+
+def _open_records(path: str, mode: str, like: Optional[str] = None) -> IO[str]:
+    """Open a record file for text read ('r') or write ('w'), compressing by the extension of like (default path)."""
+    module_name = _COMPRESSED.get(os.path.splitext(like or path)[1].lower())
+    if module_name is not None:
+        import importlib
+        raw = importlib.import_module(module_name).open(path, mode + "b")
+        if mode == "w":
+            raw = io.BufferedWriter(raw, buffer_size=WRITE_BUFFER_BYTES)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8", buffering=WRITE_BUFFER_BYTES if mode == "w" else -1)
+
+
+def _add_semantic(store: ConcreteStore, e: Dict[str, Any]) -> None:
+    store.semantic.add(
+        e.get("fact", ""),
+        relations=e.get("relations"),
+        id=e.get("id"),
+        count=e.get("count", 1),
+        updated_at=e.get("updated_at"),
+    )
+
+
+def _add_episodic(store: ConcreteStore, e: Dict[str, Any]) -> None:
+    store.episodic.append(
+        e.get("event", ""),
+        context=e.get("context"),
+        id=e.get("id"),
+        timestamp=e.get("timestamp"),
+    )
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream {"kind", "entry"} records from a record file, one line at a time."""
+    with _open_records(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            if rec.get("format") == FORMAT_NAME:
+                if rec.get("version", FORMAT_VERSION) > FORMAT_VERSION:
+                    raise ValueError("unsupported memory file version: %s" % rec.get("version"))
+                continue
+            yield rec
+
+
+def _save_records(store: ConcreteStore, path: str) -> None:
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    tmp = path + ".tmp"
+    with _open_records(tmp, "w", like=path) as f:
+        f.write(encode({"format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n")
+        for e in store.semantic.all():
+            f.write(encode({"kind": "semantic", "entry": e}) + "\n")
+        for e in store.episodic.all():
+            f.write(encode({"kind": "episodic", "entry": e}) + "\n")
+    os.replace(tmp, path)
+
 
 def save_store(store: ConcreteStore, path: str) -> None:
-    """Write semantic and episodic entries to a JSON file."""
+    """Write semantic and episodic entries to path (JSON, or streamed records by extension)."""
+    if is_streamed(path):
+        _save_records(store, path)
+        return
     data: Dict[str, Any] = {
         "semantic": store.semantic.all(),
         "episodic": store.episodic.all(),
@@ -20,23 +102,24 @@ def save_store(store: ConcreteStore, path: str) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def load_store(path: str) -> Optional[ConcreteStore]:
-    """Load semantic and episodic from JSON; return a new ConcreteStore. Working memory empty."""
+def load_store(path: str, store: Optional[ConcreteStore] = None) -> Optional[ConcreteStore]:
+    """Load semantic and episodic from path into store (default: a new ConcreteStore). Working memory empty."""
     if not os.path.isfile(path):
         return None
+    store = store if store is not None else ConcreteStore()
+    if is_streamed(path):
+        # Insert as each line is parsed: peak memory is the store plus one record.
+        for rec in iter_records(path):
+            kind = rec.get("kind")
+            if kind == "semantic":
+                _add_semantic(store, rec.get("entry") or {})
+            elif kind == "episodic":
+                _add_episodic(store, rec.get("entry") or {})
+        return store
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
-    store = ConcreteStore()
     for e in data.get("semantic", []):
-        store.semantic.add(
-            e.get("fact", ""),
-            relations=e.get("relations"),
-            id=e.get("id"),
-        )
+        _add_semantic(store, e)
     for e in data.get("episodic", []):
-        store.episodic.append(
-            e.get("event", ""),
-            context=e.get("context"),
-            id=e.get("id"),
-        )
+        _add_episodic(store, e)
     return store
@@ -1,34 +1,214 @@
 """
 Semantic memory: facts, relations, concepts. Queryable, updatable.
+Duplicate facts (same text up to case, whitespace and trailing punctuation) are merged
+(count + updated_at bumped); reflection facts also fold numbers, so "received 3 entries" and
+"received 5 entries" merge. Size is bounded with LRU (by last recall) or LFU eviction and
+optional per-relation quotas.
 """
 
-from typing import Any, Dict, List, Optional
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+MAX_SEMANTIC_ENTRIES = 10000
+
+Eviction = Literal["lru", "lfu"]
+
+
+def _now() -> str:
+    from datetime import datetime
+    return datetime.utcnow().isoformat(timespec="microseconds") + "Z"
+
+
+def normalize_fact(fact: str, fold_numbers: bool = False) -> str:
+    """Lowercase, collapse whitespace, drop trailing punctuation; fold_numbers maps digit runs to '#'."""
+    s = (fact or "").lower()
+    if fold_numbers:
+        s = re.sub(r"\d+", "#", s)
+    s = re.sub(r"\s+", " ", s)
+    return s.strip().rstrip(".!?;:, ")
+
+
+def fact_key(fact: str, relations: Optional[Iterable[str]] = None) -> str:
+    """Stable hash of the normalized fact (dedup key); numbers fold only for reflection facts."""
+    import hashlib
+    text = normalize_fact(fact, fold_numbers="reflection" in (relations or ()))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
 
 
 class SemanticMemory:
-    """In-memory semantic store. Schema: id, fact, relations, updated_at."""
+    """In-memory semantic store. Schema: id, fact, relations, updated_at, count."""
 
-    def __init__(self) -> None:
-        self._entries: List[Dict[str, Any]] = []
+    def __init__(
+        self,
+        max_entries: Optional[int] = MAX_SEMANTIC_ENTRIES,
+        eviction: Eviction = "lru",
+        relation_quotas: Optional[Dict[str, int]] = None,
+    ) -> None:
+        if eviction not in ("lru", "lfu"):
+            raise ValueError("eviction must be 'lru' or 'lfu'")
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.relation_quotas: Dict[str, int] = dict(relation_quotas or {})
+        # Insertion-ordered entries by id; recency order kept separately for LRU.
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._recency: "OrderedDict[str, None]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self._key_of: Dict[str, str] = {}
+        self._by_relation: Dict[str, Dict[str, None]] = {}
+        self.evicted = 0
+        self.merged = 0
 
-    def add(self, fact: str, relations: Optional[List[str]] = None, id: Optional[str] = None) -> str:
+    def add(
+        self,
+        fact: str,
+        relations: Optional[List[str]] = None,
+        id: Optional[str] = None,
+        count: int = 1,
+        updated_at: Optional[str] = None,
+    ) -> str:
+        """Add a fact or merge it into an existing duplicate (see fact_key). Returns the entry id."""
         import uuid
-        from datetime import datetime
+        key = fact_key(fact, relations)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            e = self._entries[existing]
+            e["fact"] = fact
+            e["count"] = e.get("count", 1) + count
+            e["updated_at"] = updated_at or _now()
+            for r in relations or []:
+                if r not in e["relations"]:
+                    e["relations"].append(r)
+                    self._by_relation.setdefault(r, {})[existing] = None
+            self._recency.move_to_end(existing)
+            self.merged += 1
+            # Relations gained on merge count against their quotas too.
+            self._enforce_bounds(existing)
+            return existing
         uid = id or str(uuid.uuid4())[:8]
-        self._entries.append({
+        if uid in self._entries:
+            self.remove(uid)
+        self._entries[uid] = {
             "id": uid,
             "fact": fact,
-            "relations": relations or [],
-            "updated_at": datetime.utcnow().isoformat() + "Z",
-        })
+            "relations": list(relations or []),
+            "updated_at": updated_at or _now(),
+            "count": count,
+        }
+        self._recency[uid] = None
+        self._by_key[key] = uid
+        self._key_of[uid] = key
+        for r in self._entries[uid]["relations"]:
+            self._by_relation.setdefault(r, {})[uid] = None
+        self._enforce_bounds(uid)
         return uid
 
+    def remove(self, id: str) -> bool:
+        """Drop one entry by id. Returns False if it was not present."""
+        e = self._entries.pop(id, None)
+        if e is None:
+            return False
+        self._recency.pop(id, None)
+        key = self._key_of.pop(id, None)
+        if key is not None and self._by_key.get(key) == id:
+            del self._by_key[key]
+        for r in e.get("relations", []):
+            ids = self._by_relation.get(r)
+            if ids is not None:
+                ids.pop(id, None)
+                if not ids:
+                    del self._by_relation[r]
+        return True
+
+    def _victim(self, candidates: Any, protect: str) -> Optional[str]:
+        """Pick the entry to evict among candidate ids (never the one just added)."""
+        best: Optional[str] = None
+        best_count = 0
+        # Walk least-recently-recalled first: LRU takes the first hit, LFU the lowest
+        # count (ties resolved toward least recent).
+        for uid in self._recency:
+            if uid == protect or uid not in candidates:
+                continue
+            if self.eviction == "lru":
+                return uid
+            count = self._entries[uid].get("count", 1)
+            if best is None or count < best_count:
+                best, best_count = uid, count
+        return best
+
+    def _enforce_bounds(self, added: str) -> None:
+        for r in list(self._entries.get(added, {}).get("relations", [])):
+            quota = self.relation_quotas.get(r)
+            while quota is not None and len(self._by_relation.get(r, {})) > quota:
+                victim = self._victim(self._by_relation[r], added)
+                if victim is None:
+                    break
+                self.remove(victim)
+                self.evicted += 1
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            victim = self._victim(self._entries, added)
+            if victim is None:
+                break
+            self.remove(victim)
+            self.evicted += 1
+
     def query(self, query: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
-        """Return matching facts. Simple substring match on fact if query given."""
-        if not query:
-            return self._entries[-limit:]
-        q = query.lower()
-        return [e for e in self._entries if q in e.get("fact", "").lower()][-limit:]
+        """Return matching facts. Simple substring match on fact if query given. Marks results as recalled."""
+        entries = list(self._entries.values())
+        if query:
+            q = query.lower()
+            entries = [e for e in entries if q in e.get("fact", "").lower()]
+        results = entries[-limit:]
+        for e in results:
+            self._recency.move_to_end(e["id"])
+        return results
+
+    def by_relation(self, relation: str) -> List[Dict[str, Any]]:
+        """Entries tagged with the given relation (insertion order)."""
+        return [self._entries[uid] for uid in self._by_relation.get(relation, {})]
 
     def all(self) -> List[Dict[str, Any]]:
-        return list(self._entries)
+        return list(self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, approximate bytes of entries and indexes, eviction/merge counters."""
+        from agi.memory.footprint import deep_sizeof, total_sizeof
+        seen: set = set()
+        entry_bytes = total_sizeof(self._entries.values(), seen)
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": entry_bytes,
+            "index_bytes": sum(deep_sizeof(d, seen) for d in (self._entries, self._recency, self._by_key, self._key_of, self._by_relation)),
+            "relations": len(self._by_relation),
+            "evicted": self.evicted,
+            "merged": self.merged,
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """Plain-data snapshot (settings, entries in insertion order, recency order) for from_state()."""
+        return {
+            "max_entries": self.max_entries,
+            "eviction": self.eviction,
+            "relation_quotas": dict(self.relation_quotas),
+            "entries": list(self._entries.values()),
+            "recency": list(self._recency),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SemanticMemory":
+        """Rebuild from state(): entries are restored as-is (no merging or eviction)."""
+        m = cls(state.get("max_entries"), state.get("eviction", "lru"), state.get("relation_quotas"))
+        for e in state.get("entries") or []:
+            uid = e["id"]
+            key = fact_key(e.get("fact", ""), e.get("relations"))
+            m._entries[uid] = e
+            m._by_key[key] = uid
+            m._key_of[uid] = key
+            for r in e.get("relations") or []:
+                m._by_relation.setdefault(r, {})[uid] = None
+        m._recency = OrderedDict((uid, None) for uid in state.get("recency") or m._entries if uid in m._entries)
+        return m
+
+    def __len__(self) -> int:
+        return len(self._entries)
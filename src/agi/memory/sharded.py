@@ -0,0 +1,285 @@
+"""
+Sharded semantic memory: facts are partitioned across N local worker processes by consistent
+hashing, each shard holding its own SemanticMemory. Recall scatters the query to every shard
+in parallel and merges the per-shard results into a global top-k (most recently updated).
+ShardedStore is a ConcreteStore whose semantic memory is sharded; episodic and working memory
+stay in-process, so Agent, persistence and stats work unchanged.
+
+Facts are placed by their dedup key (fact_key: hash of the normalized fact), which is the
+fact's stable identity here: random entry ids would scatter near-duplicates across shards and
+defeat merging. resize(n) rebalances: only facts whose owner changes on the ring move.
+"""
+
+import threading
+from bisect import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from agi.memory.concrete_store import ConcreteStore
+from agi.memory.episodic import EpisodicMemory
+from agi.memory.semantic import MAX_SEMANTIC_ENTRIES, Eviction, fact_key
+from agi.memory.working import WorkingMemory
+
+DEFAULT_SHARDS = 4
+VNODES = 64
+
+
+def _point(key: str) -> int:
+    import hashlib
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with VNODES virtual points per shard."""
+
+    def __init__(self, shards: Iterable[int], vnodes: int = VNODES) -> None:
+        points = sorted((_point("%d#%d" % (s, v)), s) for s in shards for v in range(vnodes))
+        self._points = [p for p, _ in points]
+        self._owners = [s for _, s in points]
+
+    def owner(self, key: str) -> int:
+        i = bisect(self._points, _point(key))
+        return self._owners[i % len(self._owners)]
+
+
+def _serve(conn: Any, max_entries: Optional[int], eviction: str) -> None:
+    """Shard worker loop: (op, args) requests in, results out, until "stop"."""
+    from agi.memory.semantic import SemanticMemory
+    memory = SemanticMemory(max_entries=max_entries, eviction=eviction)
+    while True:
+        try:
+            op, args = conn.recv()
+        except EOFError:
+            return
+        if op == "stop":
+            conn.send(None)
+            return
+        try:
+            if op == "add":
+                result: Any = [memory.add(e.get("fact", ""), relations=e.get("relations"), id=e.get("id"),
+                                          count=e.get("count", 1), updated_at=e.get("updated_at")) for e in args]
+            elif op == "query":
+                result = memory.query(args[0], limit=args[1])
+            elif op == "all":
+                result = memory.all()
+            elif op == "by_relation":
+                result = memory.by_relation(args)
+            elif op == "remove":
+                result = [memory.remove(i) for i in args]
+            elif op == "bound":
+                memory.max_entries = args
+                result = None
+            elif op == "len":
+                result = len(memory)
+            elif op == "stats":
+                result = memory.stats()
+            else:
+                raise ValueError("unknown shard op: %s" % op)
+            conn.send((True, result))
+        except Exception as e:
+            conn.send((False, repr(e)))
+
+
+class _Shard:
+    def __init__(self, ctx: Any, max_entries: Optional[int], eviction: str) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child, max_entries, eviction), daemon=True, name="agi-shard")
+        self.process.start()
+        child.close()
+
+    def send(self, op: str, args: Any = None) -> None:
+        self.conn.send((op, args))
+
+    def recv(self) -> Any:
+        ok, result = self.conn.recv()
+        if not ok:
+            raise RuntimeError("shard error: %s" % result)
+        return result
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(("stop", None))
+            self.conn.recv()
+        except (EOFError, OSError):
+            pass
+        self.process.join(5)
+        self.conn.close()
+
+
+class ShardedSemanticMemory:
+    """SemanticMemory interface over worker-process shards (add/query/all/remove/by_relation/stats)."""
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        max_entries: Optional[int] = MAX_SEMANTIC_ENTRIES,
+        eviction: Eviction = "lru",
+        start_method: Optional[str] = None,
+    ) -> None:
+        import multiprocessing
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self._ctx = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._shards: Dict[int, _Shard] = {}
+        self._ring = HashRing(())
+        self.moved = 0
+        self._start(shards)
+
+    def _per_shard_max(self, n: int) -> Optional[int]:
+        return None if self.max_entries is None else -(-self.max_entries // n)
+
+    def _start(self, n: int) -> None:
+        for i in range(n):
+            if i not in self._shards:
+                self._shards[i] = _Shard(self._ctx, self._per_shard_max(n), self.eviction)
+        self._ring = HashRing(range(n))
+
+    @property
+    def shards(self) -> int:
+        return len(self._shards)
+
+    def _gather(self, op: str, args: Any = None, shards: Optional[Sequence[int]] = None) -> List[Any]:
+        """Send op to each shard first (they work in parallel), then collect replies in order."""
+        ids = list(self._shards) if shards is None else list(shards)
+        for i in ids:
+            self._shards[i].send(op, args)
+        return [self._shards[i].recv() for i in ids]
+
+    def add_many(self, entries: Sequence[Dict[str, Any]]) -> List[str]:
+        """Route entries to their shards (one request per shard); returns ids in input order."""
+        by_shard: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        for pos, e in enumerate(entries):
+            by_shard.setdefault(self._ring.owner(fact_key(e.get("fact", ""), e.get("relations"))), []).append((pos, e))
+        ids: List[str] = [""] * len(entries)
+        with self._lock:
+            for s, items in by_shard.items():
+                self._shards[s].send("add", [e for _, e in items])
+            for s, items in by_shard.items():
+                for (pos, _), uid in zip(items, self._shards[s].recv()):
+                    ids[pos] = uid
+        return ids
+
+    def add(
+        self,
+        fact: str,
+        relations: Optional[List[str]] = None,
+        id: Optional[str] = None,
+        count: int = 1,
+        updated_at: Optional[str] = None,
+    ) -> str:
+        return self.add_many([{"fact": fact, "relations": relations, "id": id, "count": count, "updated_at": updated_at}])[0]
+
+    def query(self, query: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Scatter-gather: each shard's top `limit` matches, merged to the global `limit` most recently updated."""
+        with self._lock:
+            parts = self._gather("query", (query, limit))
+        merged = [e for part in parts for e in part]
+        merged.sort(key=lambda e: e.get("updated_at") or "")
+        return merged[-limit:]
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [e for part in self._gather("all") for e in part]
+
+    def by_relation(self, relation: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [e for part in self._gather("by_relation", relation) for e in part]
+
+    def remove(self, id: str) -> bool:
+        with self._lock:
+            return any(r[0] for r in self._gather("remove", [id]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(self._gather("len"))
+
+    def shard_sizes(self) -> List[int]:
+        with self._lock:
+            return self._gather("len")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            parts = self._gather("stats")
+        out: Dict[str, Any] = {k: sum(p[k] for p in parts) for k in ("entries", "bytes", "index_bytes", "evicted", "merged")}
+        out["max_entries"] = self.max_entries
+        out["relations"] = max((p["relations"] for p in parts), default=0)
+        out["shards"] = [p["entries"] for p in parts]
+        return out
+
+    def resize(self, n: int) -> int:
+        """Change the shard count; move facts whose ring owner changed. Returns the number moved."""
+        if n < 1:
+            raise ValueError("shards must be >= 1")
+        with self._lock:
+            old = list(self._shards)
+            old_max = self._per_shard_max(len(old))
+            self._start(n)
+            new_max = self._per_shard_max(n)
+            # While facts move, use the looser of the old and new per-shard caps, so shards that
+            # absorb facts on a shrink don't evict them; the new cap applies from the next add.
+            self._gather("bound", None if old_max is None or new_max is None else max(old_max, new_max))
+            moves: Dict[int, List[Dict[str, Any]]] = {}
+            leaving: Dict[int, List[str]] = {}
+            for s, entries in zip(old, self._gather("all", shards=old)):
+                for e in entries:
+                    owner = self._ring.owner(fact_key(e.get("fact", ""), e.get("relations")))
+                    if owner != s:
+                        moves.setdefault(owner, []).append(e)
+                        leaving.setdefault(s, []).append(e["id"])
+            for s, ids in leaving.items():
+                self._shards[s].send("remove", ids)
+            for s in leaving:
+                self._shards[s].recv()
+            for s, entries in moves.items():
+                self._shards[s].send("add", entries)
+            for s in moves:
+                self._shards[s].recv()
+            for s in [s for s in self._shards if s >= n]:
+                self._shards.pop(s).stop()
+            self._gather("bound", new_max)
+            moved = sum(len(v) for v in moves.values())
+            self.moved += moved
+            return moved
+
+    def close(self) -> None:
+        with self._lock:
+            for shard in self._shards.values():
+                shard.stop()
+            self._shards = {}
+
+
+class ShardedStore(ConcreteStore):
+    """ConcreteStore with semantic memory sharded across worker processes. Call close() when done."""
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        max_entries: Optional[int] = MAX_SEMANTIC_ENTRIES,
+        eviction: Eviction = "lru",
+        episodic: Optional[EpisodicMemory] = None,
+        working: Optional[WorkingMemory] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            semantic=ShardedSemanticMemory(shards, max_entries=max_entries, eviction=eviction, start_method=start_method),
+            episodic=episodic,
+            working=working,
+        )
+
+    def store_semantic(self, entries: List[Dict[str, Any]]) -> None:
+        """One request per shard instead of one per fact."""
+        self.semantic.add_many([{"fact": e.get("fact", ""), "relations": e.get("relations"), "id": e.get("id")} for e in entries])
+
+    def resize(self, shards: int) -> int:
+        return self.semantic.resize(shards)
+
+    def close(self) -> None:
+        self.semantic.close()
+
+    def __enter__(self) -> "ShardedStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,521 @@
+"""
+Shared read-mostly long-term memory: semantic and episodic entries packed once into a
+multiprocessing.shared_memory segment that any number of worker processes attach to without
+copying or deserializing it. Recall searches a packed lowercase fact-text region in place (re over
+a memoryview) and decodes only the matching records. New writes go to a small per-worker private
+overlay (a ConcreteStore); merge() folds the overlay into a new segment generation. Automatic
+merges (every merge_every overlay entries) run on a background thread: the overlay is frozen and
+stays visible to recall until the new generation is published, while new writes go to a fresh one.
+
+Segments: a control segment NAME holds the current generation; the data segment for generation
+G is named "NAME-G". Data layout (little-endian):
+  header  _HEADER: magic, version, counts, region offsets
+  u64[2n] semantic (record offset, record length); u64[n] end offset of each fact in the text region
+  u64[2m] episodic (record offset, record length)
+  bytes   fact text (lowercased facts joined by "\\n"), JSON records, JSON meta (action stats)
+Segments outlive processes: the publisher (or whoever is last) must call destroy().
+"""
+
+import json
+import re
+import struct
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from agi.memory.concrete_store import ConcreteStore
+from agi.memory.episodic import EpisodicMemory, TimeBound
+from agi.memory.semantic import SemanticMemory
+from agi.memory.store import Kind, Store
+
+MAGIC = b"AGISHM\0\0"
+CONTROL_MAGIC = b"AGISHMC\0"
+SHARED_VERSION = 1
+# Overlay size (semantic + episodic entries) that triggers an automatic merge.
+DEFAULT_MERGE_EVERY = 1000
+# Attach attempts when a concurrent merge unlinks the generation just read from the control segment.
+_ATTACH_RETRIES = 5
+
+_HEADER = struct.Struct("<8sHIIQQQQQQQ")  # magic, version, n_sem, n_epi, sem_table, fact_ends, epi_table, text_off, text_len, meta_off, meta_len
+_CONTROL = struct.Struct("<8sQ")
+_U64 = 8
+
+
+def _attach(name: str) -> Any:
+    """Attach to an existing segment without registering it for unlink at this process's exit."""
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: no track flag; undo the resource tracker registration.
+        shm = shared_memory.SharedMemory(name=name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _create(name: str, size: int) -> Any:
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _unlink(name: str) -> None:
+    """Remove a segment name (mappings already attached elsewhere stay valid)."""
+    shm = _attach(name)
+    try:
+        if getattr(shm, "_track", True):
+            # Python < 3.13 unlink() also unregisters: re-register so the tracker stays balanced.
+            from multiprocessing import resource_tracker
+            resource_tracker.register(shm._name, "shared_memory")
+        shm.unlink()
+    finally:
+        shm.close()
+
+
+def pack(semantic: List[Dict[str, Any]], episodic: List[Dict[str, Any]], meta: Dict[str, Any]) -> bytes:
+    """Serialize entries into the shared layout (see module docstring)."""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    n, m = len(semantic), len(episodic)
+    sem_table = _HEADER.size
+    fact_ends = sem_table + 2 * n * _U64
+    epi_table = fact_ends + n * _U64
+    text_off = epi_table + 2 * m * _U64
+    text = bytearray()
+    ends: List[int] = []
+    for e in semantic:
+        text += (e.get("fact", "") or "").lower().replace("\n", " ").encode("utf-8")
+        ends.append(len(text))
+        text += b"\n"
+    blob = bytearray()
+    rec_base = text_off + len(text)
+    sem_recs: List[int] = []
+    epi_recs: List[int] = []
+    for entries, out in ((semantic, sem_recs), (episodic, epi_recs)):
+        for e in entries:
+            rec = encode(e).encode("utf-8")
+            out += (rec_base + len(blob), len(rec))
+            blob += rec
+    meta_bytes = encode(meta).encode("utf-8")
+    meta_off = rec_base + len(blob)
+    header = _HEADER.pack(MAGIC, SHARED_VERSION, n, m, sem_table, fact_ends, epi_table, text_off, len(text), meta_off, len(meta_bytes))
+    table = struct.pack("<%dQ" % (3 * n + 2 * m), *(sem_recs + ends + epi_recs))
+    return header + table + bytes(text) + bytes(blob) + meta_bytes
+
+
+class SharedSegment:
+    """Read-only view over one attached data segment."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.shm = _attach(name)
+        buf = self.shm.buf
+        (magic, version, self.n_sem, self.n_epi, sem_table, fact_ends, epi_table,
+         text_off, text_len, meta_off, meta_len) = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != SHARED_VERSION:
+            self.shm.close()
+            raise ValueError("not a shared memory store segment (or unsupported version): %s" % name)
+        self._table = buf[sem_table:epi_table + 2 * self.n_epi * _U64].cast("Q")
+        self._fact_ends = self._table[2 * self.n_sem:3 * self.n_sem]
+        self._epi = self._table[3 * self.n_sem:]
+        self._text = buf[text_off:text_off + text_len]
+        self.meta = json.loads(bytes(buf[meta_off:meta_off + meta_len]))
+
+    def _record(self, off: int, length: int) -> Dict[str, Any]:
+        return json.loads(bytes(self.shm.buf[off:off + length]))
+
+    def semantic_at(self, i: int) -> Dict[str, Any]:
+        return self._record(self._table[2 * i], self._table[2 * i + 1])
+
+    def episodic_at(self, i: int) -> Dict[str, Any]:
+        return self._record(self._epi[2 * i], self._epi[2 * i + 1])
+
+    def match_semantic(self, query: Optional[str]) -> List[int]:
+        """Indices of facts containing query (case-insensitive), insertion order; all if no query."""
+        if not query:
+            return list(range(self.n_sem))
+        pattern = re.compile(re.escape(query.lower().encode("utf-8")))
+        out: List[int] = []
+        pos = 0
+        while True:
+            m = pattern.search(self._text, pos)
+            if m is None:
+                return out
+            i = bisect_left(self._fact_ends, m.start())
+            if m.end() <= self._fact_ends[i]:
+                out.append(i)
+            pos = self._fact_ends[i] + 1
+
+    def close(self) -> None:
+        for view in (self._epi, self._fact_ends, self._table, self._text):
+            view.release()
+        self.shm.close()
+
+
+def _merge_action_stats(base: Dict[str, Dict[str, Any]], parts: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Sum per-action count/successes over the segment's stats and each layer's; recompute success_rate."""
+    stats = {a: {"count": s.get("count", 0), "successes": s.get("successes", 0)} for a, s in base.items()}
+    for part in parts:
+        for a, s in part.items():
+            cur = stats.setdefault(a, {"count": 0, "successes": 0})
+            cur["count"] += s.get("count", 0)
+            cur["successes"] += s.get("successes", 0)
+    for s in stats.values():
+        s["success_rate"] = s["successes"] / s["count"] if s["count"] else 0.0
+    return stats
+
+
+class _Layered:
+    """Read view over the shared base entries followed by the private layers' (frozen, then active overlay).
+    Writes (add/append) go to the active overlay; methods without a layered read raise AttributeError."""
+
+    _WRITES = ("add", "append")
+
+    def __init__(self, store: "SharedStore", kind: str) -> None:
+        self._store = store
+        self._kind = kind
+
+    def _parts(self) -> Tuple[SharedSegment, List[Any]]:
+        seg, layers = self._store._layers()
+        return seg, [getattr(layer, self._kind) for layer in layers]
+
+    def _base_len(self, seg: SharedSegment) -> int:
+        return seg.n_sem if self._kind == "semantic" else seg.n_epi
+
+    def _base_at(self, seg: SharedSegment, i: int) -> Dict[str, Any]:
+        return seg.semantic_at(i) if self._kind == "semantic" else seg.episodic_at(i)
+
+    def all(self) -> List[Dict[str, Any]]:
+        seg, mems = self._parts()
+        return [self._base_at(seg, i) for i in range(self._base_len(seg))] + [e for mem in mems for e in mem.all()]
+
+    def __len__(self) -> int:
+        seg, mems = self._parts()
+        return self._base_len(seg) + sum(len(mem) for mem in mems)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._WRITES:
+            return getattr(getattr(self._store.overlay, self._kind), name)
+        # Falling through to the overlay would silently drop the shared base: refuse instead.
+        raise AttributeError("shared %s memory does not support %r" % (self._kind, name))
+
+
+class _LayeredSemantic(_Layered):
+    def __init__(self, store: "SharedStore") -> None:
+        super().__init__(store, "semantic")
+
+    def query(self, query: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        seg, mems = self._parts()
+        base = [seg.semantic_at(i) for i in seg.match_semantic(query)[-limit:]]
+        return (base + [e for mem in mems for e in mem.query(query, limit=limit)])[-limit:]
+
+    def by_relation(self, relation: str) -> List[Dict[str, Any]]:
+        seg, mems = self._parts()
+        base = [seg.semantic_at(i) for i in (seg.meta.get("relations") or {}).get(relation, [])]
+        return base + [e for mem in mems for e in mem.by_relation(relation)]
+
+
+class _LayeredEpisodic(_Layered):
+    def __init__(self, store: "SharedStore") -> None:
+        super().__init__(store, "episodic")
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        seg, mems = self._parts()
+        n = min(limit, seg.n_epi)
+        base = [seg.episodic_at(i) for i in range(seg.n_epi - n, seg.n_epi)]
+        return (base + [e for mem in mems for e in mem.recent(limit)])[-limit:]
+
+    def query(
+        self,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        limit: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> List[Dict[str, Any]]:
+        seg, mems = self._parts()
+        # The segment has no episodic indexes: decode it into a scratch memory and query that.
+        base = EpisodicMemory()
+        for i in range(seg.n_epi):
+            e = seg.episodic_at(i)
+            base.append(e.get("event", ""), context=e.get("context"), id=e.get("id"), timestamp=e.get("timestamp"))
+        out = base.query(action=action, success=success, since=since, until=until, limit=limit)
+        for mem in mems:
+            out += mem.query(action=action, success=success, since=since, until=until, limit=limit,
+                             include_archived=include_archived)
+        return out if limit is None else out[-limit:]
+
+    def count(self, action: Optional[str] = None, success: Optional[bool] = None,
+              since: TimeBound = None, until: TimeBound = None) -> int:
+        return len(self.query(action=action, success=success, since=since, until=until))
+
+    def action_stats(self, action: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        seg, mems = self._parts()
+        stats = _merge_action_stats(seg.meta.get("action_stats") or {}, [mem.action_stats() for mem in mems])
+        if action is not None:
+            return {action: stats.get(action, {"count": 0, "successes": 0, "success_rate": 0.0})}
+        return stats
+
+    def hourly_counts(self) -> Dict[str, int]:
+        seg, mems = self._parts()
+        counts = dict(seg.meta.get("hourly_counts") or {})
+        for mem in mems:
+            for hour, n in mem.hourly_counts().items():
+                counts[hour] = counts.get(hour, 0) + n
+        return counts
+
+
+class SharedStore(Store):
+    """Store over a shared segment plus a private overlay. publish() creates, attach() joins."""
+
+    def __init__(self, name: str, merge_every: Optional[int] = DEFAULT_MERGE_EVERY) -> None:
+        self.name = name
+        self.merge_every = merge_every
+        self._control = _attach(name)
+        self._generation = -1
+        self._seg: Optional[SharedSegment] = None
+        self.overlay = ConcreteStore(semantic=SemanticMemory(max_entries=None))
+        self.semantic = _LayeredSemantic(self)
+        self.episodic = _LayeredEpisodic(self)
+        self.working = self.overlay.working
+        # Overlay being folded in by a background merge; recall still reads it until the new generation is live.
+        self._frozen: Optional[ConcreteStore] = None
+        self._merge_thread: Optional[threading.Thread] = None
+        # Guards the segment/overlay/frozen view against the merge thread.
+        self._mlock = threading.RLock()
+        self.merges = 0
+        self.merge_error: Optional[BaseException] = None
+
+    # --- segments ---
+
+    @staticmethod
+    def _pack_store(store: Any) -> bytes:
+        semantic = store.semantic.all()
+        relations: Dict[str, List[int]] = {}
+        for i, e in enumerate(semantic):
+            for r in e.get("relations") or []:
+                relations.setdefault(r, []).append(i)
+        meta = {
+            "action_stats": store.episodic.action_stats(),
+            "hourly_counts": store.episodic.hourly_counts(),
+            "relations": relations,
+        }
+        return pack(semantic, store.episodic.all(), meta)
+
+    @classmethod
+    def publish(cls, store: Any, name: str, merge_every: Optional[int] = DEFAULT_MERGE_EVERY) -> "SharedStore":
+        """Pack store's semantic + episodic memory into new segments named name; return an attached SharedStore."""
+        data = cls._pack_store(store)
+        seg = _create("%s-0" % name, len(data))
+        seg.buf[:len(data)] = data
+        seg.close()
+        control = _create(name, _CONTROL.size)
+        _CONTROL.pack_into(control.buf, 0, CONTROL_MAGIC, 0)
+        control.close()
+        return cls(name, merge_every=merge_every)
+
+    @classmethod
+    def attach(cls, name: str, merge_every: Optional[int] = DEFAULT_MERGE_EVERY) -> "SharedStore":
+        return cls(name, merge_every=merge_every)
+
+    def generation(self) -> int:
+        magic, gen = _CONTROL.unpack_from(self._control.buf, 0)
+        if magic != CONTROL_MAGIC:
+            raise ValueError("not a shared memory store: %s" % self.name)
+        return gen
+
+    def _segment(self) -> SharedSegment:
+        """Current generation's segment; re-attaches when another process has merged."""
+        for _ in range(_ATTACH_RETRIES):
+            gen = self.generation()
+            if self._seg is not None and gen == self._generation:
+                return self._seg
+            try:
+                seg = SharedSegment("%s-%d" % (self.name, gen))
+            except FileNotFoundError:
+                # A merge published a newer generation and unlinked this one after we read it.
+                if self.generation() == gen:
+                    raise
+                continue
+            if self._seg is not None:
+                self._seg.close()
+            self._seg, self._generation = seg, gen
+            return seg
+        raise FileNotFoundError("shared store %s: generation keeps changing" % self.name)
+
+    def _layers(self) -> Tuple[SharedSegment, List[ConcreteStore]]:
+        """Consistent view: base segment plus the private layers not yet in it (frozen, then active)."""
+        with self._mlock:
+            return self._segment(), [layer for layer in (self._frozen, self.overlay) if layer is not None]
+
+    def _lock(self) -> Any:
+        """Cross-process merge lock (flock on a temp file; no-op where fcntl is unavailable)."""
+        import contextlib
+        import os
+        import tempfile
+        try:
+            import fcntl
+        except ImportError:
+            return contextlib.nullcontext()
+
+        @contextlib.contextmanager
+        def held() -> Any:
+            with open(os.path.join(tempfile.gettempdir(), "agi-shm-%s.lock" % self.name.strip("/")), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return held()
+
+    def _freeze(self) -> None:
+        self._frozen = self.overlay
+        self.overlay = ConcreteStore(semantic=SemanticMemory(max_entries=None), working=self._frozen.working)
+
+    def _merge_frozen(self) -> int:
+        """Publish base + frozen overlay as the next generation (under the cross-process lock)."""
+        frozen = self._frozen
+        with self._lock():
+            gen = self.generation()
+            # A private mapping: the reader-side self._seg may be swapped meanwhile.
+            seg = SharedSegment("%s-%d" % (self.name, gen))
+            try:
+                merged = ConcreteStore(semantic=SemanticMemory(max_entries=None))
+                for i in range(seg.n_sem):
+                    e = seg.semantic_at(i)
+                    merged.semantic.add(e.get("fact", ""), relations=e.get("relations"), id=e.get("id"),
+                                        count=e.get("count", 1), updated_at=e.get("updated_at"))
+                for e in frozen.semantic.all():
+                    merged.semantic.add(e.get("fact", ""), relations=e.get("relations"), count=e.get("count", 1),
+                                        updated_at=e.get("updated_at"))
+                episodes = [seg.episodic_at(i) for i in range(seg.n_epi)] + frozen.episodic.all()
+            finally:
+                seg.close()
+            for e in episodes:
+                merged.episodic.append(e.get("event", ""), context=e.get("context"), id=e.get("id"), timestamp=e.get("timestamp"))
+            data = self._pack_store(merged)
+            new = _create("%s-%d" % (self.name, gen + 1), len(data))
+            new.buf[:len(data)] = data
+            new.close()
+            with self._mlock:
+                _CONTROL.pack_into(self._control.buf, 0, CONTROL_MAGIC, gen + 1)
+                self._frozen = None
+            # Readers that attach after this retry on the new generation; existing mappings stay valid.
+            _unlink("%s-%d" % (self.name, gen))
+        self.merges += 1
+        return gen + 1
+
+    def _unfreeze(self) -> None:
+        """Failed merge: put the frozen entries back in front of the active overlay."""
+        with self._mlock:
+            frozen, self._frozen = self._frozen, None
+            if frozen is None:
+                return
+            frozen.store_semantic(self.overlay.semantic.all())
+            for e in self.overlay.episodic.all():
+                frozen.episodic.append(e.get("event", ""), context=e.get("context"), id=e.get("id"), timestamp=e.get("timestamp"))
+            self.overlay = frozen
+
+    def _merge_in_background(self) -> None:
+        try:
+            self._merge_frozen()
+        except Exception as e:
+            self.merge_error = e
+            self._unfreeze()
+
+    def wait_merge(self) -> None:
+        """Block until a background merge (if any) has finished."""
+        thread = self._merge_thread
+        if thread is not None:
+            thread.join()
+            self._merge_thread = None
+
+    def merge(self) -> int:
+        """Fold this worker's overlay into a new generation segment now; returns the new generation."""
+        self.wait_merge()
+        with self._mlock:
+            self._freeze()
+        try:
+            return self._merge_frozen()
+        except Exception:
+            self._unfreeze()
+            raise
+
+    def _maybe_merge(self) -> None:
+        """Start a background merge once the overlay reaches merge_every entries (one at a time)."""
+        if self.merge_every is None or len(self.overlay.semantic) + len(self.overlay.episodic) < self.merge_every:
+            return
+        if self._merge_thread is not None and self._merge_thread.is_alive():
+            return
+        with self._mlock:
+            self._freeze()
+        self._merge_thread = threading.Thread(target=self._merge_in_background, name="agi-shm-merge", daemon=True)
+        self._merge_thread.start()
+
+    # --- Store interface ---
+
+    def recall(self, query: Optional[str] = None, kind: Optional[Kind] = None, limit: int = 50) -> Dict[str, Any]:
+        seg, layers = self._layers()
+        parts = [layer.recall(query=query, kind=kind, limit=limit) for layer in layers]
+        result = parts[-1]
+        if kind is None or kind == "semantic":
+            base = [seg.semantic_at(i) for i in seg.match_semantic(query)[-limit:]]
+            result["semantic"] = (base + [e for p in parts for e in p["semantic"]])[-limit:]
+        if kind is None or kind == "episodic":
+            n = min(limit, seg.n_epi)
+            base = [seg.episodic_at(i) for i in range(seg.n_epi - n, seg.n_epi)]
+            result["episodic"] = (base + [e for p in parts for e in p["episodic"]])[-limit:]
+            result["episodic_stats"] = _merge_action_stats(seg.meta.get("action_stats") or {},
+                                                           [p.get("episodic_stats", {}) for p in parts])
+        return result
+
+    def store_semantic(self, entries: List[Dict[str, Any]]) -> None:
+        self.overlay.store_semantic(entries)
+        self._maybe_merge()
+
+    def store_episodic(self, entries: List[Dict[str, Any]]) -> None:
+        self.overlay.store_episodic(entries)
+        self._maybe_merge()
+
+    def get_working(self, key: str) -> Any:
+        return self.overlay.get_working(key)
+
+    def set_working(self, key: str, value: Any) -> None:
+        self.overlay.set_working(key, value)
+
+    def push_turn(self, turn: Dict[str, Any]) -> None:
+        self.overlay.push_turn(turn)
+
+    def stats(self) -> Dict[str, Any]:
+        seg, _ = self._layers()
+        overlay = self.overlay.stats()
+        return {
+            "shared": {"name": self.name, "generation": self._generation, "bytes": seg.shm.size,
+                       "semantic": seg.n_sem, "episodic": seg.n_epi},
+            "overlay": overlay,
+            "total_bytes": overlay["total_bytes"],
+        }
+
+    def close(self) -> None:
+        """Finish any background merge and detach (segments stay for other processes)."""
+        self.wait_merge()
+        if self._seg is not None:
+            self._seg.close()
+            self._seg = None
+        self._control.close()
+
+    def destroy(self) -> None:
+        """Unlink the control and current data segments (call once, from the owning process)."""
+        self.wait_merge()
+        gen = self.generation()
+        self.close()
+        for name in ("%s-%d" % (self.name, gen), self.name):
+            try:
+                _unlink(name)
+            except FileNotFoundError:
+                continue
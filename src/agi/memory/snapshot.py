@@ -0,0 +1,55 @@
+"""
+Copy-on-write store snapshot: reads fall through to the base store, writes are buffered in
+order and only reach the base on commit(). Creating one is O(1); discarding one is free.
+Used by speculative execution (agi.speculate) so only the winning branch's writes land.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from agi.memory.store import Kind, Store
+
+
+class StoreSnapshot(Store):
+    """Write-buffering view of a Store. recall() sees the base only; get_working sees buffered sets."""
+
+    def __init__(self, base: Store) -> None:
+        self.base = base
+        self._writes: List[Tuple[str, Any]] = []
+        self._working: Dict[str, Any] = {}
+        self.committed = False
+
+    def recall(self, query: Optional[str] = None, kind: Optional[Kind] = None, limit: int = 50) -> Dict[str, Any]:
+        return self.base.recall(query=query, kind=kind, limit=limit)
+
+    def store_semantic(self, entries: List[Dict[str, Any]]) -> None:
+        self._writes.append(("store_semantic", list(entries)))
+
+    def store_episodic(self, entries: List[Dict[str, Any]]) -> None:
+        self._writes.append(("store_episodic", list(entries)))
+
+    def get_working(self, key: str) -> Any:
+        if key in self._working:
+            return self._working[key]
+        return self.base.get_working(key)
+
+    def set_working(self, key: str, value: Any) -> None:
+        self._working[key] = value
+        self._writes.append(("set_working", (key, value)))
+
+    def push_turn(self, turn: Dict[str, Any]) -> None:
+        self._writes.append(("push_turn", turn))
+
+    def pending_writes(self) -> int:
+        return len(self._writes)
+
+    def commit(self) -> None:
+        """Apply buffered writes to the base store in order (once)."""
+        if self.committed:
+            raise RuntimeError("snapshot already committed")
+        self.committed = True
+        for op, arg in self._writes:
+            if op == "set_working":
+                self.base.set_working(*arg)
+            else:
+                getattr(self.base, op)(arg)
+        self._writes = []
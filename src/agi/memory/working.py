@@ -34,6 +34,31 @@ class WorkingMemory:
     def get_recent_turns(self) -> List[Dict[str, Any]]:
         return list(self._recent_turns)
 
+    def stats(self, top: int = 3) -> Dict[str, Any]:
+        """Key/turn counts, approximate bytes, and the largest recent_turns payloads."""
+        from agi.memory.footprint import deep_sizeof
+        turn_sizes = [(deep_sizeof(t), i) for i, t in enumerate(self._recent_turns)]
+        largest = sorted(turn_sizes, reverse=True)[:top]
+        return {
+            "keys": len(self._data),
+            "recent_turns": len(self._recent_turns),
+            "bytes": deep_sizeof(self._data) + sum(size for size, _ in turn_sizes),
+            "largest_turns": [
+                {"index": i, "action": self._recent_turns[i].get("action"), "bytes": size} for size, i in largest
+            ],
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """Plain-data snapshot for from_state()."""
+        return {"data": dict(self._data), "recent_turns": list(self._recent_turns)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "WorkingMemory":
+        m = cls()
+        m._data = dict(state.get("data") or {})
+        m._recent_turns = list(state.get("recent_turns") or [])[-MAX_RECENT_TURNS:]
+        return m
+
     def as_dict(self) -> Dict[str, Any]:
         return {
             **self._data,
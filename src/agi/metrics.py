@@ -0,0 +1,229 @@
+"""
+Metrics: counters and log-bucketed (HDR-style) latency histograms, exported as a snapshot dict
+or Prometheus text (file or stdlib HTTP endpoint).
+Updates take no lock: each is a few dict/list operations under the GIL, so concurrent ticks may
+very rarely lose an increment. Good enough for monitoring; keeps overhead off the tick path.
+"""
+
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sub-buckets per power of two: bucket width ~ 2^(1/4) - 1 ≈ 19% relative error.
+SUB_BUCKETS = 4
+# Histogram range: 1µs .. 2^27 µs (~134 s); values outside clamp to the first/last bucket.
+MIN_VALUE = 1e-6
+MAX_EXPONENT = 27
+NUM_BUCKETS = MAX_EXPONENT * SUB_BUCKETS
+
+_frexp = math.frexp
+_INV_MIN = 1.0 / MIN_VALUE
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{%s}" % ",".join('%s="%s"' % (k, esc(v)) for k, v in items)
+
+
+class Counter:
+    """Monotonic counter series."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, n: float = 1) -> None:
+        self.value += n
+
+
+class Histogram:
+    """Exponential buckets with SUB_BUCKETS linear steps per power of two (in units of MIN_VALUE)."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * NUM_BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        scaled = value / MIN_VALUE
+        if scaled < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(scaled)  # scaled = mantissa * 2**exponent, mantissa in [0.5, 1)
+        idx = (exponent - 1) * SUB_BUCKETS + int((mantissa * 2.0 - 1.0) * SUB_BUCKETS)
+        return idx if idx < NUM_BUCKETS else NUM_BUCKETS - 1
+
+    @staticmethod
+    def upper_bound(index: int) -> float:
+        """Exclusive upper edge of bucket index, in the observed unit (seconds)."""
+        exponent, sub = divmod(index + 1, SUB_BUCKETS)
+        return MIN_VALUE * (2.0 ** exponent) * (1.0 + sub / SUB_BUCKETS)
+
+    def observe(self, value: float) -> None:
+        # bucket_index inlined: this runs several times per tick.
+        scaled = value * _INV_MIN
+        if scaled < 1.0:
+            idx = 0
+        else:
+            mantissa, exponent = _frexp(scaled)
+            idx = (exponent - 1) * SUB_BUCKETS + int((mantissa + mantissa - 1.0) * SUB_BUCKETS)
+            if idx >= NUM_BUCKETS:
+                idx = NUM_BUCKETS - 1
+        self.counts[idx] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (0 if empty)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q * self.count)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self.upper_bound(i), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+        }
+
+
+# Prometheus `le` label of each bucket, fixed for every histogram. The last bucket also holds
+# clamped values above its edge, so it is only covered by le="+Inf".
+_BUCKET_EDGES = ["%.9g" % Histogram.upper_bound(i) for i in range(NUM_BUCKETS - 1)]
+
+
+class MetricsRegistry:
+    """Named counters and histograms with labels. Share one registry across agents to aggregate."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Dict[LabelKey, Counter]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        """Get or create one counter series; callers on hot paths may keep the object."""
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels) if labels else ()
+        c = series.get(key)
+        if c is None:
+            c = series.setdefault(key, Counter())
+        return c
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        self.counter(name, **labels).inc(value)
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        """Get or create one histogram series; callers on hot paths may keep the object."""
+        series = self._histograms.setdefault(name, {})
+        key = _label_key(labels) if labels else ()
+        h = series.get(key)
+        if h is None:
+            h = series.setdefault(key, Histogram())
+        return h
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        self.histogram(name, **labels).observe(value)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        c = self._counters.get(name, {}).get(_label_key(labels))
+        return c.value if c is not None else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view: counters and histogram summaries keyed by name then label string."""
+        return {
+            "counters": {
+                name: {_format_labels(k): c.value for k, c in list(series.items())}
+                for name, series in list(self._counters.items())
+            },
+            "histograms": {
+                name: {_format_labels(k): h.snapshot() for k, h in list(series.items())}
+                for name, series in list(self._histograms.items())
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (v0.0.4). Every histogram series exports the same
+        `le` edges, empty or not: a bucket that disappears between scrapes breaks rate()."""
+        lines: List[str] = []
+        for name, series in sorted(self._counters.items()):
+            if name in self._help:
+                lines.append("# HELP %s %s" % (name, self._help[name]))
+            lines.append("# TYPE %s counter" % name)
+            for key, c in sorted(series.items(), key=lambda kv: kv[0]):
+                lines.append("%s%s %s" % (name, _format_labels(key), _num(c.value)))
+        for name, series in sorted(self._histograms.items()):
+            if name in self._help:
+                lines.append("# HELP %s %s" % (name, self._help[name]))
+            lines.append("# TYPE %s histogram" % name)
+            for key, h in sorted(series.items(), key=lambda kv: kv[0]):
+                cumulative = 0
+                for le, c in zip(_BUCKET_EDGES, list(h.counts)):
+                    cumulative += c
+                    lines.append("%s_bucket%s %d" % (name, _format_labels(key, ("le", le)), cumulative))
+                lines.append("%s_bucket%s %d" % (name, _format_labels(key, ("le", "+Inf")), h.count))
+                lines.append("%s_sum%s %s" % (name, _format_labels(key), _num(h.sum)))
+                lines.append("%s_count%s %d" % (name, _format_labels(key), h.count))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the text format atomically (for node_exporter's textfile collector)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def serve_metrics(registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> Any:
+    """Serve GET /metrics from a daemon thread (stdlib http.server). Returns the server; call shutdown() to stop."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="agi-metrics", daemon=True).start()
+    return server
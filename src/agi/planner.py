@@ -4,12 +4,12 @@ Replan when observations diverge (caller responsibility).
 Max plan depth: 20 (gemini).
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 
 MAX_PLAN_DEPTH = 20
 
 
-def plan(goal: Dict[str, Any], reason_output: Dict[str, Any], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+def plan(goal: Dict[str, Any], reason_output: Dict[str, Any], tools: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
     """
     Return plan: steps (list), current_index (0), and optionally next_step.
     reason_output: from reasoner (beliefs, suggested_step).
@@ -0,0 +1,241 @@
+"""
+Predictive prefetch: after each act, guess the tick's next tool call and run it in a background
+thread while the agent stores, reflects and reasons, so the chained act finds its result ready.
+The guess is the reasoner's chaining rule (list_dir -> read_file on the first file-like entry);
+whether to act on it is learned from episodic memory: transition counts between consecutive
+acts of a tick (chained acts carry core's "continue with previous result" input).
+Results sit in a bounded LRU cache keyed by (tool, path) and validated on lookup against the
+path's mtime and size, so an edited file or directory is never served stale.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from agi.action.builtin_tools import _safe_path
+from agi.action.execute import copy_observation, execute_tool, observation_bytes
+from agi.action.registry import ToolRegistry
+
+WARM_TOOLS = ("read_file", "list_dir")
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+# Warm only if P(next tool | last tool) is at least this, once the last tool has MIN_SAMPLES transitions.
+DEFAULT_MIN_PROBABILITY = 0.3
+MIN_SAMPLES = 5
+# How long a lookup waits for an in-flight warm of the same call before running it itself.
+DEFAULT_WAIT_S = 1.0
+# Transition target for "the tick ended after this act".
+END = ""
+# Normalized input of chained acts (core.Agent.tick); marks an episode as following the previous one.
+_CHAINED = "continue with previous result"
+
+Predictor = Callable[[str, Dict[str, Any]], Optional[Tuple[str, Dict[str, Any]]]]
+_Key = Tuple[str, str]
+
+
+def chained_step(action: str, observation: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """The step the default reasoner chains after (action, observation), or None."""
+    from agi.reasoner import _chain_from_last_observation
+    return _chain_from_last_observation({"last_observation": observation, "action": action})
+
+
+class TransitionModel:
+    """Counts of next action (or END) per action, within a tick."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._last: Optional[str] = None
+
+    def add(self, prev: str, nxt: str) -> None:
+        row = self.counts.setdefault(prev, {})
+        row[nxt] = row.get(nxt, 0) + 1
+
+    def step(self, action: str, chained: bool) -> None:
+        """Feed acts in order; chained = the act continues the previous one's tick."""
+        if self._last is not None:
+            self.add(self._last, action if chained else END)
+        self._last = action
+
+    def learn(self, episodes: Iterable[Dict[str, Any]]) -> None:
+        """Replay episodic "tick" entries (EpisodicMemory.all() order)."""
+        for e in episodes:
+            ctx = e.get("context") or {}
+            if e.get("event") == "tick" and ctx.get("action"):
+                self.step(ctx["action"], ctx.get("input_preview") == _CHAINED)
+
+    def samples(self, prev: str) -> int:
+        return sum(self.counts.get(prev, {}).values())
+
+    def probability(self, prev: str, nxt: str) -> float:
+        n = self.samples(prev)
+        return self.counts[prev].get(nxt, 0) / n if n else 0.0
+
+
+class _Entry:
+    __slots__ = ("observation", "mtime_ns", "size", "nbytes")
+
+    def __init__(self, observation: Dict[str, Any], st: os.stat_result) -> None:
+        self.observation = observation
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        self.nbytes = observation_bytes(observation)
+
+
+class Prefetcher:
+    """Background warmer + mtime-validated result cache for read_file/list_dir. Call close() when done."""
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        base_dir: Optional[str] = None,
+        episodes: Optional[Iterable[Dict[str, Any]]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        min_probability: float = DEFAULT_MIN_PROBABILITY,
+        wait_s: float = DEFAULT_WAIT_S,
+        predict: Predictor = chained_step,
+    ) -> None:
+        self.registry = registry
+        self.base_dir = base_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.min_probability = min_probability
+        self.wait_s = wait_s
+        self.predict = predict
+        self.model = TransitionModel()
+        if episodes is not None:
+            self.model.learn(episodes)
+        self._cache: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[_Key, Future] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.warms = 0
+        self.skipped = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _full_path(self, args: Dict[str, Any]) -> Optional[str]:
+        path = args.get("path", ".")
+        return _safe_path(self.base_dir, path) if isinstance(path, str) else None
+
+    def _key(self, name: str, args: Dict[str, Any]) -> Optional[_Key]:
+        if name not in WARM_TOOLS or set(args) - {"path"}:
+            return None
+        path = args.get("path", ".")
+        return (name, path) if isinstance(path, str) else None
+
+    def should_warm(self, last: str, tool: str) -> bool:
+        """Chain rule predicted tool after last: trust it until last has MIN_SAMPLES learned transitions."""
+        if self.model.samples(last) < MIN_SAMPLES:
+            return True
+        return self.model.probability(last, tool) >= self.min_probability
+
+    def after(self, action: str, observation: Dict[str, Any], chained: bool = False) -> Optional[Future]:
+        """Called after each act: learn the transition, then warm the predicted next call (if any)."""
+        self.model.step(action, chained)
+        guess = self.predict(action, observation)
+        if guess is None:
+            return None
+        name, args = guess
+        if not self.should_warm(action, name):
+            self.skipped += 1
+            return None
+        return self.warm(name, args)
+
+    def warm(self, name: str, args: Dict[str, Any]) -> Optional[Future]:
+        """Run the call in the background and cache its result (no-op if cached/in flight/not cacheable)."""
+        key = self._key(name, args)
+        tool = self.registry.get(name)
+        if key is None or tool is None or tool.effect != "read":
+            return None
+        with self._lock:
+            if key in self._inflight or key in self._cache:
+                return self._inflight.get(key)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agi-prefetch")
+            future = self._pool.submit(self._fetch, key, dict(args))
+            self._inflight[key] = future
+            self.warms += 1
+        return future
+
+    def _fetch(self, key: _Key, args: Dict[str, Any]) -> None:
+        try:
+            full = self._full_path(args)
+            # Stat before running: a change during the call leaves the entry stale, never wrong.
+            st = os.stat(full) if full is not None else None
+            observation = execute_tool(self.registry, key[0], args)
+            if st is not None and observation.get("success"):
+                self._put(key, _Entry(observation, st))
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _put(self, key: _Key, entry: _Entry) -> None:
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._cache[key] = entry
+            self._bytes += entry.nbytes
+            while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def lookup(self, name: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached observation for the call if its path is unchanged (waits for an in-flight warm); else None."""
+        key = self._key(name, args)
+        if key is None:
+            return None
+        with self._lock:
+            future = self._inflight.get(key)
+        if future is not None:
+            try:
+                future.result(self.wait_s)
+            except Exception:
+                pass
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+        full = self._full_path(args)
+        try:
+            st = os.stat(full) if full is not None else None
+        except OSError:
+            st = None
+        with self._lock:
+            if st is None or st.st_mtime_ns != entry.mtime_ns or st.st_size != entry.size:
+                if self._cache.get(key) is entry:
+                    del self._cache[key]
+                    self._bytes -= entry.nbytes
+                self.stale += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return copy_observation(entry.observation)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "inflight": len(self._inflight),
+                "warms": self.warms,
+                "skipped": self.skipped,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+            }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
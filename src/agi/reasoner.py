@@ -2,10 +2,13 @@
 Reasoner: input state + recalled memory + goal → beliefs, candidate actions, suggested plan step.
 Stateless per call; state lives in memory and loop.
 Default: rule-based + tool-aware (read_file, list_dir); pluggable backend later.
+Batch protocol: reason_many(states) -> list of outputs, same order (see agi.batching).
 """
 
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+IntentParser = Callable[[str], Optional[Tuple[str, Dict[str, Any]]]]
 
 
 def _parse_tool_intent(normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
@@ -17,6 +20,18 @@ def _parse_tool_intent(normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
         return None
     s = normalized.strip()
     n = s.lower()
+    # "find [files] [named] X", "locate X" -> find_files; "search [for] X" -> search_text (indexed);
+    # "grep X" -> search_files (direct scan)
+    for pat, tool, key in (
+        (r"^(?:find|locate)\s+(?:files?\s+)?(?:named\s+)?(.+)$", "find_files", "pattern"),
+        (r"^search\s+(?:for\s+)?(.+)$", "search_text", "query"),
+        (r"^grep\s+(.+)$", "search_files", "query"),
+    ):
+        m = re.search(pat, s, re.IGNORECASE)
+        if m:
+            arg = m.group(1).strip().strip('"\'')
+            if arg:
+                return (tool, {key: arg})
     # "list [directory] [path]", "list dir X", "what's in X", "ls X", "contents of X"
     list_patterns = [
         r"list\s+(?:directory|dir)?\s*(.+)$",
@@ -50,6 +65,22 @@ def _parse_tool_intent(normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
     return None
 
 
+# Lookup tools that can stand in for each other on an ambiguous request (ranked after the parsed intent).
+_ALTERNATIVES = {
+    "find_files": (("search_text", "query"),),
+    "search_text": (("find_files", "pattern"), ("search_files", "query")),
+    "search_files": (("search_text", "query"),),
+}
+
+
+def _alternatives(tool_name: str, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Other lookup steps for the same term, e.g. find_files(X) -> search_text(X)."""
+    term = args.get("pattern") or args.get("query")
+    if not term:
+        return []
+    return [{"action": alt, "args": {key: term}} for alt, key in _ALTERNATIVES.get(tool_name, ())]
+
+
 def _format_recalled_summary(recalled: Dict[str, Any], limit: int = 10) -> str:
     """Format recalled semantic + episodic for 'what do you remember?' response."""
     lines = []
@@ -67,6 +98,11 @@ def _format_recalled_summary(recalled: Dict[str, Any], limit: int = 10) -> str:
             action = ctx.get("action", "")
             success = ctx.get("success", "")
             lines.append("  - %s (action: %s, success: %s)" % (ev[:60], action, success))
+    stats = recalled.get("episodic_stats") or {}
+    if stats:
+        lines.append("Actions so far:")
+        for name, st in sorted(stats.items(), key=lambda kv: -kv[1].get("count", 0))[:limit]:
+            lines.append("  - %s: %d runs, %.0f%% success" % (name, st.get("count", 0), 100 * st.get("success_rate", 0.0)))
     return "\n".join(lines) if lines else "Nothing in memory yet."
 
 
@@ -74,11 +110,12 @@ def _chain_from_last_observation(state: Dict[str, Any]) -> Optional[Tuple[str, D
     """
     If state has last_observation from a previous act in the same tick:
     - list_dir with entries -> suggest read_file on first entry (if it looks like a file)
+    - other tools (e.g. find_files) -> no chain
     - read_file with content -> suggest respond with content (already handled in core)
     Returns (tool_name, args) or None.
     """
     obs = state.get("last_observation") or {}
-    if not obs.get("success"):
+    if not obs.get("success") or state.get("action") not in (None, "list_dir"):
         return None
     payload = obs.get("payload") or {}
     if "entries" in payload:
@@ -90,6 +127,18 @@ def _chain_from_last_observation(state: Dict[str, Any]) -> Optional[Tuple[str, D
     return None
 
 
+def _observation_text(obs: Dict[str, Any]) -> str:
+    """Text to respond with when a previous act's result is final (no further chaining)."""
+    if not obs.get("success"):
+        return "Error: %s" % (obs.get("error") or "tool failed")
+    payload = obs.get("payload") or {}
+    if "entries" in payload:
+        return "\n".join(payload.get("entries") or []) or "(empty)"
+    if "content" in payload:
+        return payload.get("content") or ""
+    return payload.get("text") or str(payload)
+
+
 def reason(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Input: state with input, recalled, goal (and optionally last_observation).
@@ -97,6 +146,10 @@ def reason(state: Dict[str, Any]) -> Dict[str, Any]:
     Tool-aware: list_dir/read_file from intent; "what do you remember?" -> respond with summary;
     chaining: last_observation from list_dir -> read first file.
     """
+    return _reason(state, _parse_tool_intent)
+
+
+def _reason(state: Dict[str, Any], parse_intent: IntentParser) -> Dict[str, Any]:
     recalled = state.get("recalled") or {}
     goal = state.get("goal") or {}
     normalized = (state.get("input") or {}).get("normalized", "")
@@ -125,10 +178,13 @@ def reason(state: Dict[str, Any]) -> Dict[str, Any]:
             tool_name, args = chained
             thought = "Previous result available; I will read the first file."
             suggested_step = {"action": tool_name, "args": args}
+        else:
+            thought = "Previous result is final; I will respond with it."
+            suggested_step = {"action": "respond", "args": {"text": _observation_text(state["last_observation"])}}
 
     # Normal tool intent from user input
     if suggested_step is None:
-        tool_intent = _parse_tool_intent(normalized)
+        tool_intent = parse_intent(normalized)
         if tool_intent:
             tool_name, args = tool_intent
             suggested_step = {"action": tool_name, "args": args}
@@ -138,7 +194,7 @@ def reason(state: Dict[str, Any]) -> Dict[str, Any]:
             suggested_step = {"action": "respond", "args": {"text": normalized or "No input."}}
             thought = "No tool intent; I will respond."
 
-    candidate_actions = [suggested_step]
+    candidate_actions = [suggested_step] + _alternatives(suggested_step["action"], suggested_step.get("args") or {})
 
     return {
         "beliefs": beliefs,
@@ -146,3 +202,30 @@ def reason(state: Dict[str, Any]) -> Dict[str, Any]:
         "suggested_step": suggested_step,
         "thought": thought or "Deciding next step.",
     }
+
+
+def reason_many(states: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Batch form of reason(): one output per state, same order.
+    Intent parsing (the regex work) runs once per distinct input text in the batch.
+    """
+    intents: Dict[str, Any] = {}
+
+    def parse_once(normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if normalized not in intents:
+            intents[normalized] = _parse_tool_intent(normalized)
+        hit = intents[normalized]
+        # Fresh args dict per state: outputs must not share mutable args.
+        return (hit[0], dict(hit[1])) if hit else None
+
+    return [_reason(state, parse_once) for state in states]
+
+
+def batch_fn(reason_fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Sequence[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """reason_fn's batch form: its reason_many attribute, reason_many for the default reasoner, else a loop."""
+    many = getattr(reason_fn, "reason_many", None)
+    if many is not None:
+        return many
+    if reason_fn is reason:
+        return reason_many
+    return lambda states: [reason_fn(s) for s in states]
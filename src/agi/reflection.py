@@ -0,0 +1,133 @@
+"""
+Deferred reflection: tick pushes (state snapshot) jobs onto a bounded queue; a background worker
+drains them in batches, runs reflect_fn on each and writes the batch with one store_semantic call.
+Backpressure when full: "block" (tick waits for room) or "drop" (job discarded and counted).
+Semantic writes hold `lock`; readers of semantic memory (recall, save) should take it too.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from agi.memory.store import Store
+
+DEFAULT_MAX_PENDING = 256
+DEFAULT_BATCH_SIZE = 32
+
+OnFull = Literal["block", "drop"]
+
+_STOP = object()
+
+
+class ReflectionQueue:
+    """Bounded reflection queue with one daemon worker thread."""
+
+    def __init__(
+        self,
+        reflect_fn: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+        store: Store,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_full: OnFull = "block",
+        on_stored: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        if on_full not in ("block", "drop"):
+            raise ValueError("on_full must be 'block' or 'drop'")
+        self.reflect_fn = reflect_fn
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.on_full = on_full
+        self.on_stored = on_stored
+        self.lock = threading.RLock()
+        self.processed = 0
+        self.stored = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="agi-reflect", daemon=True)
+        self._thread.start()
+
+    def submit(self, state: Dict[str, Any]) -> bool:
+        """Queue one reflection job (state is shallow-copied). False if dropped or closed."""
+        if self._closed:
+            return False
+        job = dict(state)
+        if self.on_full == "drop":
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self._queue.put(job)
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _drain(self, first: Dict[str, Any]) -> List[Any]:
+        jobs = [first]
+        while len(jobs) < self.batch_size:
+            try:
+                jobs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _process(self, jobs: List[Dict[str, Any]]) -> None:
+        entries: List[Dict[str, Any]] = []
+        for job in jobs:
+            try:
+                entries.extend(self.reflect_fn(job) or [])
+            except Exception:
+                self.errors += 1
+        self.processed += len(jobs)
+        self.batches += 1
+        if entries:
+            try:
+                with self.lock:
+                    self.store.store_semantic(entries)
+            except Exception:
+                self.errors += 1
+                return
+            self.stored += len(entries)
+            if self.on_stored is not None:
+                self.on_stored(len(entries))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            jobs = self._drain(item)
+            stop = any(j is _STOP for j in jobs)
+            try:
+                self._process([j for j in jobs if j is not _STOP])
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Block until every queued job has been reflected and stored."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush, then stop the worker. Later submits are ignored."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending(),
+            "processed": self.processed,
+            "stored": self.stored,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "batches": self.batches,
+        }
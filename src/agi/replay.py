@@ -0,0 +1,219 @@
+"""
+Replay a recorded trace (agi.trace) against fresh agents: throughput, latency percentiles and
+output diffs against the recording. Offline load testing for reasoner/planner/store changes.
+
+--stub-tools answers tool calls from the recorded observations (keyed by tool + args), so
+only the agent's own work is measured and results do not depend on the filesystem.
+--concurrency N runs N agents (one per worker thread, each with its own memory), so memory-
+dependent outputs can diverge from a sequential recording; use 1 for a faithful replay.
+--rate R paces tick starts open-loop at R ticks/second (default: as fast as possible).
+"""
+
+import argparse
+import difflib
+import json
+import math
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_DIFFS = 10
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(math.ceil(q * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    v = sorted(values)
+    return {
+        "mean": sum(v) / len(v) if v else 0.0,
+        "p50": percentile(v, 0.50),
+        "p90": percentile(v, 0.90),
+        "p99": percentile(v, 0.99),
+        "max": v[-1] if v else 0.0,
+    }
+
+
+def _call_key(tool: str, args: Any) -> Tuple[str, str]:
+    return tool, json.dumps(args, sort_keys=True, default=str)
+
+
+class RecordedTools:
+    """Recorded observations by (tool, args); repeated calls replay in recorded order, then repeat the last."""
+
+    def __init__(self, records: List[Dict[str, Any]]) -> None:
+        self._observations: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.tools: Dict[str, None] = {}
+        for rec in records:
+            for call in rec.get("calls") or []:
+                self._observations.setdefault(_call_key(call["tool"], call.get("args") or {}), []).append(call["observation"])
+                self.tools[call["tool"]] = None
+        self._next: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    def lookup(self, tool: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        key = _call_key(tool, args)
+        seen = self._observations.get(key)
+        if not seen:
+            with self._lock:
+                self.misses += 1
+            return {"success": False, "payload": {}, "error": "No recorded observation for %s %s" % key}
+        with self._lock:
+            i = self._next.get(key, 0)
+            self._next[key] = i + 1
+        return seen[min(i, len(seen) - 1)]
+
+    def install(self, registry: Any) -> None:
+        """Replace every tool except respond with a recorded-observation stub."""
+        names = [t["name"] for t in registry.list_tools()]
+        for name in names + [n for n in self.tools if n not in names]:
+            if name == "respond":
+                continue
+            tool = registry.get(name)
+            registry.register(
+                name,
+                tool.description if tool else "Recorded tool (replay stub).",
+                {},
+                tool.effect if tool else "read",
+                lambda _name=name, **args: self.lookup(_name, args),
+            )
+
+
+def _diff(expected: Optional[str], actual: Optional[str], context: int = 1) -> str:
+    lines = difflib.unified_diff(
+        (expected or "").splitlines(), (actual or "").splitlines(), "recorded", "replayed", n=context, lineterm=""
+    )
+    return "\n".join(list(lines)[:40])
+
+
+def replay(
+    records: List[Dict[str, Any]],
+    agent_factory: Optional[Callable[[], Any]] = None,
+    concurrency: int = 1,
+    rate: Optional[float] = None,
+    stub_tools: bool = False,
+    max_diffs: int = DEFAULT_MAX_DIFFS,
+) -> Dict[str, Any]:
+    """Re-run records (in order, spread over concurrency agents); return a report dict."""
+    from agi.core import Agent, TickInput
+
+    factory = agent_factory or Agent
+    recorded_tools = RecordedTools(records) if stub_tools else None
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    next_index = iter(range(len(records)))
+    index_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def worker() -> None:
+        agent = factory()
+        if recorded_tools is not None:
+            recorded_tools.install(agent.registry)
+        try:
+            while True:
+                with index_lock:
+                    i = next(next_index, None)
+                if i is None:
+                    return
+                if rate:
+                    delay = started + i / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                inp = records[i].get("input") or {}
+                t0 = time.perf_counter()
+                try:
+                    out = agent.tick(TickInput(raw=inp.get("raw", ""), source=inp.get("source", "user")))
+                    results[i] = {"latency": time.perf_counter() - t0, "response": out.response, "error": None}
+                except Exception as e:
+                    results[i] = {"latency": time.perf_counter() - t0, "response": None, "error": repr(e)}
+        finally:
+            close = getattr(agent, "close", None)
+            if close is not None:
+                close()
+
+    threads = [threading.Thread(target=worker, name="agi-replay-%d" % n) for n in range(max(1, concurrency))]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - started
+
+    done = [r for r in results if r is not None]
+    diffs: List[Dict[str, Any]] = []
+    mismatches = 0
+    for rec, res in zip(records, results):
+        if res is None or res["error"] is not None or res["response"] == rec.get("response"):
+            continue
+        mismatches += 1
+        if len(diffs) < max_diffs:
+            diffs.append({
+                "seq": rec.get("seq"),
+                "input": (rec.get("input") or {}).get("raw", ""),
+                "diff": _diff(rec.get("response"), res["response"]),
+            })
+    return {
+        "ticks": len(done),
+        "errors": sum(1 for r in done if r["error"] is not None),
+        "concurrency": max(1, concurrency),
+        "wall_s": wall,
+        "throughput": len(done) / wall if wall > 0 else 0.0,
+        "latency": _latency_summary([r["latency"] for r in done]),
+        "recorded_latency": _latency_summary([rec.get("latency", 0.0) for rec in records]),
+        "mismatches": mismatches,
+        "stub_misses": recorded_tools.misses if recorded_tools is not None else 0,
+        "diffs": diffs,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    ms = lambda s: "%.2fms" % (s * 1000.0)
+    lat, rec = report["latency"], report["recorded_latency"]
+    lines = [
+        "ticks: %d  errors: %d  concurrency: %d  wall: %.3fs  throughput: %.1f ticks/s" % (
+            report["ticks"], report["errors"], report["concurrency"], report["wall_s"], report["throughput"]),
+        "latency   p50 %s  p90 %s  p99 %s  max %s" % (ms(lat["p50"]), ms(lat["p90"]), ms(lat["p99"]), ms(lat["max"])),
+        "recorded  p50 %s  p90 %s  p99 %s  max %s" % (ms(rec["p50"]), ms(rec["p90"]), ms(rec["p99"]), ms(rec["max"])),
+        "output mismatches: %d  stub misses: %d" % (report["mismatches"], report["stub_misses"]),
+    ]
+    for d in report["diffs"]:
+        lines.append("--- tick %s: %s" % (d["seq"], d["input"]))
+        lines.append(d["diff"])
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay an agi trace (agi --record PATH) and report latency and diffs")
+    parser.add_argument("trace", help="Trace file written by agi --record")
+    parser.add_argument("--concurrency", type=int, default=1, help="Agents ticking in parallel (default 1)")
+    parser.add_argument("--rate", type=float, default=None, metavar="TPS", help="Open-loop tick start rate (ticks/second)")
+    parser.add_argument("--stub-tools", action="store_true", help="Answer tool calls from recorded observations")
+    parser.add_argument("--base-dir", default=None, help="Workspace for real tool calls (default: cwd)")
+    parser.add_argument("--max-diffs", type=int, default=DEFAULT_MAX_DIFFS, help="Diffs to show (default %d)" % DEFAULT_MAX_DIFFS)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    from agi.core import Agent
+    from agi.trace import load_trace
+
+    records = load_trace(args.trace)
+    report = replay(
+        records,
+        agent_factory=lambda: Agent(base_dir=args.base_dir),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        stub_tools=args.stub_tools,
+        max_diffs=args.max_diffs,
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
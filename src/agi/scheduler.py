@@ -0,0 +1,74 @@
+"""
+Tick scheduler: decides whether a tick may chain another act.
+Budget: max acts, wall-clock seconds, tool output bytes. The decision uses the registry's
+per-tool moving averages, so a slow or bulky next tool is skipped when it would overrun;
+the tick then returns its best partial response.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from agi.action.execute import observation_bytes
+from agi.action.registry import ToolRegistry
+
+DEFAULT_MAX_ACTS = 2
+
+
+@dataclass
+class TickBudget:
+    max_acts: int = DEFAULT_MAX_ACTS
+    wall_clock_s: Optional[float] = None
+    max_output_bytes: Optional[int] = None
+    # Multiplier on estimated latency (>1 keeps headroom for variance).
+    latency_margin: float = 1.5
+
+
+class TickScheduler:
+    """Per-tick budget accounting. The first act always runs; later acts must fit the remaining budget."""
+
+    def __init__(
+        self,
+        budget: TickBudget,
+        registry: ToolRegistry,
+        clock: Callable[[], float] = time.perf_counter,
+        started: Optional[float] = None,
+    ) -> None:
+        """started: when the tick began on clock's timeline (default now), so wall_clock_s covers
+        perceive/recall/reason/plan too."""
+        self.budget = budget
+        self.registry = registry
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.acts = 0
+        self.output_bytes = 0
+        self.stopped_reason: Optional[str] = None
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def record(self, observation: Dict[str, Any]) -> None:
+        """Account for one completed act."""
+        self.acts += 1
+        self.output_bytes += observation_bytes(observation)
+
+    def can_run(self, tool_name: str) -> bool:
+        """True if another act with this tool fits the budget; otherwise sets stopped_reason."""
+        b = self.budget
+        if self.acts >= b.max_acts:
+            self.stopped_reason = "max_acts"
+            return False
+        if self.acts == 0:
+            return True
+        stats = self.registry.stats(tool_name)
+        if b.wall_clock_s is not None:
+            expected = stats.avg_latency * b.latency_margin if stats else 0.0
+            if self.elapsed() + expected > b.wall_clock_s:
+                self.stopped_reason = "wall_clock"
+                return False
+        if b.max_output_bytes is not None:
+            expected_bytes = stats.avg_bytes if stats else 0.0
+            if self.output_bytes + expected_bytes > b.max_output_bytes:
+                self.stopped_reason = "output_bytes"
+                return False
+        return True
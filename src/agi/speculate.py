@@ -0,0 +1,92 @@
+"""
+Speculative execution: run the top-K read-only candidate_actions concurrently, each writing to
+its own copy-on-write store snapshot, score the observations and commit only the winner.
+Wall-clock cost is roughly the slowest candidate rather than a serial retry per candidate.
+Scorer: (step, observation) -> float; highest wins, ties go to the reasoner's order.
+"""
+
+import json
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from agi.memory.snapshot import StoreSnapshot
+from agi.memory.store import Store
+
+Scorer = Callable[[Dict[str, Any], Dict[str, Any]], float]
+# run(step, snapshot) -> observation; performs the act and its memory writes against snapshot.
+Runner = Callable[[Dict[str, Any], Store], Dict[str, Any]]
+
+# Result keys in priority order; the first one present decides whether a call was productive
+# (search tools also fill "content" with a "(no matches)" placeholder).
+_RESULT_KEYS = ("matches", "entries", "content", "text", "result")
+
+
+def default_score(step: Dict[str, Any], observation: Dict[str, Any]) -> float:
+    """0 for failure, 1 for success with empty results, 2 for success with something to show."""
+    if not observation.get("success"):
+        return 0.0
+    payload = observation.get("payload")
+    if not isinstance(payload, dict):
+        return 2.0 if payload else 1.0
+    for key in _RESULT_KEYS:
+        if key in payload:
+            return 2.0 if payload[key] else 1.0
+    return 2.0
+
+
+def read_only_candidates(
+    candidates: Sequence[Dict[str, Any]],
+    tools: Sequence[Mapping[str, Any]],
+    k: int,
+) -> List[Dict[str, Any]]:
+    """First k distinct candidates whose tool has effect "read" (respond excluded)."""
+    get = getattr(tools, "get", None)
+    effects = None if get is not None else {t.get("name"): t.get("effect") for t in tools}
+    out: List[Dict[str, Any]] = []
+    seen = set()
+    for step in candidates:
+        name = step.get("action")
+        if not name or name == "respond":
+            continue
+        tool = get(name) if get is not None else None
+        effect = tool.get("effect") if tool else (effects or {}).get(name)
+        if effect != "read":
+            continue
+        key = (name, json.dumps(step.get("args") or {}, sort_keys=True, default=str))
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(step)
+        if len(out) >= k:
+            break
+    return out
+
+
+def speculate(
+    steps: Sequence[Dict[str, Any]],
+    store: Store,
+    run: Runner,
+    executor: Executor,
+    scorer: Optional[Scorer] = None,
+) -> Tuple[int, List[Tuple[Dict[str, Any], Dict[str, Any], float]]]:
+    """
+    Run each step on its own snapshot of store (concurrently via executor), commit the
+    best-scoring snapshot. Returns (winner index, [(step, observation, score)] in step order).
+    """
+    scorer = scorer or default_score
+    snapshots = [StoreSnapshot(store) for _ in steps]
+    futures = [executor.submit(run, step, snap) for step, snap in zip(steps, snapshots)]
+    results: List[Tuple[Dict[str, Any], Dict[str, Any], float]] = []
+    for step, fut in zip(steps, futures):
+        try:
+            observation = fut.result()
+        except Exception as e:
+            observation = {"success": False, "payload": {}, "error": str(e)}
+        try:
+            score = float(scorer(step, observation))
+        except Exception:
+            score = float("-inf")
+        results.append((step, observation, score))
+    winner = max(range(len(results)), key=lambda i: (results[i][2], -i))
+    snapshots[winner].commit()
+    return winner, results
@@ -0,0 +1,71 @@
+"""
+Tick traces for record/replay: one JSON line per tick with the input, every tool call
+(tool, args, observation, latency), the response and the tick latency.
+Line 1 is a header {"format": "agi-trace", "version": 1}. Written by `agi --record PATH`,
+read by agi.replay.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+FORMAT_NAME = "agi-trace"
+FORMAT_VERSION = 1
+
+
+class TraceRecorder:
+    """Appends one record per tick to a trace file (flushed per tick; safe to share across agents)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.ticks = 0
+        self._lock = threading.Lock()
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(self._encode({"format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n")
+
+    def record(self, input: Any, calls: List[Dict[str, Any]], output: Any, latency: float) -> None:
+        rec = {
+            "seq": 0,
+            "at": time.time(),
+            "input": {"raw": input.raw, "source": input.source},
+            "calls": calls,
+            "response": output.response,
+            "halt": output.halt,
+            "latency": latency,
+        }
+        with self._lock:
+            rec["seq"] = self.ticks
+            self.ticks += 1
+            self._file.write(self._encode(rec) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream tick records from a trace file (header checked and skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            if rec.get("format") == FORMAT_NAME:
+                if rec.get("version", FORMAT_VERSION) > FORMAT_VERSION:
+                    raise ValueError("unsupported trace version: %s" % rec.get("version"))
+                continue
+            yield rec
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    return list(iter_trace(path))
@@ -0,0 +1,103 @@
+"""Tests for reason_many and the micro-batching scheduler."""
+
+import threading
+
+import pytest
+from agi.batching import MicroBatcher, StubBackend
+from agi.reasoner import batch_fn, reason, reason_many
+
+
+def _state(text):
+    return {"input": {"normalized": text}, "recalled": {}, "goal": {}}
+
+
+def test_reason_many_matches_reason():
+    states = [_state(t) for t in ("hello", "list dir src", "read file README.md", "hello", "grep TODO")]
+    assert reason_many(states) == [reason(s) for s in states]
+
+
+def test_reason_many_outputs_do_not_share_args():
+    a, b = reason_many([_state("read file x.py"), _state("read file x.py")])
+    a["suggested_step"]["args"]["path"] = "changed"
+    assert b["suggested_step"]["args"]["path"] == "x.py"
+
+
+def test_batch_fn_prefers_reason_many():
+    assert batch_fn(reason) is reason_many
+    backend = StubBackend(latency_per_call_s=0)
+    assert batch_fn(backend) == backend.reason_many
+    loop = batch_fn(lambda s: {"n": s["input"]["normalized"]})
+    assert loop([_state("a"), _state("b")]) == [{"n": "a"}, {"n": "b"}]
+
+
+def test_concurrent_requests_are_batched():
+    backend = StubBackend(latency_per_call_s=0.02)
+    texts = ["hello %d" % i for i in range(12)]
+    results = {}
+    with MicroBatcher(backend.reason_many, max_batch=8, max_wait_ms=20) as batcher:
+        def worker(t):
+            results[t] = batcher.reason(_state(t))
+        threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+    assert all(results[t] == reason(_state(t)) for t in texts)
+    assert batcher.items == 12
+    assert backend.calls == batcher.batches < 12
+    assert batcher.stats()["avg_batch"] > 1
+
+
+def test_max_batch_respected():
+    sizes = []
+
+    def many(states):
+        sizes.append(len(states))
+        return reason_many(states)
+
+    with MicroBatcher(many, max_batch=3, max_wait_ms=50) as batcher:
+        futures = [batcher.submit(_state("x%d" % i)) for i in range(7)]
+        for f in futures:
+            f.result(timeout=5)
+    assert max(sizes) <= 3
+    assert sum(sizes) == 7
+
+
+def test_batch_error_propagates_to_all_futures():
+    def boom(states):
+        raise RuntimeError("backend down")
+
+    with MicroBatcher(boom, max_batch=4, max_wait_ms=20) as batcher:
+        futures = [batcher.submit(_state("a")), batcher.submit(_state("b"))]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="backend down"):
+                f.result(timeout=5)
+
+
+def test_submit_after_close_raises():
+    batcher = MicroBatcher(reason_many)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(_state("a"))
+
+
+def test_submit_racing_close_never_hangs():
+    for _ in range(20):
+        batcher = MicroBatcher(reason_many, max_wait_ms=1)
+        futures = []
+        errors = []
+
+        def submitter():
+            for i in range(50):
+                try:
+                    futures.append(batcher.submit(_state("x%d" % i)))
+                except RuntimeError:
+                    errors.append(i)
+
+        t = threading.Thread(target=submitter)
+        t.start()
+        batcher.close()
+        t.join()
+        for f in futures:
+            f.result(timeout=5)
+        assert len(futures) + len(errors) == 50
@@ -3,7 +3,7 @@
 import os
 import tempfile
 import pytest
-from agi.action.builtin_tools import read_file, list_dir, register_builtins
+from agi.action.builtin_tools import read_file, list_dir, register_builtins, search_files, iter_search_files
 from agi.action.registry import ToolRegistry
 from agi.action.execute import execute_tool
 
@@ -40,3 +40,57 @@ def test_register_builtins_and_execute(tmp_path):
     out = execute_tool(reg, "list_dir", {"path": "."})
     assert out["success"] is True
     assert "f" in out["payload"]["entries"]
+
+
+def test_find_files_and_search_text_tools(tmp_path):
+    (tmp_path / "notes.txt").write_text("alpha\nneedle here\n")
+    (tmp_path / "other.md").write_text("nothing")
+    reg = ToolRegistry()
+    register_builtins(reg, base_dir=str(tmp_path))
+    out = execute_tool(reg, "find_files", {"pattern": "*.txt"})
+    assert out["success"] is True
+    assert out["payload"]["entries"] == ["notes.txt"]
+    out = execute_tool(reg, "search_text", {"query": "needle"})
+    assert out["success"] is True
+    assert out["payload"]["matches"] == [{"path": "notes.txt", "line": 2, "text": "needle here"}]
+    assert out["payload"]["content"] == "notes.txt:2: needle here"
+
+
+def _grep_tree(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("import os\nNEEDLE = 1\n")
+    (tmp_path / "b.txt").write_text("no\nneedle in a haystack\nneedle again")
+    (tmp_path / "c.bin").write_bytes(b"needle\0binary")
+
+
+def test_search_files_finds_lines_and_skips_binaries(tmp_path):
+    _grep_tree(tmp_path)
+    out = search_files("needle", base=str(tmp_path))
+    assert out["success"] is True
+    found = sorted((m["path"], m["line"]) for m in out["payload"]["matches"])
+    assert found == [("b.txt", 2), ("b.txt", 3), ("src/a.py", 2)]
+    assert out["payload"]["truncated"] is False
+    out = search_files("needle", path="src", base=str(tmp_path))
+    assert [m["path"] for m in out["payload"]["matches"]] == ["src/a.py"]
+
+
+def test_search_files_stops_at_limits(tmp_path):
+    _grep_tree(tmp_path)
+    out = search_files("needle", base=str(tmp_path), max_results=1)
+    assert len(out["payload"]["matches"]) == 1
+    assert out["payload"]["truncated"] is True
+    big = tmp_path / "big.txt"
+    big.write_text("x\n" * 100000 + "needle\n")
+    stats = {}
+    list(iter_search_files("needle", "big.txt", base=str(tmp_path), max_bytes=1000, stats=stats))
+    assert stats["truncated"] is True
+    assert stats["bytes_scanned"] < 200000
+
+
+def test_search_files_stays_in_sandbox(tmp_path):
+    (tmp_path / "ws").mkdir()
+    (tmp_path / "ws2").mkdir()
+    (tmp_path / "ws2" / "secret.txt").write_text("needle")
+    out = search_files("needle", path="../ws2", base=str(tmp_path / "ws"))
+    assert out["success"] is False
+    assert read_file("../ws2/secret.txt", base=str(tmp_path / "ws"))["success"] is False
@@ -0,0 +1,82 @@
+"""Tests for binary agent checkpoint/restore."""
+
+import pickle
+import uuid
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.checkpoint import MAGIC, load_checkpoint
+from agi.memory import ConcreteStore
+from agi.memory.shared import SharedStore
+
+
+def test_checkpoint_restores_store_and_working_memory(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    agent = Agent(base_dir=str(tmp_path))
+    agent.store.set_working("active_goal", {"id": "g1", "description": "read a", "status": "active"})
+    agent.tick(TickInput(raw="read file a.txt"))
+    agent.tick(TickInput(raw="hello"))
+    path = str(tmp_path / "agent.ckpt")
+    size = agent.checkpoint(path)
+    assert size == (tmp_path / "agent.ckpt").stat().st_size
+    assert (tmp_path / "agent.ckpt").read_bytes().startswith(MAGIC)
+
+    other = Agent(base_dir=str(tmp_path))
+    info = other.restore(path)
+    assert info == {"missing_tools": []}
+    assert other.store.get_working("active_goal")["id"] == "g1"
+    assert other.store.get_working("last_thought") == agent.store.get_working("last_thought")
+    assert [t["action"] for t in other.store.working.get_recent_turns()] == ["read_file", "respond"]
+    assert other.store.semantic.all() == agent.store.semantic.all()
+    assert other.store.episodic.all() == agent.store.episodic.all()
+    assert other.store.episodic.action_stats() == agent.store.episodic.action_stats()
+    assert other.registry.stats("read_file").calls == 1
+    other.tick(TickInput(raw="hello again"))
+    assert len(other.store.episodic) == 3 and len(agent.store.episodic) == 2
+
+
+def test_checkpoint_payload_is_plain_data(tmp_path):
+    agent = Agent(base_dir=str(tmp_path))
+    agent.tick(TickInput(raw="hello"))
+    path = str(tmp_path / "agent.ckpt")
+    agent.checkpoint(path)
+    data = (tmp_path / "agent.ckpt").read_bytes()
+    payload = pickle.loads(data[len(MAGIC) + 10:])
+    assert set(payload["store"]) == {"semantic", "episodic", "working"}
+    assert b"agi.memory" not in data
+    restored = load_checkpoint(path)["store"]
+    assert restored.episodic.query(action="respond") == agent.store.episodic.query(action="respond")
+
+
+def test_checkpoint_rejects_shared_store(tmp_path):
+    shared = SharedStore.publish(ConcreteStore(), "agi-test-%s" % uuid.uuid4().hex[:8])
+    try:
+        agent = Agent(store=shared, base_dir=str(tmp_path))
+        with pytest.raises(TypeError, match="cannot checkpoint SharedStore"):
+            agent.checkpoint(str(tmp_path / "agent.ckpt"))
+    finally:
+        shared.destroy()
+
+
+def test_restore_reports_missing_tools(tmp_path):
+    agent = Agent(base_dir=str(tmp_path))
+    agent.registry.register("custom", "Custom tool.", {}, "read", lambda: {})
+    path = str(tmp_path / "agent.ckpt")
+    agent.checkpoint(path)
+    assert Agent(base_dir=str(tmp_path)).restore(path) == {"missing_tools": ["custom"]}
+
+
+def test_load_rejects_foreign_or_truncated_files(tmp_path):
+    bad = tmp_path / "bad.ckpt"
+    bad.write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        load_checkpoint(str(bad))
+    path = str(tmp_path / "agent.ckpt")
+    Agent(base_dir=str(tmp_path)).checkpoint(path)
+    data = (tmp_path / "agent.ckpt").read_bytes()
+    (tmp_path / "agent.ckpt").write_bytes(data[:-5])
+    with pytest.raises(ValueError, match="truncated"):
+        load_checkpoint(path)
+    (tmp_path / "agent.ckpt").write_bytes(data[:12])
+    with pytest.raises(ValueError, match="truncated"):
+        load_checkpoint(path)
@@ -0,0 +1,72 @@
+"""Tests for the NumPy columnar episodic export (skipped without numpy)."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agi.memory import EpisodicMemory
+from agi.memory.columnar import EpisodeColumns, to_columns
+
+
+def _episodic():
+    ep = EpisodicMemory()
+    rows = [
+        ("2026-01-01T10:00:00Z", "read_file", True, "read a"),
+        ("2026-01-01T10:30:00Z", "read_file", False, "read b"),
+        ("2026-01-01T11:05:00Z", "list_dir", True, "list ."),
+        ("2026-01-01T12:00:00.250000Z", "respond", True, "héllo"),
+        ("2026-01-01T12:10:00Z", None, False, ""),
+    ]
+    for ts, action, ok, preview in rows:
+        ctx = {"input_preview": preview, "success": ok}
+        if action:
+            ctx["action"] = action
+        ep.append("tick", context=ctx, timestamp=ts)
+    return ep
+
+
+def test_columns_types_and_values():
+    cols = to_columns(_episodic())
+    assert len(cols) == 5
+    assert cols.records.dtype["ts"] == np.int64
+    assert cols.actions == ["read_file", "list_dir", "respond"]
+    assert cols.ts[0] == int(datetime(2026, 1, 1, 10, tzinfo=timezone.utc).timestamp()) * 1_000_000
+    assert cols.ts[3] % 1_000_000 == 250000
+    assert cols.preview(3) == "héllo"
+    assert cols.preview(4) == ""
+
+
+def test_vectorized_filters_and_group_bys():
+    cols = to_columns(_episodic())
+    assert len(cols.filter(action="read_file")) == 2
+    assert len(cols.filter(action="read_file", success=True)) == 1
+    assert len(cols.filter(action="missing")) == 0
+    assert len(cols.filter(since="2026-01-01T11:00:00Z", until=datetime(2026, 1, 1, 12))) == 1
+    assert cols.action_counts() == {"read_file": 2, "list_dir": 1, "respond": 1, None: 1}
+    assert cols.success_rate_by_action()["read_file"] == 0.5
+    starts, counts = cols.counts_by_time(3600)
+    assert counts.tolist() == [2, 1, 2]
+    _, rates = cols.success_rate_by_time(3600)
+    assert rates.tolist() == [0.5, 1.0, 0.5]
+
+
+def test_save_and_memory_mapped_load(tmp_path):
+    cols = to_columns(_episodic())
+    cols.save(str(tmp_path / "cols"))
+    loaded = EpisodeColumns.load(str(tmp_path / "cols"))
+    assert isinstance(loaded.records, np.memmap)
+    assert loaded.actions == cols.actions
+    assert loaded.records.tolist() == cols.records.tolist()
+    assert loaded.preview(3) == "héllo"
+    assert loaded.filter(action="list_dir").preview(0) == "list ."
+
+
+def test_summaries_skipped_and_archived_included(tmp_path):
+    ep = EpisodicMemory(archive_dir=str(tmp_path))
+    ep.append("tick", context={"action": "read_file", "success": True}, timestamp="2026-01-01T10:00:00Z")
+    ep.append("tick", context={"action": "list_dir", "success": True}, timestamp="2026-01-02T10:00:00Z")
+    ep.compact(keep_segments=1)
+    assert len(to_columns(ep)) == 1
+    assert to_columns(ep, include_archived=True).action_counts() == {"read_file": 1, "list_dir": 1}
@@ -25,3 +25,12 @@ def test_agent_stores_episode():
     agent.tick(TickInput(raw="Second"))
     recent = agent.store.episodic.recent(limit=5)
     assert len(recent) >= 2
+
+
+def test_tools_registered_after_init_override_deferred_builtins(tmp_path):
+    (tmp_path / "README.md").write_text("real")
+    agent = Agent(base_dir=str(tmp_path))
+    agent.registry.register("read_file", "Custom read.", {"path": "string"}, "read", lambda path: {"content": "CUSTOM " + path})
+    out = agent.tick(TickInput(raw="read file README.md"))
+    assert out.response == "CUSTOM README.md"
+    assert agent.registry.get("list_dir") is not None
@@ -0,0 +1,84 @@
+"""Tests for the coalescing, priority input queue."""
+
+import threading
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.ingest import InputQueue, pump, similar_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_default_key_keeps_distinct_events():
+    clock = FakeClock()
+    q = InputQueue(debounce_s=0.0, clock=clock)
+    assert q.put(TickInput("changed a1.txt", source="event")) == "queued"
+    assert q.put(TickInput("changed a2.txt", source="event")) == "queued"
+    assert q.put(TickInput(" changed a1.txt ", source="event")) == "merged"
+    assert [q.poll().raw, q.poll().raw] == [" changed a1.txt ", "changed a2.txt"]
+
+
+def test_burst_of_similar_events_coalesces_after_debounce():
+    clock = FakeClock()
+    q = InputQueue(debounce_s=0.05, max_delay_s=1.0, key_fn=similar_key, clock=clock)
+    for i in range(5):
+        assert q.put(TickInput("file changed: log%d.txt" % i, source="event")) == ("queued" if i == 0 else "merged")
+        clock.now += 0.01
+    assert q.poll() is None
+    clock.now += 0.05
+    item = q.poll()
+    assert item.raw == "file changed: log4.txt" and item.coalesced == 5
+    assert q.stats()["merged"] == 4 and q.depth() == 0
+
+
+def test_max_delay_releases_continuous_storm():
+    clock = FakeClock()
+    q = InputQueue(debounce_s=0.05, max_delay_s=0.2, clock=clock)
+    released = None
+    for _ in range(100):
+        q.put(TickInput("tick", source="env"))
+        clock.now += 0.01
+        released = released or q.poll()
+    assert released is not None and released.coalesced <= 21
+
+
+def test_user_input_takes_priority():
+    clock = FakeClock()
+    q = InputQueue(debounce_s=0.0, clock=clock)
+    q.put(TickInput("disk full", source="env"))
+    q.put(TickInput("hello", source="user"))
+    assert q.poll().raw == "hello"
+    assert q.poll().raw == "disk full"
+
+
+def test_distinct_events_bounded_and_dropped():
+    q = InputQueue(max_pending=2, clock=FakeClock())
+    results = [q.put(TickInput(name, source="event")) for name in ("alpha", "beta", "gamma")]
+    assert results == ["queued", "queued", "dropped"]
+    assert q.stats()["dropped"] == 1 and q.stats()["event_depth"] == 2
+
+
+def test_get_blocks_until_debounce_then_pump_ticks_agent():
+    q = InputQueue(debounce_s=0.02, key_fn=similar_key)
+    agent = Agent()
+    outputs = []
+    for i in range(10):
+        q.put(TickInput("sensor %d" % i, source="env"))
+    q.put(TickInput("hi"))
+    ticks = pump(agent, q, on_output=lambda inp, out: outputs.append((inp.raw, out.response)))
+    assert ticks == 2
+    assert outputs[0] == ("hi", "hi")
+    assert outputs[1][0] == "sensor 9"
+    assert q.get(timeout=0.01) is None
+
+
+def test_producer_thread_wakes_consumer():
+    q = InputQueue()
+    threading.Timer(0.02, lambda: q.put(TickInput("late"))).start()
+    assert q.get(timeout=2).raw == "late"
@@ -49,3 +49,162 @@ def test_concrete_store_push_turn():
     s = ConcreteStore()
     s.push_turn({"action": "respond"})
     assert len(s.working.get_recent_turns()) == 1
+
+
+def test_semantic_dedup_bumps_count():
+    m = SemanticMemory()
+    a = m.add("User requested listing and received 3 entries (input: list dir .).", relations=["reflection"])
+    b = m.add("User requested listing and received 5 entries (input: list dir .)", relations=["reflection"])
+    assert a == b
+    assert len(m.all()) == 1
+    assert m.all()[0]["count"] == 2
+    assert "5 entries" in m.all()[0]["fact"]
+
+
+def test_semantic_dedup_keeps_numbers_distinct():
+    m = SemanticMemory()
+    m.add("port 80 is open")
+    m.add("Port 443 is open.")
+    m.add("config_v1.yaml")
+    m.add("config_v2.yaml")
+    assert m.add("PORT  80 is open!") == m.all()[0]["id"]
+    assert len(m) == 4
+
+
+def test_semantic_lru_evicts_least_recently_recalled():
+    m = SemanticMemory(max_entries=2)
+    m.add("alpha")
+    m.add("beta")
+    m.query("alpha")
+    m.add("gamma")
+    facts = [e["fact"] for e in m.all()]
+    assert facts == ["alpha", "gamma"]
+    assert m.evicted == 1
+
+
+def test_semantic_lfu_evicts_least_frequent():
+    m = SemanticMemory(max_entries=2, eviction="lfu")
+    m.add("alpha")
+    m.add("alpha")
+    m.add("beta")
+    m.add("gamma")
+    facts = [e["fact"] for e in m.all()]
+    assert facts == ["alpha", "gamma"]
+
+
+def test_semantic_relation_quota():
+    m = SemanticMemory(relation_quotas={"reflection": 2})
+    m.add("keep me", relations=["user"])
+    for word in ("one", "two", "three"):
+        m.add("reflected %s" % word, relations=["reflection"])
+    assert len(m.by_relation("reflection")) == 2
+    assert [e["fact"] for e in m.by_relation("reflection")] == ["reflected two", "reflected three"]
+    assert len(m.all()) == 3
+
+
+def test_semantic_relation_quota_applies_on_merge():
+    m = SemanticMemory(relation_quotas={"hot": 1})
+    m.add("alpha", relations=["hot"])
+    m.add("beta")
+    m.add("beta", relations=["hot"])
+    assert [e["fact"] for e in m.by_relation("hot")] == ["beta"]
+    assert m.evicted == 1
+
+
+def test_episodic_query_by_action_success_and_time():
+    m = EpisodicMemory()
+    m.append("tick", {"action": "read_file", "success": True}, timestamp="2026-01-01T10:00:00Z")
+    m.append("tick", {"action": "list_dir", "success": False}, timestamp="2026-01-01T11:00:00Z")
+    m.append("tick", {"action": "read_file", "success": False}, timestamp="2026-01-02T09:00:00Z")
+    m.append("tick", {"action": "read_file", "success": True}, timestamp="2026-01-02T10:00:00Z")
+    assert len(m.query(action="read_file")) == 3
+    failed = m.query(success=False)
+    assert [e["context"]["action"] for e in failed] == ["list_dir", "read_file"]
+    assert len(m.query(action="read_file", since="2026-01-02T00:00:00Z")) == 2
+    assert len(m.query(action="read_file", success=True, until="2026-01-01T23:59:59Z")) == 1
+    assert m.query(action="read_file", limit=1)[0]["timestamp"] == "2026-01-02T10:00:00Z"
+    assert m.count(action="read_file", since="2026-01-02T00:00:00Z") == 2
+    assert m.hourly_counts()["2026-01-01T10"] == 1
+
+
+def test_episodic_datetime_bounds_compare_at_microsecond_precision():
+    from datetime import datetime
+    m = EpisodicMemory()
+    m.append("tick", {"action": "a"}, timestamp="2026-01-01T12:00:00.500000Z")
+    noon = datetime(2026, 1, 1, 12, 0, 0)
+    assert len(m.query(since=noon)) == 1
+    assert m.query(until=noon) == []
+    m.append("tick", {"action": "b"})
+    assert len(m.all()[-1]["timestamp"]) == len("2026-01-01T12:00:00.500000Z")
+
+
+def test_episodic_action_stats_incremental():
+    m = EpisodicMemory()
+    m.append("tick", {"action": "read_file", "success": True})
+    m.append("tick", {"action": "read_file", "success": False})
+    stats = m.action_stats()
+    assert stats["read_file"]["count"] == 2
+    assert stats["read_file"]["success_rate"] == 0.5
+
+
+def test_episodic_rolling_compaction_archives_old_segments(tmp_path):
+    m = EpisodicMemory(segment="day", retention_segments=1, archive_dir=str(tmp_path))
+    m.append("tick", {"action": "read_file", "success": True}, timestamp="2026-01-01T10:00:00Z")
+    m.append("tick", {"action": "read_file", "success": False, "input_preview": "read x"}, timestamp="2026-01-01T11:00:00Z")
+    m.append("tick", {"action": "list_dir", "success": True}, timestamp="2026-01-02T09:00:00Z")
+    entries = m.all()
+    assert len(entries) == 2
+    summary = entries[0]["context"]
+    assert summary["summary"] is True
+    assert summary["segment"] == "2026-01-01"
+    assert summary["counts"] == {"read_file": 2}
+    assert summary["failures"][0]["input_preview"] == "read x"
+    assert m.action_stats()["read_file"]["count"] == 2
+    assert m.archived_segments() == ["2026-01-01"]
+    assert m.query(action="read_file") == []
+    archived = m.query(action="read_file", include_archived=True)
+    assert len(archived) == 2
+    assert len(m.load_segment("2026-01-01")) == 2
+
+
+def test_episodic_late_episode_folds_into_existing_summary():
+    m = EpisodicMemory(segment="day", retention_segments=1)
+    m.append("tick", {"action": "read_file", "success": True}, timestamp="2026-01-01T10:00:00Z")
+    m.append("tick", {"action": "list_dir", "success": True}, timestamp="2026-01-02T09:00:00Z")
+    m.append("tick", {"action": "read_file", "success": False}, timestamp="2026-01-01T23:00:00Z")
+    summaries = [e for e in m.all() if e["event"] == "summary"]
+    assert [e["id"] for e in summaries] == ["sum-2026-01-01"]
+    ctx = summaries[0]["context"]
+    assert ctx["episodes"] == 2 and ctx["counts"] == {"read_file": 2} and ctx["successes"] == {"read_file": 1}
+    assert summaries[0]["timestamp"] == "2026-01-01T10:00:00Z"
+    assert m.action_stats()["read_file"] == {"count": 2, "successes": 1, "success_rate": 0.5}
+
+
+def test_episodic_max_age_compacts_by_date_not_segment_count():
+    from datetime import datetime, timedelta
+    today = datetime.utcnow()
+    m = EpisodicMemory(segment="day", max_age=timedelta(days=2))
+    # Sparse history: few segments with data, but only the recent ones are within two days.
+    for days in (40, 10, 1, 0):
+        m.append("tick", {"action": "read_file", "success": True}, timestamp=(today - timedelta(days=days)).isoformat() + "Z")
+    assert [e["event"] for e in m.all()] == ["summary", "summary", "tick", "tick"]
+    assert m.cutoff_segment() == (today - timedelta(days=2)).isoformat()[:10]
+    assert m.compact() == []
+
+
+def test_store_stats_reports_footprint():
+    from agi.memory.footprint import deep_sizeof
+    store = ConcreteStore()
+    store.store_semantic([{"fact": "alpha", "relations": ["r"]}, {"fact": "beta"}])
+    store.store_episodic([{"event": "tick", "context": {"action": "read_file", "success": True}}])
+    store.push_turn({"action": "small", "observation": {"payload": {"content": "x"}}})
+    store.push_turn({"action": "big", "observation": {"payload": {"content": "x" * 10000}}})
+    stats = store.stats()
+    assert stats["semantic"]["entries"] == 2 and stats["semantic"]["relations"] == 1
+    assert stats["episodic"]["entries"] == 1 and stats["episodic"]["index_keys"] == 2
+    assert stats["working"]["recent_turns"] == 2
+    assert stats["working"]["largest_turns"][0]["action"] == "big"
+    assert stats["working"]["largest_turns"][0]["bytes"] > 10000
+    assert stats["total_bytes"] > stats["working"]["bytes"] > 10000
+    shared = "s" * 100
+    assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
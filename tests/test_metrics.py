@@ -0,0 +1,69 @@
+"""Tests for metrics: counters, log-bucketed histograms, Prometheus export, Agent.metrics()."""
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.metrics import NUM_BUCKETS, Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram()
+    for _ in range(99):
+        h.observe(0.001)
+    h.observe(0.5)
+    assert h.count == 100
+    assert 0.001 <= h.quantile(0.5) <= 0.001 * 1.25
+    assert h.quantile(0.999) == pytest.approx(0.5)
+    assert Histogram.upper_bound(Histogram.bucket_index(0.001)) > 0.001
+
+
+def test_counters_and_prometheus_text(tmp_path):
+    m = MetricsRegistry()
+    m.describe("agi_tool_calls_total", "Tool calls.")
+    m.inc("agi_tool_calls_total", tool="read_file", outcome="success")
+    m.inc("agi_tool_calls_total", tool="read_file", outcome="success")
+    m.observe("agi_tool_latency_seconds", 0.002, tool="read_file")
+    assert m.counter_value("agi_tool_calls_total", tool="read_file", outcome="success") == 2
+    text = m.render_prometheus()
+    assert "# TYPE agi_tool_calls_total counter" in text
+    assert 'agi_tool_calls_total{outcome="success",tool="read_file"} 2' in text
+    assert 'agi_tool_latency_seconds_bucket{tool="read_file",le="+Inf"} 1' in text
+    assert 'agi_tool_latency_seconds_count{tool="read_file"} 1' in text
+    assert 'agi_tool_latency_seconds_bucket{tool="read_file",le="1.25e-06"} 0' in text
+    path = tmp_path / "agi.prom"
+    m.write_prometheus(str(path))
+    assert path.read_text() == text
+
+
+def test_prometheus_bucket_set_is_fixed():
+    m = MetricsRegistry()
+    m.observe("lat", 0.002, tool="a")
+    m.observe("lat", 5.0, tool="b")
+    m.observe("lat", 1e6, tool="b")
+
+    def edges(tool):
+        text = m.render_prometheus()
+        return [line.split("le=")[1].split("}")[0] for line in text.splitlines() if 'tool="%s",le=' % tool in line]
+
+    before = edges("a")
+    m.observe("lat", 0.5, tool="a")
+    assert edges("a") == before == edges("b")
+    assert before[-1] == '"+Inf"' and len(before) == NUM_BUCKETS
+    assert 'lat_bucket{tool="b",le="%.9g"} 1' % Histogram.upper_bound(NUM_BUCKETS - 2) in m.render_prometheus()
+
+
+def test_agent_metrics_snapshot():
+    agent = Agent()
+    agent.tick(TickInput(raw="Hello"))
+    agent.tick(TickInput(raw="Hi"))
+    snap = agent.metrics()
+    assert snap["counters"]["agi_ticks_total"][""] == 2
+    assert snap["counters"]["agi_tool_calls_total"]['{outcome="success",tool="respond"}'] == 2
+    assert snap["histograms"]["agi_tool_latency_seconds"]['{tool="respond"}']["count"] == 2
+    assert snap["histograms"]["agi_tick_stage_seconds"]['{stage="reason"}']["count"] >= 1
+
+
+def test_agents_can_share_registry():
+    shared = MetricsRegistry()
+    Agent(metrics=shared).tick(TickInput(raw="a"))
+    Agent(metrics=shared).tick(TickInput(raw="b"))
+    assert shared.counter_value("agi_ticks_total") == 2
@@ -23,3 +23,28 @@ def test_save_and_load_store(tmp_path):
 
 def test_load_store_missing_file_returns_none(tmp_path):
     assert load_store(str(tmp_path / "nonexistent.json")) is None
+
+
+def test_load_store_preserves_episode_timestamps(tmp_path):
+    path = str(tmp_path / "memory.json")
+    store = ConcreteStore()
+    store.episodic.append("event a", timestamp="2026-01-01T00:00:00Z")
+    save_store(store, path)
+    loaded = load_store(path)
+    assert loaded.episodic.all()[0]["timestamp"] == "2026-01-01T00:00:00Z"
+
+
+@pytest.mark.parametrize("name", ["memory.jsonl", "memory.jsonl.gz", "memory.jsonl.xz"])
+def test_save_and_load_streamed_formats(tmp_path, name):
+    path = str(tmp_path / name)
+    store = ConcreteStore()
+    store.semantic.add("fact one", relations=["r"])
+    store.semantic.add("fact one")
+    store.episodic.append("event a", {"action": "read_file", "success": True}, timestamp="2026-01-01T00:00:00Z")
+    save_store(store, path)
+    assert not os.path.exists(path + ".tmp")
+    loaded = load_store(path)
+    assert loaded.semantic.all()[0]["count"] == 2
+    assert loaded.semantic.all()[0]["relations"] == ["r"]
+    assert loaded.episodic.all()[0]["timestamp"] == "2026-01-01T00:00:00Z"
+    assert loaded.episodic.action_stats()["read_file"]["count"] == 1
@@ -0,0 +1,13 @@
+"""Tests for planner: next step from reasoner."""
+
+from agi.action.registry import ToolRegistry
+from agi.planner import plan
+
+
+def test_plan_uses_suggested_step_with_manifest():
+    reg = ToolRegistry()
+    reg.register("read_file", "Read.", {"path": "string"}, "read", lambda path: {})
+    out = plan({}, {"suggested_step": {"action": "read_file", "args": {"path": "a"}}}, reg.list_tools())
+    assert out["next_step"]["action"] == "read_file"
+    assert out["steps"] == [out["next_step"]] and out["current_index"] == 0
+    assert plan({}, {}, reg.list_tools())["next_step"]["action"] == "respond"
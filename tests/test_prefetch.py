@@ -0,0 +1,66 @@
+"""Tests for predictive prefetch of chained read_file/list_dir results."""
+
+import os
+
+from agi.action.builtin_tools import register_builtins
+from agi.action.registry import ToolRegistry
+from agi.core import Agent, TickInput
+from agi.prefetch import END, MIN_SAMPLES, Prefetcher, TransitionModel
+
+
+def _tick(action, chained):
+    preview = "continue with previous result" if chained else "list ."
+    return {"event": "tick", "context": {"action": action, "input_preview": preview, "success": True}}
+
+
+def test_transition_model_learns_from_episodes():
+    model = TransitionModel()
+    model.learn([_tick("list_dir", False), _tick("read_file", True), _tick("list_dir", False), _tick("respond", False)])
+    assert model.counts == {"list_dir": {"read_file": 1, END: 1}, "read_file": {END: 1}}
+    assert model.probability("list_dir", "read_file") == 0.5
+    assert model.probability("unknown", "read_file") == 0.0
+
+
+def test_prefetch_cache_hit_and_mtime_invalidation(tmp_path):
+    (tmp_path / "a.txt").write_text("one")
+    reg = ToolRegistry()
+    register_builtins(reg, base_dir=str(tmp_path))
+    pf = Prefetcher(reg, base_dir=str(tmp_path))
+    assert pf.lookup("read_file", {"path": "a.txt"}) is None
+    pf.after("list_dir", {"success": True, "payload": {"entries": ["a.txt"]}})
+    obs = pf.lookup("read_file", {"path": "a.txt"})
+    assert obs["payload"]["content"] == "one"
+    (tmp_path / "a.txt").write_text("changed")
+    st = os.stat(tmp_path / "a.txt")
+    os.utime(tmp_path / "a.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert pf.lookup("read_file", {"path": "a.txt"}) is None
+    assert pf.stats()["hits"] == 1 and pf.stats()["stale"] == 1 and pf.stats()["misses"] == 1
+    pf.close()
+
+
+def test_prefetch_bounded_and_skips_unlikely_transitions(tmp_path):
+    for name in "abc":
+        (tmp_path / (name + ".txt")).write_text(name)
+    reg = ToolRegistry()
+    register_builtins(reg, base_dir=str(tmp_path))
+    pf = Prefetcher(reg, base_dir=str(tmp_path), max_entries=2)
+    for name in "abc":
+        pf.warm("read_file", {"path": name + ".txt"}).result()
+    assert pf.stats()["entries"] == 2
+    assert pf.lookup("read_file", {"path": "a.txt"}) is None
+    # list_dir is never followed by read_file in history: don't warm.
+    history = [_tick("list_dir", False)] * (MIN_SAMPLES + 1)
+    cold = Prefetcher(reg, base_dir=str(tmp_path), episodes=history)
+    assert cold.after("list_dir", {"success": True, "payload": {"entries": ["a.txt"]}}) is None
+    assert cold.stats()["skipped"] == 1
+    pf.close()
+
+
+def test_agent_chained_read_is_a_prefetch_hit(tmp_path):
+    (tmp_path / "notes.txt").write_text("hello")
+    agent = Agent(base_dir=str(tmp_path), prefetch=True)
+    out = agent.tick(TickInput(raw="list directory ."))
+    assert out.response == "hello"
+    assert agent.prefetcher.stats()["hits"] == 1
+    assert agent.metrics()["counters"]["agi_prefetch_hits_total"][""] == 1
+    agent.close()
@@ -62,3 +62,30 @@ def test_reason_chaining_from_list_dir_suggests_read_file():
     out = reason(state)
     assert out["suggested_step"]["action"] == "read_file"
     assert out["suggested_step"]["args"]["path"] == "README.md"
+
+
+def test_reason_find_and_search_intents():
+    out = reason({"input": {"normalized": "find files *.py"}, "recalled": {}, "goal": {}})
+    assert out["suggested_step"] == {"action": "find_files", "args": {"pattern": "*.py"}}
+    out = reason({"input": {"normalized": "search for def tick"}, "recalled": {}, "goal": {}})
+    assert out["suggested_step"] == {"action": "search_text", "args": {"query": "def tick"}}
+    out = reason({"input": {"normalized": "grep TODO"}, "recalled": {}, "goal": {}})
+    assert out["suggested_step"] == {"action": "search_files", "args": {"query": "TODO"}}
+
+
+def test_reason_responds_with_result_when_nothing_to_chain():
+    state = {
+        "input": {"normalized": "continue with previous result"},
+        "recalled": {},
+        "goal": {},
+        "action": "find_files",
+        "last_observation": {"success": True, "payload": {"entries": ["a.py", "b.py"]}},
+    }
+    out = reason(state)
+    assert out["suggested_step"] == {"action": "respond", "args": {"text": "a.py\nb.py"}}
+
+
+def test_reason_lookup_intents_offer_alternatives():
+    out = reason({"input": {"normalized": "find widget"}, "recalled": {}, "goal": {}})
+    assert out["candidate_actions"][0] == out["suggested_step"]
+    assert {"action": "search_text", "args": {"query": "widget"}} in out["candidate_actions"]
@@ -0,0 +1,93 @@
+"""Tests for the deferred reflection queue and Agent(reflect_async=True)."""
+
+import threading
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.memory import ConcreteStore
+from agi.reflection import ReflectionQueue
+
+
+def _fact(state):
+    return [{"fact": "saw " + "abcdefghijklmnopqrstuvwxyz"[state["n"]]}]
+
+
+def test_queue_stores_in_batches():
+    store = ConcreteStore()
+    q = ReflectionQueue(_fact, store, batch_size=8)
+    for i in range(20):
+        q.submit({"n": i})
+    q.flush()
+    assert len(store.semantic) == 20
+    stats = q.stats()
+    assert stats["processed"] == 20 and stats["stored"] == 20 and stats["pending"] == 0
+    q.close()
+
+
+def test_submit_snapshots_state():
+    store = ConcreteStore()
+    gate = threading.Event()
+
+    def slow(state):
+        gate.wait(5)
+        return _fact(state)
+
+    q = ReflectionQueue(slow, store)
+    state = {"n": 1}
+    q.submit(state)
+    state["n"] = 2
+    gate.set()
+    q.flush()
+    assert [e["fact"] for e in store.semantic.all()] == ["saw b"]
+    q.close()
+
+
+def test_drop_when_full_counts_drops():
+    store = ConcreteStore()
+    gate = threading.Event()
+
+    def blocked(state):
+        gate.wait(5)
+        return []
+
+    q = ReflectionQueue(blocked, store, max_pending=2, batch_size=1, on_full="drop")
+    results = [q.submit({"n": i}) for i in range(10)]
+    assert not all(results)
+    assert q.dropped == results.count(False)
+    gate.set()
+    q.close()
+
+
+def test_reflect_errors_are_counted_not_raised():
+    def boom(state):
+        raise RuntimeError("bad")
+
+    q = ReflectionQueue(boom, ConcreteStore())
+    q.submit({"n": 1})
+    q.flush()
+    assert q.errors == 1
+    q.close()
+    assert q.submit({"n": 2}) is False
+
+
+def test_invalid_on_full():
+    with pytest.raises(ValueError):
+        ReflectionQueue(_fact, ConcreteStore(), on_full="spill")
+
+
+def test_agent_async_reflection_returns_before_reflect(tmp_path):
+    (tmp_path / "a.txt").write_text("hi")
+    gate = threading.Event()
+
+    def slow_reflect(state):
+        gate.wait(5)
+        return [{"fact": "read %s" % state["action"]}]
+
+    agent = Agent(reflect_fn=slow_reflect, base_dir=str(tmp_path), reflect_async=True)
+    out = agent.tick(TickInput(raw="read file a.txt"))
+    assert out.response == "hi"
+    assert len(agent.store.semantic) == 0
+    gate.set()
+    agent.close()
+    assert [e["fact"] for e in agent.store.semantic.all()] == ["read read_file"]
+    assert agent.metrics()["counters"]["agi_reflection_entries_total"][""] == 1
@@ -0,0 +1,98 @@
+"""Tests for tool registry: cached manifest, effect index, compiled argument validators, single-flight execution."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from agi.action.registry import ToolRegistry
+from agi.action.execute import coalesce_stats, execute_tool
+
+
+def _registry():
+    reg = ToolRegistry()
+    reg.register("read", "Read.", {"path": "string", "limit": "integer"}, "read", lambda path, limit=10: {"path": path, "limit": limit})
+    reg.register("write", "Write.", {"path": "string"}, "write", lambda path: {"ok": True})
+    return reg
+
+
+def test_manifest_is_cached_until_register():
+    reg = _registry()
+    m1 = reg.manifest()
+    assert reg.manifest() is m1
+    assert m1.version == reg.version
+    reg.register("other", "Other.", {}, "external", lambda: {})
+    m2 = reg.manifest()
+    assert m2 is not m1 and m2.version > m1.version
+    assert m2.names() == ("read", "write", "other")
+
+
+def test_list_tools_is_plain_json():
+    import json
+    reg = _registry()
+    listing = reg.list_tools()
+    assert reg.list_tools() is listing
+    assert json.loads(json.dumps(listing))[0] == {"name": "read", "description": "Read.", "parameters": {"path": "string", "limit": "integer"}, "effect": "read"}
+    reg.register("other", "Other.", {}, "external", lambda: {})
+    assert [t["name"] for t in reg.list_tools()] == ["read", "write", "other"]
+
+
+def test_manifest_is_immutable_and_indexed():
+    m = _registry().manifest()
+    with pytest.raises(TypeError):
+        m[0]["name"] = "x"
+    assert [t["name"] for t in m.by_effect("write")] == ["write"]
+    assert m.by_effect("external") == ()
+    assert m.get("read")["parameters"]["path"] == "string"
+
+
+def test_validator_rejects_bad_calls_before_dispatch():
+    calls = []
+    reg = ToolRegistry()
+    reg.register("t", "T.", {"path": "string", "n": "integer"}, "read", lambda path, n=1: calls.append(path) or {})
+    assert "missing required argument: path" in execute_tool(reg, "t", {})["error"]
+    assert "must be integer" in execute_tool(reg, "t", {"path": "a", "n": "2"})["error"]
+    assert "must be integer" in execute_tool(reg, "t", {"path": "a", "n": True})["error"]
+    assert "unexpected argument: x" in execute_tool(reg, "t", {"path": "a", "x": 1})["error"]
+    assert calls == []
+    assert execute_tool(reg, "t", {"path": "a", "n": 3})["success"] is True
+    assert calls == ["a"]
+
+
+def test_identical_concurrent_read_calls_share_one_execution():
+    gate = threading.Event()
+    calls = []
+
+    def slow(path):
+        calls.append(path)
+        gate.wait(5)
+        return {"entries": [path]}
+
+    regs = [ToolRegistry() for _ in range(2)]
+    for reg in regs:
+        reg.register("look", "", {"path": "string"}, "read", slow, scope="ws")
+        reg.register("touch", "", {"path": "string"}, "write", slow, scope="ws")
+    before = coalesce_stats()
+    with ThreadPoolExecutor(8) as pool:
+        reads = [pool.submit(execute_tool, regs[i % 2], "look", {"path": "./a" if i % 2 else "a"}) for i in range(6)]
+        writes = [pool.submit(execute_tool, regs[0], "touch", {"path": "a"}) for _ in range(2)]
+        deadline = time.monotonic() + 5
+        while len(calls) < 3 or coalesce_stats()["coalesced"] - before["coalesced"] < 5:
+            if time.monotonic() > deadline:
+                gate.set()
+                pytest.fail("calls did not coalesce: %d executions, %s" % (len(calls), coalesce_stats()))
+            time.sleep(0.01)
+        gate.set()
+        results = [f.result() for f in reads + writes]
+    # One read execution (args normalized, same scope across registries) plus both writes.
+    assert len(calls) == 3
+    assert coalesce_stats()["executions"] - before["executions"] == 1
+    assert regs[0].stats("look").calls + regs[1].stats("look").calls == 1
+    assert regs[0].stats("look").coalesced + regs[1].stats("look").coalesced == 5
+    # Each caller gets its own copy of the shared observation.
+    results[0]["payload"]["entries"].append("x")
+    assert len(results[1]["payload"]["entries"]) == 1
+    # Sequential calls are not coalesced.
+    gate.set()
+    execute_tool(regs[0], "look", {"path": "a"})
+    assert len(calls) == 4
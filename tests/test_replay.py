@@ -0,0 +1,53 @@
+"""Tests for tick traces (record) and replay."""
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.replay import format_report, percentile, replay
+from agi.trace import TraceRecorder, load_trace
+
+
+def _record(tmp_path, inputs):
+    (tmp_path / "a.txt").write_text("alpha")
+    trace = str(tmp_path / "trace.jsonl")
+    with TraceRecorder(trace) as rec:
+        agent = Agent(base_dir=str(tmp_path), recorder=rec)
+        for raw in inputs:
+            agent.tick(TickInput(raw=raw))
+    return trace
+
+
+def test_recorder_captures_inputs_calls_and_responses(tmp_path):
+    records = load_trace(_record(tmp_path, ["hello", "read file a.txt"]))
+    assert [r["seq"] for r in records] == [0, 1]
+    assert records[0]["input"] == {"raw": "hello", "source": "user"}
+    assert records[1]["response"] == "alpha"
+    call = records[1]["calls"][0]
+    assert call["tool"] == "read_file" and call["args"] == {"path": "a.txt"}
+    assert call["observation"]["payload"]["content"] == "alpha"
+    assert call["latency"] >= 0 and records[1]["latency"] >= call["latency"]
+
+
+def test_replay_matches_recording(tmp_path):
+    records = load_trace(_record(tmp_path, ["hello", "read file a.txt", "list dir ."]))
+    report = replay(records, agent_factory=lambda: Agent(base_dir=str(tmp_path)))
+    assert report["ticks"] == 3 and report["errors"] == 0
+    assert report["mismatches"] == 0
+    assert report["latency"]["p50"] <= report["latency"]["max"]
+    assert "ticks: 3" in format_report(report)
+
+
+def test_replay_stub_tools_uses_recorded_observations(tmp_path):
+    records = load_trace(_record(tmp_path, ["read file a.txt"]))
+    (tmp_path / "a.txt").write_text("changed")
+    live = replay(records, agent_factory=lambda: Agent(base_dir=str(tmp_path)))
+    assert live["mismatches"] == 1
+    assert "-alpha" in live["diffs"][0]["diff"] and "+changed" in live["diffs"][0]["diff"]
+    stubbed = replay(records, agent_factory=lambda: Agent(base_dir=str(tmp_path)), stub_tools=True, concurrency=2)
+    assert stubbed["mismatches"] == 0 and stubbed["stub_misses"] == 0
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,68 @@
+"""Tests for tick scheduler: act, wall-clock and output-byte budgets."""
+
+import pytest
+from agi.action.registry import ToolRegistry
+from agi.core import Agent, TickInput
+from agi.scheduler import TickBudget, TickScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_first_act_always_runs_then_max_acts():
+    sched = TickScheduler(TickBudget(max_acts=1, wall_clock_s=0.0), ToolRegistry())
+    assert sched.can_run("read_file") is True
+    sched.record({"success": True, "payload": {}})
+    assert sched.can_run("read_file") is False
+    assert sched.stopped_reason == "max_acts"
+
+
+def test_wall_clock_uses_tool_latency_average():
+    reg = ToolRegistry()
+    reg.record("slow", 0.5)
+    reg.record("fast", 0.01)
+    clock = FakeClock()
+    sched = TickScheduler(TickBudget(max_acts=5, wall_clock_s=1.0, latency_margin=1.0), reg, clock=clock)
+    sched.record({"success": True, "payload": {}})
+    clock.t = 0.6
+    assert sched.can_run("fast") is True
+    assert sched.can_run("slow") is False
+    assert sched.stopped_reason == "wall_clock"
+
+
+def test_output_byte_budget():
+    reg = ToolRegistry()
+    reg.record("read_file", 0.0, nbytes=100)
+    sched = TickScheduler(TickBudget(max_acts=5, max_output_bytes=150), reg)
+    sched.record({"success": True, "payload": {"content": "x" * 60}})
+    assert sched.can_run("read_file") is False
+    assert sched.stopped_reason == "output_bytes"
+
+
+def test_agent_returns_partial_response_when_budget_spent(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("content a")
+    monkeypatch.chdir(tmp_path)
+    agent = Agent(budget=TickBudget(max_acts=1))
+    out = agent.tick(TickInput(raw="list directory ."))
+    assert out.response == "a.txt"
+    assert agent.registry.stats("list_dir").calls == 1
+    assert agent.registry.stats("read_file") is None
+
+
+def test_wall_clock_budget_counts_time_before_the_first_act(tmp_path):
+    import time
+    from agi.reasoner import reason
+
+    def slow_reason(state):
+        time.sleep(0.1)
+        return reason(state)
+
+    (tmp_path / "a.txt").write_text("content a")
+    agent = Agent(reason_fn=slow_reason, base_dir=str(tmp_path), budget=TickBudget(wall_clock_s=0.15))
+    out = agent.tick(TickInput(raw="list directory ."))
+    assert out.response == "a.txt"
@@ -0,0 +1,72 @@
+"""Tests for the sharded semantic store (worker processes)."""
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.memory.sharded import HashRing, ShardedSemanticMemory, ShardedStore
+
+
+def test_hash_ring_is_stable_and_moves_little():
+    keys = ["k%d" % i for i in range(2000)]
+    three, four = HashRing(range(3)), HashRing(range(4))
+    assert [three.owner(k) for k in keys] == [HashRing(range(3)).owner(k) for k in keys]
+    moved = sum(1 for k in keys if three.owner(k) != four.owner(k))
+    assert moved < len(keys) * 0.4
+    assert all(four.owner(k) == 3 for k in keys if three.owner(k) != four.owner(k))
+
+
+@pytest.fixture
+def store():
+    s = ShardedStore(shards=3)
+    yield s
+    s.close()
+
+
+def test_store_and_recall_across_shards(store):
+    facts = ["alpha fact", "beta fact", "gamma fact", "delta fact", "epsilon note"]
+    store.store_semantic([{"fact": f, "relations": ["r"]} for f in facts])
+    assert len(store.semantic) == 5
+    assert sum(1 for n in store.semantic.shard_sizes() if n) > 1
+    recalled = store.recall("fact")
+    assert sorted(e["fact"] for e in recalled["semantic"]) == sorted(facts[:4])
+    assert len(store.recall("fact", limit=2)["semantic"]) == 2
+    assert len(store.semantic.by_relation("r")) == 5
+
+
+def test_duplicates_merge_on_one_shard(store):
+    store.store_semantic([{"fact": "The sky is blue."}])
+    store.store_semantic([{"fact": "the sky is blue"}])
+    assert len(store.semantic) == 1
+    assert store.semantic.all()[0]["count"] == 2
+    assert store.stats()["semantic"]["merged"] == 1
+
+
+def test_resize_rebalances_without_loss(store):
+    facts = ["fact number %s" % chr(97 + i) * (i + 1) for i in range(26)]
+    store.store_semantic([{"fact": f} for f in facts])
+    before = {e["id"]: e for e in store.semantic.all()}
+    moved = store.resize(5)
+    assert 0 < moved < len(facts)
+    assert len(store.semantic.shard_sizes()) == 5
+    assert {e["id"]: e for e in store.semantic.all()} == before
+    store.resize(2)
+    assert {e["id"] for e in store.semantic.all()} == set(before)
+
+
+def test_shrink_near_capacity_keeps_facts():
+    memory = ShardedSemanticMemory(shards=4, max_entries=40)
+    try:
+        memory.add_many([{"fact": "capacity fact %s" % chr(97 + i) * 2} for i in range(26)]
+                        + [{"fact": "more capacity %s" % chr(97 + i) * 2} for i in range(11)])
+        before = {e["id"] for e in memory.all()}
+        memory.resize(2)
+        assert {e["id"] for e in memory.all()} == before
+    finally:
+        memory.close()
+
+
+def test_agent_runs_on_sharded_store(store, tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    agent = Agent(store=store, base_dir=str(tmp_path))
+    agent.tick(TickInput(raw="read file a.txt"))
+    assert len(store.semantic) == 1
+    assert agent.tick(TickInput(raw="hello")).response == "hello"
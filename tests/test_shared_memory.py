@@ -0,0 +1,110 @@
+"""Tests for the shared-memory read-mostly store."""
+
+import multiprocessing
+import uuid
+
+import pytest
+from agi.core import Agent, TickInput
+from agi.memory import ConcreteStore
+from agi.memory.shared import SharedStore
+
+
+def _source():
+    store = ConcreteStore()
+    store.store_semantic([{"fact": f} for f in ("Alpha fact", "beta fact", "Gamma note", "multi\nline fact")])
+    store.store_episodic([{"event": "tick", "context": {"action": "read_file", "success": ok}} for ok in (True, False)])
+    return store
+
+
+@pytest.fixture
+def shared():
+    s = SharedStore.publish(_source(), "agi-test-%s" % uuid.uuid4().hex[:8])
+    yield s
+    s.destroy()
+
+
+def test_recall_reads_shared_segment(shared):
+    recalled = shared.recall("FACT")
+    assert [e["fact"] for e in recalled["semantic"]] == ["Alpha fact", "beta fact", "multi\nline fact"]
+    assert [e["fact"] for e in shared.recall("fact", limit=1)["semantic"]] == ["multi\nline fact"]
+    assert shared.recall("a fact\nb")["semantic"] == []
+    assert len(shared.recall()["episodic"]) == 2
+    assert shared.recall()["episodic_stats"]["read_file"] == {"count": 2, "successes": 1, "success_rate": 0.5}
+    assert len(shared.semantic) == 4 and len(shared.episodic.all()) == 2
+
+
+def test_memory_reads_span_base_and_overlay(shared):
+    shared.store_semantic([{"fact": "alpha overlay", "relations": ["r"]}])
+    shared.store_episodic([{"event": "tick", "context": {"action": "read_file", "success": True}}])
+    assert [e["fact"] for e in shared.semantic.query("alpha")] == ["Alpha fact", "alpha overlay"]
+    assert [e["fact"] for e in shared.semantic.by_relation("r")] == ["alpha overlay"]
+    assert shared.episodic.action_stats()["read_file"] == {"count": 3, "successes": 2, "success_rate": 2 / 3}
+    assert len(shared.episodic.recent()) == 3 and len(shared.episodic.recent(2)) == 2
+    assert len(shared.episodic.query(action="read_file", success=True)) == 2
+    assert shared.episodic.count(success=False) == 1
+    assert sum(shared.episodic.hourly_counts().values()) == 3
+    with pytest.raises(AttributeError):
+        shared.semantic.remove
+
+
+def test_overlay_writes_then_merge(shared):
+    shared.store_semantic([{"fact": "overlay fact"}, {"fact": "alpha fact"}])
+    shared.store_episodic([{"event": "tick", "context": {"action": "list_dir", "success": True}}])
+    assert shared.recall("overlay")["semantic"][0]["fact"] == "overlay fact"
+    assert shared.recall()["episodic_stats"]["list_dir"]["count"] == 1
+    other = SharedStore.attach(shared.name)
+    assert other.recall("overlay")["semantic"] == []
+    assert shared.merge() == 1
+    assert len(shared.overlay.semantic) == 0
+    assert [e["fact"] for e in other.recall("overlay")["semantic"]] == ["overlay fact"]
+    alpha = [e for e in other.semantic.all() if e["fact"].lower() == "alpha fact"]
+    assert len(alpha) == 1 and alpha[0]["count"] == 2
+    assert len(other.episodic) == 3
+    other.close()
+
+
+def test_automatic_merge_and_agent(shared, tmp_path):
+    shared.merge_every = 2
+    agent = Agent(store=shared, base_dir=str(tmp_path))
+    agent.tick(TickInput(raw="hello"))
+    agent.tick(TickInput(raw="hello again"))
+    # The merge runs in the background; the frozen overlay stays visible meanwhile.
+    assert len(shared.episodic) == 4
+    shared.wait_merge()
+    assert shared.merges == 1 and shared.generation() == 1
+    assert len(shared.episodic) == 4 and shared.merge_error is None
+    assert shared.get_working("last_thought")
+
+
+def test_attach_retries_when_a_merge_unlinks_the_generation(shared, monkeypatch):
+    import agi.memory.shared as shared_module
+    real = shared_module.SharedSegment
+    merged = []
+
+    def racing(name):
+        if not merged:
+            merged.append(None)
+            # Another worker merges between our control read and attach: generation 0 is gone.
+            merged[0] = shared.merge()
+        return real(name)
+
+    other = SharedStore.attach(shared.name)
+    monkeypatch.setattr(shared_module, "SharedSegment", racing)
+    assert len(other.recall("fact")["semantic"]) == 3
+    assert merged == [1] and other.stats()["shared"]["generation"] == 1
+    other.close()
+
+
+def _count_in_child(name, out):
+    store = SharedStore.attach(name)
+    out.put((len(store.recall("fact")["semantic"]), len(store.semantic)))
+    store.close()
+
+
+def test_other_process_attaches(shared):
+    ctx = multiprocessing.get_context()
+    out = ctx.Queue()
+    p = ctx.Process(target=_count_in_child, args=(shared.name, out))
+    p.start()
+    p.join(10)
+    assert out.get(timeout=5) == (3, 4)
@@ -0,0 +1,86 @@
+"""Tests for copy-on-write store snapshots and speculative candidate evaluation."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from agi.action.registry import ToolRegistry
+from agi.core import Agent, TickInput
+from agi.memory import ConcreteStore
+from agi.memory.snapshot import StoreSnapshot
+from agi.speculate import default_score, read_only_candidates, speculate
+
+
+def test_snapshot_buffers_writes_until_commit():
+    store = ConcreteStore()
+    store.set_working("focus", "a")
+    snap = StoreSnapshot(store)
+    snap.store_episodic([{"event": "tick", "context": {"action": "x"}}])
+    snap.store_semantic([{"fact": "learned"}])
+    snap.set_working("focus", "b")
+    snap.push_turn({"action": "x"})
+    assert snap.get_working("focus") == "b"
+    assert store.get_working("focus") == "a"
+    assert len(store.episodic) == 0 and len(store.semantic) == 0
+    snap.commit()
+    assert store.get_working("focus") == "b"
+    assert len(store.episodic) == 1 and len(store.semantic) == 1
+    assert store.working.get_recent_turns() == [{"action": "x"}]
+    with pytest.raises(RuntimeError):
+        snap.commit()
+
+
+def test_default_score():
+    assert default_score({}, {"success": False}) == 0
+    assert default_score({}, {"success": True, "payload": {"matches": [], "content": "(no matches)"}}) == 1
+    assert default_score({}, {"success": True, "payload": {"entries": ["a"]}}) == 2
+
+
+def test_read_only_candidates_filters_effects_and_duplicates():
+    reg = ToolRegistry()
+    reg.register("look", "", {"q": "string"}, "read", lambda q: {})
+    reg.register("write", "", {"q": "string"}, "write", lambda q: {})
+    steps = [
+        {"action": "look", "args": {"q": "a"}},
+        {"action": "write", "args": {"q": "a"}},
+        {"action": "look", "args": {"q": "a"}},
+        {"action": "respond", "args": {"text": "a"}},
+        {"action": "look", "args": {"q": "b"}},
+    ]
+    assert read_only_candidates(steps, reg.manifest(), 3) == [steps[0], steps[4]]
+    assert read_only_candidates(steps, reg.manifest(), 1) == [steps[0]]
+
+
+def test_speculate_commits_only_the_winner():
+    store = ConcreteStore()
+    steps = [{"action": "miss"}, {"action": "hit"}, {"action": "fail"}]
+    observations = {
+        "miss": {"success": True, "payload": {"entries": []}},
+        "hit": {"success": True, "payload": {"entries": ["x"]}},
+        "fail": {"success": False, "payload": {}},
+    }
+
+    def run(step, snapshot):
+        snapshot.store_episodic([{"event": "tick", "context": {"action": step["action"]}}])
+        return observations[step["action"]]
+
+    with ThreadPoolExecutor(3) as pool:
+        winner, results = speculate(steps, store, run, pool)
+        assert winner == 1
+        assert [r[2] for r in results] == [1.0, 2.0, 0.0]
+        assert [e["context"]["action"] for e in store.episodic.all()] == ["hit"]
+        # Custom scorer; ties go to the earlier candidate.
+        winner, _ = speculate(steps, store, run, pool, scorer=lambda step, obs: 1.0)
+        assert winner == 0
+
+
+def test_agent_speculation_picks_productive_alternative(tmp_path):
+    (tmp_path / "code.py").write_text("def widget(): pass\n")
+    agent = Agent(base_dir=str(tmp_path), speculate_k=3)
+    out = agent.tick(TickInput(raw="find widget"))
+    assert out.response == "code.py:1: def widget(): pass"
+    assert [e["context"]["action"] for e in agent.store.episodic.all()] == ["search_text"]
+    assert agent.metrics()["counters"]["agi_speculation_overrides_total"][""] == 1
+    plain = Agent(base_dir=str(tmp_path))
+    plain.tick(TickInput(raw="find widget"))
+    assert [e["context"]["action"] for e in plain.store.episodic.all()] == ["find_files"]
+    agent.close()
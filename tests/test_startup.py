@@ -0,0 +1,58 @@
+"""Cold-start budget: `python -X importtime -m agi.main "Hello"` and lazy package imports."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+# Total import time allowed for `agi "Hello"` (ms); override on slow machines.
+COLD_START_BUDGET_MS = float(os.environ.get("AGI_COLD_START_BUDGET_MS", "300"))
+
+
+def _importtime(args, cwd):
+    """Run python -X importtime with args; return (stdout, {module: cumulative_us}, top-level total us)."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    modules, total = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return proc.stdout, modules, total
+
+
+def test_cold_start_hello_within_budget(tmp_path):
+    stdout, modules, total_us = _importtime(["-m", "agi.main", "Hello"], str(tmp_path))
+    assert stdout.strip() == "Hello"
+    assert total_us / 1000.0 < COLD_START_BUDGET_MS
+    # Persistence (and its codecs) only load with --memory
+    assert "agi.memory.persistence" not in modules
+
+
+def test_help_does_not_import_agent_stack(tmp_path):
+    _, modules, _ = _importtime(["-m", "agi.main", "--help"], str(tmp_path))
+    assert "agi.core" not in modules
+    assert "agi.memory.persistence" not in modules
+
+
+def test_package_exports_are_lazy(tmp_path):
+    _, modules, _ = _importtime(["-c", "import agi, agi.memory, agi.action"], str(tmp_path))
+    assert "agi.core" not in modules
+    assert "agi.memory.concrete_store" not in modules
+    assert "agi.action.builtin_tools" not in modules
+    import agi
+    from agi.memory import ConcreteStore
+    assert agi.Agent is not None and ConcreteStore is not None
+    import agi.action
+    assert "register_builtins" in dir(agi.action) and "ToolRegistry" in dir(agi.action)
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        agi.memory.missing
@@ -0,0 +1,143 @@
+"""Tests for workspace index: incremental refresh, find, trigram search, persistence."""
+
+import os
+import pytest
+from agi.action.workspace_index import WorkspaceIndex, trigrams
+
+
+def _tree(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "core.py").write_text("def tick():\n    return 'Hello World'\n")
+    (tmp_path / "README.md").write_text("# Project\nhello readme\n")
+    (tmp_path / "blob.bin").write_bytes(b"hello\0world")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("hello")
+
+
+def test_trigrams():
+    assert trigrams("Abcd") == {"abc", "bcd"}
+    assert trigrams("ab") == set()
+
+
+def test_find_and_search(tmp_path):
+    _tree(tmp_path)
+    idx = WorkspaceIndex(str(tmp_path))
+    assert idx.find("*.py") == ["src/core.py"]
+    assert idx.find("readme") == ["README.md"]
+    assert ".git/config" not in idx.find("config")
+    matches = idx.search("hello")
+    assert [(m["path"], m["line"]) for m in matches] == [("README.md", 2), ("src/core.py", 2)]
+    assert idx.candidates("world") == ["src/core.py"]
+    assert idx.search("no such text") == []
+
+
+def test_incremental_refresh(tmp_path):
+    _tree(tmp_path)
+    idx = WorkspaceIndex(str(tmp_path))
+    assert idx.refresh()["added"] == 3
+    assert idx.refresh() == {"added": 0, "changed": 0, "removed": 0, "files": 3}
+    p = tmp_path / "README.md"
+    p.write_text("changed text entirely\n")
+    os.utime(p, ns=(p.stat().st_atime_ns, p.stat().st_mtime_ns + 1000))
+    (tmp_path / "src" / "core.py").unlink()
+    stats = idx.refresh()
+    assert stats["changed"] == 1 and stats["removed"] == 1
+    assert idx.search("hello") == []
+    assert idx.candidates("entirely") == ["README.md"]
+
+
+def test_persisted_index_reloads(tmp_path):
+    ws = tmp_path / "ws"
+    ws.mkdir()
+    _tree(ws)
+    path = str(tmp_path / "index.json.gz")
+    idx = WorkspaceIndex(str(ws), index_path=path)
+    idx.refresh()
+    assert os.path.isfile(path)
+    again = WorkspaceIndex(str(ws), index_path=path)
+    assert len(again) == 3
+    assert again.candidates("world") == ["src/core.py"]
+    assert again.refresh()["added"] == 0
+
+
+def test_concurrent_queries_during_file_churn(tmp_path):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    for i in range(20):
+        (tmp_path / ("f%d.txt" % i)).write_text("hello %d" % i)
+    idx = WorkspaceIndex(str(tmp_path), index_path=str(tmp_path / "idx.json.gz"), refresh_interval=0)
+    stop = threading.Event()
+
+    def churn():
+        n = 0
+        while not stop.is_set():
+            p = tmp_path / ("churn%d.txt" % (n % 5))
+            p.write_text("hello churn") if not p.exists() else p.unlink()
+            n += 1
+
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(idx.search if i % 2 else idx.find, "hello" if i % 2 else "*.txt") for i in range(80)]
+            results = [f.result() for f in futures]
+    finally:
+        stop.set()
+        writer.join()
+    assert all(len(r) >= 20 for r in results)
+
+
+def test_quick_refresh_lists_only_changed_directories(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text("guide")
+    old = 1_000_000_000 * 10**9
+    for d in (tmp_path, tmp_path / "src", tmp_path / "docs"):
+        os.utime(d, ns=(old, old))
+    idx = WorkspaceIndex(str(tmp_path))
+    idx.refresh()
+    listed = idx.dirs_listed
+    assert idx.refresh(full=False) == {"added": 0, "changed": 0, "removed": 0, "files": 4}
+    assert idx.dirs_listed == listed
+    (tmp_path / "src" / "new.py").write_text("x = 'needle'\n")
+    assert idx.refresh(full=False)["added"] == 1
+    assert idx.dirs_listed == listed + 1
+    assert idx.find("*.py") == ["src/core.py", "src/new.py"]
+
+
+def test_failed_stat_skips_only_that_file(tmp_path, monkeypatch):
+    for i in range(10):
+        (tmp_path / ("f%d.txt" % i)).write_text("x")
+    idx = WorkspaceIndex(str(tmp_path))
+    assert idx.refresh()["files"] == 10
+    real_scandir = os.scandir
+
+    class Flaky:
+        def __init__(self, entry):
+            self._entry = entry
+            self.name, self.path = entry.name, entry.path
+
+        def is_dir(self, **kw):
+            return self._entry.is_dir(**kw)
+
+        def is_file(self, **kw):
+            return self._entry.is_file(**kw)
+
+        def stat(self):
+            if self.name == "f3.txt":
+                raise FileNotFoundError(self.path)
+            return self._entry.stat()
+
+    class Scan:
+        def __init__(self, d):
+            self._it = real_scandir(d)
+
+        def __enter__(self):
+            return (Flaky(e) for e in self._it.__enter__())
+
+        def __exit__(self, *exc):
+            return self._it.__exit__(*exc)
+
+    monkeypatch.setattr(os, "scandir", Scan)
+    stats = idx.refresh()
+    assert stats["removed"] == 1 and stats["files"] == 9